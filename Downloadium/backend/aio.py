@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+from Downloadium.backend.events import (
+    DOWNLOADING,
+    EventCallback,
+    LegacyCallback,
+    ProgressEvent,
+    event_sink,
+    legacy_adapter,
+)
+
+
+# Quantos downloads rodam ao mesmo tempo por padrão (o resto espera no semáforo, sem thread).
+DEFAULT_CONCURRENCY = 4
+
+# Teto de threads do pool; as threads só são criadas sob demanda (limitadas pelos semáforos).
+MAX_THREADS = 64
+
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+class ProgressUpdate(NamedTuple):
+    """Visão legada (linha de status + percentual) de um ProgressEvent, para quem ainda usa texto."""
+
+    status: str
+    percent: Optional[float]
+
+    @classmethod
+    def from_event(cls, event: ProgressEvent) -> "ProgressUpdate":
+        return cls(event.status_line(), event.percent)
+
+
+def shared_semaphore(limit: int = DEFAULT_CONCURRENCY) -> asyncio.Semaphore:
+    """Semáforo compartilhado pelos downloads do event loop atual (criado no primeiro uso)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        semaphore = _semaphores.get(loop)
+        if semaphore is None:
+            semaphore = _semaphores[loop] = asyncio.Semaphore(limit)
+        return semaphore
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    """Pool de threads do yt-dlp (bloqueante); só quem já passou pelo semáforo ocupa uma thread."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_THREADS, thread_name_prefix="downloadium-aio")
+        return _executor
+
+
+class AsyncDownload:
+    """Um download em andamento: `async for` entrega os ProgressEvent e `await` devolve o resultado.
+
+    `on_event` recebe os mesmos eventos na thread do yt-dlp; `callback(status, percent)` é o
+    formato antigo, montado só se for passado. Cancelar a task (ou chamar cancel()) sinaliza o DownloadManager, que levanta DownloadCancelled
+    no próximo hook do yt-dlp; o slot do semáforo só é liberado quando a thread termina.
+    """
+
+    def __init__(
+        self,
+        manager: Any,
+        url: str,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        session: Any = None,
+        callback: Optional[LegacyCallback] = None,
+        max_pending: int = 256,
+        on_event: Optional[EventCallback] = None,
+    ):
+        self.manager = manager
+        self.url = url
+        self.session = session
+        self.callback = callback
+        self.on_event = on_event
+        self.cancel_event = threading.Event()
+
+        self._emit = event_sink(on_event, legacy_adapter(callback) if callback is not None else None)
+        self._semaphore = semaphore
+        self._loop = asyncio.get_running_loop()
+        # Só o progresso de bytes (DOWNLOADING) é limitado a `max_pending`; mudanças de fase e o
+        # DONE/ERROR final sempre entram.
+        self._events: asyncio.Queue[Optional[ProgressEvent]] = asyncio.Queue()
+        self._max_progress = max(1, max_pending)
+        self._progress_pending = 0
+        self._task = self._loop.create_task(self._run())
+
+    # -----------------
+    # Progresso
+    # -----------------
+
+    def _offer(self, event: Optional[ProgressEvent]) -> None:
+        # Roda no event loop. Consumidor lento: o progresso novo é descartado (o próximo o substitui).
+        if event is not None and event.phase == DOWNLOADING:
+            if self._progress_pending >= self._max_progress:
+                return
+            self._progress_pending += 1
+        self._events.put_nowait(event)
+
+    def _on_event(self, event: ProgressEvent) -> None:
+        # Chamado na thread do yt-dlp.
+        self._emit(event)
+        try:
+            self._loop.call_soon_threadsafe(self._offer, event)
+        except RuntimeError:
+            pass  # loop já fechado
+
+    def __aiter__(self) -> AsyncIterator[ProgressEvent]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[ProgressEvent]:
+        while True:
+            update = await self._events.get()
+            if update is None:
+                return
+            if update.phase == DOWNLOADING:
+                self._progress_pending -= 1
+            yield update
+
+    # -----------------
+    # Execução
+    # -----------------
+
+    async def _run(self) -> str:
+        semaphore = self._semaphore or shared_semaphore()
+        try:
+            async with semaphore:
+                future = self._loop.run_in_executor(
+                    _shared_executor(),
+                    lambda: self.manager.download(
+                        self.url, session=self.session, cancel_event=self.cancel_event, on_event=self._on_event
+                    ),
+                )
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    self.cancel_event.set()
+                    # Espera a thread sair antes de devolver o slot do semáforo.
+                    await asyncio.wait([future])
+                    raise
+        finally:
+            self._offer(None)
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+        self._task.cancel()
+
+    def done(self) -> bool:
+        return self._task.done()
+
+    def __await__(self) -> Any:
+        return self._task.__await__()
+
+
+async def download_async(
+    manager: Any,
+    url: str,
+    callback: Optional[LegacyCallback] = None,
+    *,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    session: Any = None,
+    on_event: Optional[EventCallback] = None,
+) -> str:
+    """Versão awaitable de `manager.download(url, ...)`; cancelar a task cancela o download."""
+    return await AsyncDownload(manager, url, semaphore=semaphore, session=session, callback=callback, on_event=on_event)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from yt_dlp.utils import make_archive_id
+
+from Downloadium.backend.metadata_cache import _extractor_classes
+from Downloadium.backend.utils import get_app_data_dir
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive (
+    id TEXT PRIMARY KEY,
+    added_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class BloomFilter:
+    """Filtro de Bloom simples (bytearray + double hashing) para testes de pertinência O(1)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+def archive_id(entry: dict[str, Any]) -> Optional[str]:
+    """ID de arquivo no formato do yt-dlp ("<extractor> <id>"), sem acessar a rede.
+
+    Aceita info dicts completos, entradas planas de playlist ({"ie_key", "id"}) ou só {"url"}.
+    """
+    extractor = entry.get("extractor_key") or entry.get("ie_key")
+    video_id = entry.get("id")
+    if extractor and video_id:
+        return make_archive_id(extractor, video_id)
+
+    url = str(entry.get("url") or entry.get("webpage_url") or "")
+    if not url:
+        return None
+    for ie in _extractor_classes():
+        if ie.ie_key() == "Generic" or not ie.suitable(url):
+            continue
+        temp_id = video_id or ie.get_temp_id(url)
+        return make_archive_id(ie.ie_key(), temp_id) if temp_id else None
+    return None
+
+
+class DownloadArchive:
+    """Índice dos vídeos já baixados, por (extractor, ID), persistido em SQLite.
+
+    Um filtro de Bloom em memória responde "não está no arquivo" sem tocar no disco (o caso
+    comum em canais novos); só os possíveis acertos são confirmados no SQLite. Implementa
+    `__contains__`/`add`, então pode ser passado direto como `download_archive` do yt-dlp.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 100_000):
+        self.path = path or os.path.join(get_app_data_dir(), "archive.sqlite3")
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._count = int(self._conn.execute("SELECT COUNT(*) FROM archive").fetchone()[0])
+        self._bloom = self._build_bloom(max(capacity, self._count * 2))
+
+    def _build_bloom(self, capacity: int) -> BloomFilter:
+        bloom = BloomFilter(capacity)
+        for (key,) in self._conn.execute("SELECT id FROM archive"):
+            bloom.add(key)
+        return bloom
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        with self._lock:
+            if key not in self._bloom:
+                return False
+            return self._conn.execute("SELECT 1 FROM archive WHERE id = ?", (key,)).fetchone() is not None
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            with self._conn:
+                cur = self._conn.execute("INSERT OR IGNORE INTO archive (id, added_at) VALUES (?, ?)", (key, time.time()))
+            if cur.rowcount <= 0:
+                return
+            self._count += 1
+            self._bloom.add(key)
+            # Acima da capacidade a taxa de falso positivo sobe: reconstrói com o dobro.
+            if self._count > self._bloom.capacity:
+                self._bloom = self._build_bloom(self._bloom.capacity * 2)
+
+    def contains_entry(self, entry: dict[str, Any]) -> bool:
+        key = archive_id(entry)
+        return key is not None and key in self
+
+    def add_entry(self, entry: dict[str, Any]) -> None:
+        key = archive_id(entry)
+        if key is not None:
+            self.add(key)
+
+    def import_file(self, path: str) -> int:
+        """Importa um arquivo texto do yt-dlp (--download-archive). Retorna quantos IDs eram novos."""
+        with open(path, encoding="utf-8") as f:
+            keys = {line.strip() for line in f if line.strip()}
+        now = time.time()
+        with self._lock:
+            before = self._count
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO archive (id, added_at) VALUES (?, ?)", ((key, now) for key in keys)
+                )
+            self._count = int(self._conn.execute("SELECT COUNT(*) FROM archive").fetchone()[0])
+            self._bloom = self._build_bloom(max(self._bloom.capacity, self._count * 2))
+            return self._count - before
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_archive: Optional[DownloadArchive] = None
+_default_lock = threading.Lock()
+
+
+def get_default_archive() -> DownloadArchive:
+    """Instância compartilhada do arquivo (cai para memória se o disco não estiver disponível)."""
+    global _default_archive
+    with _default_lock:
+        if _default_archive is None:
+            try:
+                _default_archive = DownloadArchive()
+            except (OSError, sqlite3.Error):
+                _default_archive = DownloadArchive(path=":memory:")
+        return _default_archive
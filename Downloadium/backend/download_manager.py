@@ -1,18 +1,69 @@
 from __future__ import annotations
 
+import asyncio
 import os
-import shutil
-from typing import Any, Callable, Optional, cast
-
-from yt_dlp import YoutubeDL
-from yt_dlp.utils import DownloadError
-
-from Downloadium.backend.utils import ensure_directory_exists
+import threading
+import time
+from typing import Any, Callable, Iterable, Optional, cast
+
+from yt_dlp.utils import DownloadCancelled, DownloadError
+
+from Downloadium.backend.aio import AsyncDownload, download_async
+from Downloadium.backend.archive import DownloadArchive, get_default_archive
+from Downloadium.backend.errors import CAUSE_OTHER, classify_error, summarize_causes
+from Downloadium.backend.events import (
+    CANCELLED,
+    DONE,
+    DOWNLOADING,
+    EMBEDDING,
+    ENCODING,
+    ERROR,
+    MESSAGE,
+    RATE_LIMITED,
+    TRANSCODING,
+    WAITING,
+    EventCallback,
+    ProgressEvent,
+    download_event,
+    event_sink,
+    legacy_adapter,
+)
+from Downloadium.backend.finalize import ffmpeg_available
+from Downloadium.backend.formats import CostModel, DeadlineBudget, IndexedFormatSelector, height_from_label
+from Downloadium.backend.metadata_cache import MetadataCache, get_default_cache
+from Downloadium.backend.pipeline import PostProcessPipeline
+from Downloadium.backend.rate_limit import RateController, get_default_controller, is_rate_limited
+from Downloadium.backend.remux import JobStats, MergePlan
+from Downloadium.backend.scheduler import EntryResult, PlaylistScheduler
+from Downloadium.backend.session import ExtractionSession
+from Downloadium.backend.side_assets import get_default_side_asset_pool
+from Downloadium.backend.subtitles import SubtitlePlanner
+from Downloadium.backend.throughput import ThroughputHistory, get_default_history
+from Downloadium.backend.utils import ensure_directory_exists, url_host
+from Downloadium.backend.ydl import DownloadiumYDL
 
 
 class DownloadManager:
     """Gerencia downloads via yt-dlp com suporte a canais/playlists, legendas embutidas e progresso avançado."""
 
+    # Textos devolvidos/emitidos por download(); quem só muda o idioma (ex.: a GUI) troca este dict.
+    MESSAGES: dict[str, str] = {
+        "no_url": "Erro: URL do vídeo não fornecida.",
+        "archived": "Video already downloaded (found in archive) to {output_path}",
+        "no_ffmpeg": "Aviso: ffmpeg/ffprobe não encontrado no PATH. Baixando sem embutir legendas.",
+        "success": "Video downloaded successfully to {output_path}",
+        "partial": "Downloaded {ok} of {total} videos to {output_path}; {failed} failed ({causes})",
+        "format_fallback": "Warning: requested format unavailable. Falling back to best...",
+        "rate_limited": (
+            "YouTube rate-limited this session (can last up to ~1h). "
+            "Try again later; to reduce recurrence, keep delays between videos and, if possible, use cookies/login. "
+            "Detail: {error}"
+        ),
+        "ydl_error": "Error downloading video (yt-dlp): {error}",
+        "error": "Error downloading video: {error}",
+        "cancelled": "Download cancelled.",
+    }
+
     def __init__(
         self,
         output_path: str = "videos",
@@ -22,6 +73,20 @@ class DownloadManager:
         sleep_interval: float = 2.0,
         max_sleep_interval: float = 5.0,
         sleep_interval_requests: float = 1.0,
+        metadata_cache: Optional[MetadataCache] = None,
+        workers: int = 1,
+        max_per_host: int = 2,
+        archive: Optional[DownloadArchive] = None,
+        rate_controller: Optional[RateController] = None,
+        rate_limit_retries: int = 3,
+        connections: int = 4,
+        max_fragment_concurrency: int = 8,
+        postprocess_workers: int = 1,
+        throughput_history: Optional[ThroughputHistory] = None,
+        deadline: Optional[float] = None,
+        subtitle_languages: Iterable[str] = ("en",),
+        parallel_side_assets: bool = True,
+        ignore_archive: bool = False,
     ):
         self.output_path = output_path
         self.quality = quality
@@ -32,9 +97,42 @@ class DownloadManager:
         self.max_sleep_interval = max_sleep_interval
         self.sleep_interval_requests = sleep_interval_requests
 
+        self.metadata_cache = metadata_cache if metadata_cache is not None else get_default_cache()
+        # Vídeos já baixados (por extractor + ID) são pulados em novas execuções do mesmo canal.
+        self.archive = archive if archive is not None else get_default_archive()
+        # Baixa de novo mesmo o que já está no arquivo (ex.: o usuário apagou o vídeo); continua registrando.
+        self.ignore_archive = ignore_archive
+
+        # sleep_interval & cia. são só o ponto de partida: o controlador ajusta o ritmo por host.
+        self.rate_controller = rate_controller if rate_controller is not None else get_default_controller()
+        self.rate_limit_retries = max(0, rate_limit_retries)
+        # Conexões por arquivo em formatos progressivos (faixas de bytes em paralelo; 1 = desligado)
+        self.connections = max(1, connections)
+        # Teto da concorrência adaptativa de fragmentos DASH/HLS
+        self.max_fragment_concurrency = max(1, max_fragment_concurrency)
+        # Threads de ffmpeg (merge/embed) em paralelo com os downloads (0 = pós-processamento inline)
+        self.postprocess_workers = max(0, postprocess_workers)
+        # Vazão medida por host e prazo opcional (segundos para cada download() inteiro, repartido
+        # entre as entradas) para o modelo de custo dos formatos
+        self.throughput_history = throughput_history if throughput_history is not None else get_default_history()
+        self.deadline = deadline
+        # Idiomas de legenda: uma trilha por idioma (manual antes da automática)
+        self.subtitle_languages = tuple(subtitle_languages)
+        # Legendas, miniatura e info JSON baixados junto com a mídia (pool compartilhado)
+        self.parallel_side_assets = parallel_side_assets
+        # Remux x recodificação dos merges do último download() iniciado (quem roda vários ao mesmo
+        # tempo passa o seu via `download(stats=...)`)
+        self.stats = JobStats()
+
+        # Workers por entrada em playlists/canais (1 = sequencial, como o yt-dlp faz sozinho)
+        self.workers = max(1, workers)
+        self.max_per_host = max(1, max_per_host)
+
         self._total_videos: int = 0
-        self._current_index: int = 0
-        self._current_video_id: Optional[str] = None
+        self._session: Optional[ExtractionSession] = None
+
+    def _message(self, key: str, **values: Any) -> str:
+        return self.MESSAGES[key].format(output_path=self.output_path, **values)
 
     def _build_format_string(self) -> str:
         q = (self.quality or "best").strip().lower()
@@ -45,218 +143,355 @@ class DownloadManager:
             return q
         return self.quality
 
+    def deadline_budget(
+        self, entries: int = 1, started_at: Optional[float] = None, parallel: Optional[int] = None
+    ) -> Optional[DeadlineBudget]:
+        """`deadline` do job repartido entre as `entries` entradas que faltam (None sem prazo).
+
+        Com `started_at` (time.time() do início do job), só sobra o que resta do prazo desde então.
+        `parallel` é quantas entradas baixam juntas (padrão: `workers`).
+        """
+        if self.deadline is None:
+            return None
+        seconds = self.deadline
+        if started_at is not None:
+            seconds -= max(0.0, time.time() - started_at)
+        return DeadlineBudget(seconds, entries, parallel=parallel or self.workers)
+
+    def _format_selector(self, host: Optional[str] = None, budget: Optional[DeadlineBudget] = None) -> Any:
+        """Qualidade "best" ou por altura ("720p") vira um IndexedFormatSelector.
+
+        Os IDs exatos saem da tabela de cada vídeo, pelo modelo de custo (vazão do host, protocolo,
+        remux) e pelo prazo do job, se houver. Outros seletores vão direto ao yt-dlp.
+        """
+        q = (self.quality or "best").strip().lower()
+        if q == "best" or (q.endswith("p") and q[:-1].isdigit()):
+            cost = CostModel(self.throughput_history, host)
+            return IndexedFormatSelector(height_from_label(q), self.video_format, cost, budget)
+        return self._build_format_string()
+
+    def estimate_size(self, url: str) -> Optional[int]:
+        """Tamanho aproximado (bytes) de um vídeo único na qualidade atual, pela tabela já extraída."""
+        session = self.open_session(url)
+        if session.is_playlist:
+            return None
+        selector = self._format_selector()
+        height = selector.height if isinstance(selector, IndexedFormatSelector) else None
+        return session.format_index.estimate_size(height, self.video_format)
+
+    def open_session(self, url: str) -> ExtractionSession:
+        """Retorna a sessão de extração da URL, reaproveitando a última se for da mesma URL."""
+        session = self._session
+        if session is None or not session.matches(url):
+            session = self._session = ExtractionSession(
+                url,
+                cookies_file=self.cookies_file,
+                metadata_cache=self.metadata_cache,
+            )
+        return session
+
     def fetch_metadata(self, url: str) -> int:
-        """Obtém metadados usando extract_flat=True para contar quantos vídeos serão processados."""
+        """Conta quantos vídeos serão processados (cache ou uma única extração compartilhada com o download)."""
         if not url:
             raise ValueError("URL não fornecida")
 
+        self._total_videos = self._entry_count(url)
+        return self._total_videos
+
+    def _entry_count(self, url: str, session: Optional[ExtractionSession] = None) -> int:
+        cached = self.metadata_cache.get("count", url)
+        if isinstance(cached, int) and cached > 0:
+            return cached
+        return (session or self.open_session(url)).entry_count
+
+    def build_ydl_opts(
+        self,
+        progress_hooks: Iterable[Callable[[dict], None]] = (),
+        postprocessor_hooks: Iterable[Callable[[dict], None]] = (),
+        embed_subtitles: bool = False,
+        host: Optional[str] = None,
+        entries: int = 1,
+        budget: Optional[DeadlineBudget] = None,
+    ) -> dict[str, Any]:
+        """Opções do yt-dlp para baixar (usadas por download() e pela fila de jobs).
+
+        `entries` é quantos vídeos o job vai baixar, para repartir o `deadline` entre eles; quem já
+        tem o budget do job (ex.: a fila, que monta as opções a cada entrada) o passa em `budget`.
+        """
+        if budget is None:
+            budget = self.deadline_budget(entries)
+        outtmpl = os.path.join(
+            self.output_path,
+            "%(channel)s",
+            "%(playlist)s",
+            "%(title)s.%(ext)s",
+        )
+
         ydl_opts: dict[str, Any] = {
-            "quiet": True,
-            "skip_download": True,
-            "extract_flat": True,
+            "outtmpl": outtmpl,
+            "outtmpl_na_placeholder": "Videos",
+            "format": self._format_selector(host, budget),
+            "throughput_history": self.throughput_history,
+            "merge_output_format": self.video_format,
+            "progress_hooks": list(progress_hooks),
+            "postprocessor_hooks": list(postprocessor_hooks),
             "noplaylist": False,
             "nocolor": True,
+            "windowsfilenames": True,
             "cachedir": False,
             "retries": 5,
-            "socket_timeout": 30,
+            "fragment_retries": 5,
+            "skip_unavailable_fragments": True,
+            "keep_fragments": False,
             "no_warnings": True,
+            "download_archive": self.archive,
+            "ignore_archive": self.ignore_archive,
+            "segmented_connections": self.connections,
+            "adaptive_fragments": self.max_fragment_concurrency > 1,
+            "max_concurrent_fragments": self.max_fragment_concurrency,
+            # Throttling / delays (reduz a chance de rate-limit)
+            "sleep_interval": self.sleep_interval,
+            "max_sleep_interval": self.max_sleep_interval,
+            "sleep_interval_requests": self.sleep_interval_requests,
+            # Legendas
+            "writesubtitles": True,
+            "writeautomaticsub": True,
+            "subtitleslangs": list(self.subtitle_languages),
+            "subtitlesformat": "best",
+            "subtitle_planner": SubtitlePlanner(self.subtitle_languages),
         }
+
+        if self.parallel_side_assets:
+            ydl_opts["side_asset_pool"] = get_default_side_asset_pool()
+
+        if embed_subtitles:
+            # Legendas, capa, capítulos e metadados entram numa única passada do ffmpeg (FinalizePP).
+            ydl_opts["embedsubtitles"] = True
+            ydl_opts["writethumbnail"] = True
+            ydl_opts["finalize"] = True
+
         if self.cookies_file and os.path.exists(self.cookies_file):
             ydl_opts["cookiefile"] = self.cookies_file
 
-        with YoutubeDL(cast(Any, ydl_opts)) as ydl:
-            info = ydl.extract_info(url, download=False)
+        if host:
+            self.rate_controller.apply(ydl_opts, host)
+            backoff = self.rate_controller.retry_sleep(host)
+            ydl_opts["retry_sleep_functions"] = {"http": backoff, "fragment": backoff, "extractor": backoff}
 
-        if not info:
-            self._total_videos = 0
-            return 0
+        return ydl_opts
 
-        playlist_count = info.get("playlist_count")
-        if isinstance(playlist_count, int) and playlist_count > 0:
-            self._total_videos = playlist_count
-            return playlist_count
+    def download(
+        self,
+        url: str,
+        callback: Optional[Callable[[str, Optional[float]], None]] = None,
+        session: Optional[ExtractionSession] = None,
+        cancel_event: Optional[threading.Event] = None,
+        on_event: Optional[EventCallback] = None,
+        force: bool = False,
+        stats: Optional[JobStats] = None,
+    ) -> str:
+        """Baixa vídeo/canal/playlist e emite cada update como ProgressEvent via `on_event`.
 
-        entries = info.get("entries")
-        if entries is None:
-            self._total_videos = 1
-            return 1
+        `callback(status, percent)` continua aceito: recebe a linha de texto montada a partir do evento.
 
-        count = 0
-        try:
-            for _ in entries:
-                count += 1
-        except TypeError:
-            count = 0
+        Se `session` (ou a sessão aberta por fetch_metadata) for da mesma URL, o download
+        reaproveita o info dict já extraído em vez de extrair a URL novamente.
 
-        self._total_videos = count if count > 0 else 1
-        return self._total_videos
+        Com `force` (ou `ignore_archive` no construtor), vídeos já registrados no arquivo de downloads
+        são baixados de novo em vez de pulados.
 
-    def download(self, url: str, callback: Callable[[str, Optional[float]], None]) -> str:
-        """Baixa vídeo/canal/playlist e emite updates via callback(status, percent)."""
+        O estado de cada chamada (sessão, posição, contadores em `stats`) é local: a mesma instância
+        pode rodar vários download()/download_async() ao mesmo tempo.
+        """
 
         if not url:
-            return "Erro: URL do vídeo não fornecida."
+            return self._message("no_url")
+
+        emit = event_sink(on_event, legacy_adapter(callback) if callback is not None else None)
+
+        force = force or self.ignore_archive
+        if not force and self.archive.contains_entry({"url": url}):
+            emit(ProgressEvent(DONE, percent=100.0))
+            return self._message("archived")
+
+        if session is None or not session.matches(url):
+            session = self.open_session(url)
 
         ensure_directory_exists(self.output_path)
 
-        embed_enabled = shutil.which('ffmpeg') is not None and shutil.which('ffprobe') is not None
+        embed_enabled = ffmpeg_available()
         if not embed_enabled:
-            try:
-                callback("Aviso: ffmpeg/ffprobe não encontrado no PATH. Baixando sem embutir legendas.", 0.0)
-            except Exception:
-                pass
+            emit(ProgressEvent(MESSAGE, percent=0.0, detail=self._message("no_ffmpeg")))
 
         try:
-            total = self.fetch_metadata(url)
+            total = self._entry_count(url, session)
         except Exception:
             total = 0
 
-        self._current_index = 0
-        self._current_video_id = None
+        current: dict[str, Any] = {"index": 0, "video_id": None}
+
+        count = total if total > 0 else None
+        emit(ProgressEvent(DOWNLOADING, index=0 if count else None, count=count, percent=0.0))
 
-        def emit(status: str, percent: Optional[float] = None) -> None:
-            try:
-                callback(status, percent)
-            except Exception:
-                pass
+        def position() -> Optional[int]:
+            return max(current["index"], 1) if count else None
 
-        if total > 0:
-            emit(f"Video 0 of {total} | Status: Downloading", 0.0)
-        else:
-            emit("Status: Downloading", 0.0)
+        def check_cancel() -> None:
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelled()
 
         def progress_hook(d: dict) -> None:
+            check_cancel()
             status = d.get("status")
             info_dict = d.get("info_dict") or {}
             video_id = info_dict.get("id")
 
             if status == "downloading":
-                if video_id and video_id != self._current_video_id:
-                    self._current_video_id = video_id
-                    self._current_index += 1
-
-                total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate")
-                downloaded_bytes = d.get("downloaded_bytes", 0)
-                percent = None
-                if isinstance(total_bytes, (int, float)) and total_bytes:
-                    percent = max(0.0, min(100.0, (downloaded_bytes / total_bytes) * 100))
-
-                if total > 0:
-                    msg = f"Video {max(self._current_index, 1)} of {total} | Status: Downloading"
-                else:
-                    msg = "Status: Downloading"
+                if video_id and video_id != current["video_id"]:
+                    current["video_id"] = video_id
+                    current["index"] += 1
 
-                if percent is not None:
-                    msg += f" | {percent:.1f}%"
-                emit(msg, percent)
+                emit(download_event(d, index=position(), count=count))
 
             elif status == "finished":
-                if total > 0:
-                    msg = f"Video {max(self._current_index, 1)} of {total} | Status: Encoding | 100.0%"
-                else:
-                    msg = "Status: Encoding | 100.0%"
-                emit(msg, 100.0)
+                emit(ProgressEvent(ENCODING, index=position(), count=count, percent=100.0))
 
             elif status == "error":
                 err = d.get("error")
-                if total > 0:
-                    msg = f"Video {max(self._current_index, 1)} of {total} | Status: Error"
-                else:
-                    msg = "Status: Error"
-                if err:
-                    msg += f" | {err}"
-                emit(msg, 0.0)
+                emit(ProgressEvent(ERROR, index=position(), count=count, percent=0.0, detail=str(err) if err else None))
 
         def postprocessor_hook(d: dict) -> None:
+            check_cancel()
             pp = str(d.get("postprocessor") or "")
-            pp_status = d.get("status")
-
-            if total > 0:
-                prefix = f"Video {max(self._current_index, 1)} of {total}"
-            else:
-                prefix = ""
-
-            if "EmbedSubtitle" in pp:
-                state = "Embedding Subtitles"
-            else:
-                state = "Encoding"
-
-            if pp_status in {"started", "finished"}:
-                msg = f"{prefix + ' | ' if prefix else ''}Status: {state}"
-                emit(msg, None)
-
-        outtmpl = os.path.join(
-            self.output_path,
-            "%(channel)s",
-            "%(playlist)s",
-            "%(title)s.%(ext)s",
-        )
-
-        ydl_opts: dict[str, Any] = {
-            "outtmpl": outtmpl,
-            "outtmpl_na_placeholder": "Videos",
-            "format": self._build_format_string(),
-            "merge_output_format": self.video_format,
-            "progress_hooks": [progress_hook],
-            "postprocessor_hooks": [postprocessor_hook],
-            "noplaylist": False,
-            "nocolor": True,
-            "windowsfilenames": True,
-            "cachedir": False,
-            "retries": 5,
-            "fragment_retries": 5,
-            "skip_unavailable_fragments": True,
-            "keep_fragments": False,
-            "no_warnings": True,
-            # Throttling / delays (reduz a chance de rate-limit)
-            "sleep_interval": self.sleep_interval,
-            "max_sleep_interval": self.max_sleep_interval,
-            "sleep_interval_requests": self.sleep_interval_requests,
-            # Legendas
-            "writesubtitles": True,
-            "writeautomaticsub": True,
-            "subtitleslangs": ["en.*", "en"],
-            "subtitlesformat": "best",
-        }
-
-        if embed_enabled:
-            ydl_opts["embedsubtitles"] = True
-            ydl_opts["postprocessors"] = [
-                {"key": "FFmpegEmbedSubtitle"},
-            ]
-
-        if self.cookies_file and os.path.exists(self.cookies_file):
-            ydl_opts["cookiefile"] = self.cookies_file
-
-        def run_once(opts: dict[str, Any]) -> None:
-            with YoutubeDL(cast(Any, opts)) as ydl:
-                ydl.download([url])
+            if d.get("status") in {"started", "finished"}:
+                phase = EMBEDDING if "EmbedSubtitle" in pp else ENCODING
+                emit(ProgressEvent(phase, index=position(), count=count))
+
+        host = url_host(url)
+        ydl_opts = self.build_ydl_opts([progress_hook], [postprocessor_hook], embed_enabled, host=host, entries=total or 1)
+        ydl_opts["ignore_archive"] = force
+        # Enquanto o ffmpeg processa o vídeo N, a rede já baixa o N+1.
+        pipeline = PostProcessPipeline(self.postprocess_workers) if embed_enabled and self.postprocess_workers else None
+        ydl_opts["postprocess_pipeline"] = pipeline
+
+        def merge_plan_hook(plan: MergePlan, info: dict) -> None:
+            if plan.transcode:
+                emit(ProgressEvent(TRANSCODING, detail=plan.reason))
+            elif plan.fallback:
+                emit(ProgressEvent(MESSAGE, detail=plan.reason))
+
+        stats = self.stats = stats if stats is not None else JobStats()
+        ydl_opts["merge_stats"] = stats
+        ydl_opts["subtitle_stats"] = stats
+        ydl_opts["side_asset_stats"] = stats
+        ydl_opts["merge_plan_hook"] = merge_plan_hook
+
+        def run_once(opts: dict[str, Any]) -> list[EntryResult]:
+            """Baixa a URL; em playlists devolve o resultado de cada entrada (falhas isoladas)."""
+            for attempt in range(self.rate_limit_retries + 1):
+                if self.rate_controller.strikes(host):
+                    emit(ProgressEvent(WAITING))
+                self.rate_controller.wait(host, lambda: cancel_event is not None and cancel_event.is_set())
+                check_cancel()
+                results: list[EntryResult] = []
+                try:
+                    if session.is_playlist:
+                        scheduler = PlaylistScheduler(
+                            opts,
+                            emit,
+                            workers=self.workers,
+                            max_per_host=self.max_per_host,
+                            archive=None if force else self.archive,
+                            rate_controller=self.rate_controller,
+                            cancel_event=cancel_event,
+                        )
+                        results = scheduler.run(session)
+                    else:
+                        live = dict(opts)
+                        live["progress_hooks"] = [*opts["progress_hooks"], self.rate_controller.progress_hook(host, live)]
+                        with DownloadiumYDL(cast(Any, live)) as ydl:
+                            # A tabela de formatos já foi montada pela sessão (menu/estimativa): reaproveita.
+                            if isinstance(ydl.format_selector, IndexedFormatSelector):
+                                ydl.format_selector.use_index(session.info.get("id"), session.format_index)
+                            session.process(ydl)
+                    # "Done" só depois que o último merge/embed terminar. Em playlists o erro de
+                    # cada merge já está no resultado da entrada; num vídeo avulso vira o resultado dele.
+                    errors = pipeline.join() if pipeline is not None else []
+                    if errors and not session.is_playlist:
+                        error = errors[0]
+                        results = [EntryResult(1, session.info.get("id"), False, str(error), cause=classify_error(error))]
+                    return results
+                except DownloadError as e:
+                    if not is_rate_limited(e) or attempt >= self.rate_limit_retries:
+                        raise
+                    # Entradas já concluídas ficam no arquivo de downloads e são puladas na nova tentativa.
+                    cooldown = self.rate_controller.record_rate_limit(host)
+                    emit(ProgressEvent(RATE_LIMITED, detail=f"retrying in {cooldown:.0f}s"))
+                    self.rate_controller.apply(opts, host)
+            return []
+
+        def finish(results: list[EntryResult]) -> str:
+            failed = [r for r in results if not r.ok]
+            if failed:
+                causes = summarize_causes(r.cause or CAUSE_OTHER for r in failed)
+                emit(ProgressEvent(DONE, percent=100.0, detail=f"{len(failed)} failed ({causes})"))
+                return self._message(
+                    "partial", ok=len(results) - len(failed), total=len(results), failed=len(failed), causes=causes
+                )
+            emit(ProgressEvent(DONE, percent=100.0))
+            return self._message("success")
 
         try:
-            run_once(ydl_opts)
-            emit("Status: Done", 100.0)
-            return f"Video downloaded successfully to {self.output_path}"
+            results = run_once(ydl_opts)
+            check_cancel()
+            return finish(results)
         except DownloadError as e:
             msg = str(e)
             lower = msg.lower()
 
+            # Só vídeos avulsos chegam aqui: em playlists o scheduler refaz apenas as entradas com erro de formato.
             if "requested format is not available" in lower:
                 try:
-                    emit("Warning: requested format unavailable. Falling back to best...", None)
+                    emit(ProgressEvent(MESSAGE, detail=self._message("format_fallback")))
                     ydl_opts_retry = dict(ydl_opts)
                     ydl_opts_retry['format'] = "bestvideo+bestaudio/best"
-                    run_once(ydl_opts_retry)
-                    emit("Status: Done", 100.0)
-                    return f"Video downloaded successfully to {self.output_path}"
+                    return finish(run_once(ydl_opts_retry))
                 except Exception as e2:
-                    return f"Error downloading video (yt-dlp): {str(e2)}"
-
-            if "rate-limited" in lower or "this content isn't available" in lower:
-                return (
-                    "YouTube rate-limited this session (can last up to ~1h). "
-                    "Try again later; to reduce recurrence, keep delays between videos and, if possible, use cookies/login. "
-                    f"Detail: {msg}"
-                )
-            return f"Error downloading video (yt-dlp): {msg}"
+                    return self._message("ydl_error", error=str(e2))
+
+            if is_rate_limited(msg):
+                return self._message("rate_limited", error=msg)
+            return self._message("ydl_error", error=msg)
+        except DownloadCancelled:
+            emit(ProgressEvent(CANCELLED))
+            return self._message("cancelled")
         except Exception as e:
-            return f"Error downloading video: {str(e)}"
+            return self._message("error", error=str(e))
+        finally:
+            if pipeline is not None:
+                pipeline.close()
+
+    async def download_async(
+        self,
+        url: str,
+        callback: Optional[Callable[[str, Optional[float]], None]] = None,
+        *,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        session: Optional[ExtractionSession] = None,
+        on_event: Optional[EventCallback] = None,
+    ) -> str:
+        """Versão asyncio de download(): concorrência limitada por `semaphore` (compartilhado por padrão).
+
+        Cancelar a task interrompe o yt-dlp no próximo hook de progresso.
+        """
+        return await download_async(self, url, callback, semaphore=semaphore, session=session, on_event=on_event)
+
+    def stream(
+        self,
+        url: str,
+        *,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        session: Optional[ExtractionSession] = None,
+    ) -> AsyncDownload:
+        """Inicia o download no event loop atual; `async for` no retorno entrega os ProgressEvent."""
+        return AsyncDownload(self, url, semaphore=semaphore, session=session)
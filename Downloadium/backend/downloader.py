@@ -1,8 +1,21 @@
 import os
-import requests
 from yt_dlp import YoutubeDL
-from Downloadium.backend.utils import ensure_directory_exists, sanitize_filename
+from Downloadium.backend.utils import ensure_directory_exists
 from Downloadium.backend.download_manager import DownloadManager
+from Downloadium.backend.metadata_cache import get_default_cache
+from Downloadium.backend.session import ExtractionSession
+from Downloadium.backend.subtitle_convert import convert as convert_subtitle
+from Downloadium.backend.thumbnails import (
+    DOWNLOADED,
+    FAILED,
+    NOT_MODIFIED,
+    ThumbnailFetcher,
+    best_thumbnail,
+    get_default_fetcher,
+    summarize_results,
+    thumbnail_filename,
+    thumbnail_jobs,
+)
 
 
 def fetch_metadata(url, output_path='videos', quality='best', cookies_file=None):
@@ -19,13 +32,14 @@ def fetch_metadata(url, output_path='videos', quality='best', cookies_file=None)
     )
     return manager.fetch_metadata(url)
 
-def download_video(url, output_path='videos', quality='best', callback=None):
+def download_video(url, output_path='videos', quality='best', callback=None, workers=1):
     """Downloads a YouTube video based on the provided URL.
 
     Args:
         url (str): The URL of the video to download.
         output_path (str): Directory where the downloaded file will be saved.
         quality (str): Quality of the video (e.g., 'best', 'worst', specific resolutions like '720p').
+        workers (int): Number of playlist/channel entries downloaded in parallel.
 
     Returns:
         str: The path to the downloaded video file.
@@ -40,6 +54,7 @@ def download_video(url, output_path='videos', quality='best', callback=None):
             output_path=output_path,
             quality=quality,
             video_format="mp4",
+            workers=workers,
         )
         return manager.download(url, cb)
 
@@ -60,34 +75,73 @@ def download_thumbnail(url, output_path='thumbnails'):
         # Ensure the output directory exists
         ensure_directory_exists(output_path)
 
-        # Get video metadata
-        options = {'skip_download': True, 'quiet': True}
-        with YoutubeDL(options) as ydl:
-            info = ydl.extract_info(url, download=False)
+        # Get video metadata: the extraction session caches it per video ID
+        cache = get_default_cache()
+        info = cache.get('thumbnail', url, single_video=True)
+        if not info:
+            info = ExtractionSession(url, noplaylist=True, metadata_cache=cache).info
 
-        thumbnail_url = info.get('thumbnail')
+        thumbnail_url = best_thumbnail(info)
         if not thumbnail_url:
             return "No thumbnail found for this video."
 
-        response = requests.get(thumbnail_url)
-        response.raise_for_status()
-
-        file_path = os.path.join(output_path, f"{sanitize_filename(info['title'])}_thumbnail.jpg")
-        with open(file_path, 'wb') as f:
-            f.write(response.content)
+        file_path = os.path.join(output_path, thumbnail_filename(info, thumbnail_url))
+        result = get_default_fetcher().fetch(thumbnail_url, file_path)
+        if not result.ok:
+            return f"Error downloading thumbnail: {result.error}"
 
         return f"Thumbnail downloaded successfully to {file_path}"
 
     except Exception as e:
         return f"Error downloading thumbnail: {str(e)}"
 
-def download_subtitles(url, output_path='subtitles', language='en'):
+def download_thumbnails(url, output_path='thumbnails', workers=None, callback=None):
+    """Downloads the thumbnails of every video in a playlist or channel (or of a single video).
+
+    Uses the flat playlist metadata, so no per-video extraction is needed. Thumbnails that
+    did not change since the last sync are skipped via ETag/Last-Modified.
+
+    Args:
+        url (str): Playlist, channel or video URL.
+        output_path (str): Directory where the thumbnails will be saved.
+        workers (int): Maximum number of thumbnails fetched in parallel (default: shared pool).
+        callback (callable): Optional callback(result) called as each thumbnail finishes.
+
+    Returns:
+        str: Summary of the downloaded, unchanged and failed thumbnails.
+    """
+    try:
+        ensure_directory_exists(output_path)
+
+        session = ExtractionSession(url, metadata_cache=get_default_cache())
+        jobs = thumbnail_jobs(session.info, output_path)
+        if not jobs:
+            return "No thumbnails found for this URL."
+
+        if workers is None:
+            results = get_default_fetcher().fetch_many(jobs, callback)
+        else:
+            with ThumbnailFetcher(max_workers=workers) as fetcher:
+                results = fetcher.fetch_many(jobs, callback)
+
+        counts = summarize_results(results)
+        return (
+            f"Thumbnails saved to {output_path}: {counts[DOWNLOADED]} downloaded, "
+            f"{counts[NOT_MODIFIED]} unchanged, {counts[FAILED]} failed"
+        )
+
+    except Exception as e:
+        return f"Error downloading thumbnails: {str(e)}"
+
+def download_subtitles(url, output_path='subtitles', language='en', fmt=None):
     """Downloads subtitles for a YouTube video in the specified language.
 
     Args:
         url (str): The URL of the video whose subtitles are to be downloaded.
         output_path (str): Directory where the subtitle file will be saved.
         language (str): Language code of the subtitles to download (e.g., 'en', 'es').
+        fmt (str): Optional target format ('srt', 'vtt' or 'ttml'). The conversion runs
+            in-process, without spawning ffmpeg.
 
     Returns:
         str: The path to the downloaded subtitle file.
@@ -105,9 +159,19 @@ def download_subtitles(url, output_path='subtitles', language='en'):
         }
 
         with YoutubeDL(options) as ydl:
-            ydl.download([url])
+            info = ydl.extract_info(url, download=True)
+
+        if fmt:
+            entries = (info or {}).get('entries') or [info or {}]
+            for entry in entries:
+                for sub in ((entry or {}).get('requested_subtitles') or {}).values():
+                    src = sub.get('filepath')
+                    if not src or not os.path.exists(src) or src.endswith(f'.{fmt}'):
+                        continue
+                    convert_subtitle(src, f"{src.rsplit('.', 1)[0]}.{fmt}")
+                    os.remove(src)
 
         return f"Subtitles downloaded successfully to {output_path}"
 
     except Exception as e:
-        return f"Error downloading subtitles: {str(e)}"
\ No newline at end of file
+        return f"Error downloading subtitles: {str(e)}"
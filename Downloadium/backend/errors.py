@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import random
+import re
+import socket
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from yt_dlp.networking.exceptions import HTTPError, TransportError
+from yt_dlp.utils import ContentTooShortError, GeoRestrictedError
+
+from Downloadium.backend.rate_limit import error_chain, is_rate_limited
+
+
+# Causas de falha de uma entrada (cada uma com sua política de nova tentativa).
+CAUSE_FORMAT = "format"
+CAUSE_NETWORK = "network"
+CAUSE_GEO = "geo"
+CAUSE_RATE_LIMIT = "rate_limit"
+CAUSE_REMOVED = "removed"
+CAUSE_OTHER = "other"
+
+_FORMAT_RE = re.compile(r"requested format (is )?not available|no video formats found", re.IGNORECASE)
+_GEO_RE = re.compile(r"available (in|from) your (country|location)|geo[- ]?restrict|blocked it in your country", re.IGNORECASE)
+# Status HTTP vêm do HTTPError na cadeia ou do texto com o prefixo "HTTP Error": um número solto
+# pode ser parte do título ou do id.
+_REMOVED_STATUS = frozenset({404, 410})
+_NETWORK_STATUS = frozenset({500, 502, 503, 504})
+_REMOVED_RE = re.compile(
+    r"video unavailable|private video|has been removed|no longer available|does not exist"
+    r"|account associated with this video has been terminated|copyright claim|HTTP Error (404|410)\b",
+    re.IGNORECASE,
+)
+_NETWORK_RE = re.compile(
+    r"timed out|connection (reset|refused|aborted)|temporary failure in name resolution|getaddrinfo"
+    r"|unable to download (webpage|video data)|incomplete read|content too short|HTTP Error 50[0234]\b",
+    re.IGNORECASE,
+)
+
+
+def classify_error(error: Any) -> str:
+    """Classifica o erro de uma entrada em uma das causas CAUSE_*."""
+    errors = list(error_chain(error)) if isinstance(error, BaseException) else []
+    text = " | ".join(str(e) for e in errors) or str(error or "")
+
+    # A mensagem de rate-limit do YouTube também diz "Video unavailable": confere antes.
+    if is_rate_limited(error) or is_rate_limited(text):
+        return CAUSE_RATE_LIMIT
+    if any(isinstance(e, GeoRestrictedError) for e in errors) or _GEO_RE.search(text):
+        return CAUSE_GEO
+    if _FORMAT_RE.search(text):
+        return CAUSE_FORMAT
+    statuses = {e.status for e in errors if isinstance(e, HTTPError)}
+    if statuses & _REMOVED_STATUS or _REMOVED_RE.search(text):
+        return CAUSE_REMOVED
+    if statuses & _NETWORK_STATUS:
+        return CAUSE_NETWORK
+    if any(isinstance(e, (TransportError, ContentTooShortError, socket.timeout, ConnectionError)) for e in errors):
+        return CAUSE_NETWORK
+    if _NETWORK_RE.search(text):
+        return CAUSE_NETWORK
+    return CAUSE_OTHER
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    retries: int = 0
+    base_delay: float = 0.0
+    max_delay: float = 0.0
+    fallback_format: bool = False
+
+    def delay(self, attempt: int) -> float:
+        """Espera antes da tentativa `attempt` (1 = primeira nova tentativa), com jitter."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** max(0, attempt - 1)))
+        return random.uniform(ceiling / 2, ceiling) if ceiling > 0 else 0.0
+
+
+RETRY_POLICIES: dict[str, RetryPolicy] = {
+    # Uma nova tentativa, já com o formato alternativo.
+    CAUSE_FORMAT: RetryPolicy(retries=1, fallback_format=True),
+    CAUSE_NETWORK: RetryPolicy(retries=3, base_delay=5.0, max_delay=60.0),
+    # O RateController já fez o backoff curto; esta é a última chance, depois de uma pausa longa.
+    CAUSE_RATE_LIMIT: RetryPolicy(retries=1, base_delay=60.0, max_delay=300.0),
+    CAUSE_GEO: RetryPolicy(),
+    CAUSE_REMOVED: RetryPolicy(),
+    CAUSE_OTHER: RetryPolicy(),
+}
+
+
+def summarize_causes(causes: Iterable[str]) -> str:
+    """Resumo como "2 removed, 1 geo" (mais frequentes primeiro)."""
+    return ", ".join(f"{count} {cause}" for cause, count in Counter(causes).most_common())
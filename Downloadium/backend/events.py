@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+# Fases (o valor é o texto que aparece depois de "Status:" na linha legada).
+QUEUED = "Queued"
+LISTING = "Listing"
+SKIPPING = "Skipping"
+DOWNLOADING = "Downloading"
+ENCODING = "Encoding"
+EMBEDDING = "Embedding Subtitles"
+TRANSCODING = "Transcoding"
+WAITING = "Waiting (rate limit)"
+RATE_LIMITED = "Rate limited"
+RETRYING = "Retrying"
+PAUSED = "Paused"
+DONE = "Done"
+ERROR = "Error"
+CANCELLED = "Cancelled"
+# Texto livre (avisos): a linha legada é só `detail`.
+MESSAGE = "Message"
+
+
+@dataclass(slots=True)
+class ProgressEvent:
+    """Um update de progresso, sem formatação: quem exibe decide como (e se) vira texto.
+
+    `index`/`count` são a entrada atual e o total de entradas do download/job; `percent` é o
+    progresso geral (0-100) quando conhecido. Bytes, velocidade (B/s) e ETA (s) vêm do yt-dlp.
+    """
+
+    phase: str
+    job_id: Optional[int] = None
+    index: Optional[int] = None
+    count: Optional[int] = None
+    downloaded_bytes: Optional[int] = None
+    total_bytes: Optional[int] = None
+    speed: Optional[float] = None
+    eta: Optional[float] = None
+    percent: Optional[float] = None
+    detail: Optional[str] = None
+
+    def status_line(self) -> str:
+        """Linha legada ("Video 3 of 40 | Status: Downloading | 42.1%") para callbacks de texto."""
+        if self.phase == MESSAGE:
+            return self.detail or ""
+        if self.count:
+            line = f"Video {self.index or 0} of {self.count} | Status: {self.phase}"
+        elif self.index is not None:
+            line = f"Video {self.index} | Status: {self.phase}"
+        else:
+            line = f"Status: {self.phase}"
+        if self.detail:
+            line += f" | {self.detail}"
+        if self.phase == DOWNLOADING and self.percent is not None:
+            line += f" | {self.percent:.1f}%"
+        return line
+
+
+EventCallback = Callable[[ProgressEvent], None]
+LegacyCallback = Callable[[str, Optional[float]], None]
+
+
+def download_event(
+    d: dict,
+    job_id: Optional[int] = None,
+    index: Optional[int] = None,
+    count: Optional[int] = None,
+) -> ProgressEvent:
+    """Evento DOWNLOADING a partir do dict do progress hook do yt-dlp."""
+    downloaded = d.get("downloaded_bytes") or 0
+    total = d.get("total_bytes") or d.get("total_bytes_estimate")
+    percent = max(0.0, min(100.0, downloaded / total * 100)) if total else None
+    return ProgressEvent(
+        DOWNLOADING, job_id, index, count, downloaded, total, d.get("speed"), d.get("eta"), percent
+    )
+
+
+def legacy_adapter(callback: LegacyCallback) -> EventCallback:
+    """Adapta um callback antigo `callback(status, percent)` para receber ProgressEvent."""
+
+    def on_event(event: ProgressEvent) -> None:
+        callback(event.status_line(), event.percent)
+
+    return on_event
+
+
+def event_sink(*consumers: Optional[EventCallback]) -> EventCallback:
+    """Um único emissor para vários consumidores (None é ignorado); exceções deles nunca chegam
+    ao download. Texto só é montado se um dos consumidores for um `legacy_adapter`.
+    """
+    active = [c for c in consumers if c is not None]
+
+    def emit(event: ProgressEvent) -> None:
+        for consumer in active:
+            try:
+                consumer(event)
+            except Exception:
+                pass
+
+    return emit
+
+
+# -----------------
+# Coalescência entre backend e UI
+# -----------------
+
+
+class ProgressCoalescer:
+    """Fila limitada de eventos entre as threads de download e a UI.
+
+    O yt-dlp chama o progress hook a cada bloco recebido; a UI não precisa de mais que algumas
+    dezenas de quadros por segundo. `push()` (qualquer thread) guarda só o último DOWNLOADING de
+    cada job; `drain()` (thread da UI) devolve esses no máximo `rate` vezes por segundo. Mudanças
+    de fase, erros e mensagens nunca são juntados e saem no próximo `drain()`, na ordem.
+
+    Com a UI atrasada e `max_pending` eventos urgentes na fila, o mais antigo que já foi superado
+    por um evento posterior do mesmo job é descartado (erros por último).
+    """
+
+    def __init__(self, rate: float = 20.0, max_pending: int = 256):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.max_pending = max(1, max_pending)
+
+        self._lock = threading.Lock()
+        self._urgent: deque[ProgressEvent] = deque()
+        self._latest: dict[Optional[int], ProgressEvent] = {}
+        self._phases: dict[Optional[int], str] = {}
+        self._last_flush = 0.0
+        self.dropped = 0
+
+    def push(self, event: ProgressEvent) -> None:
+        key = event.job_id
+        with self._lock:
+            previous = self._phases.get(key)
+            self._phases[key] = event.phase
+            if event.phase == DOWNLOADING and previous == DOWNLOADING:
+                if key in self._latest:
+                    self.dropped += 1
+                self._latest[key] = event
+                return
+            # Transição: o progresso pendente do job é anterior a ela e fica obsoleto.
+            if self._latest.pop(key, None) is not None:
+                self.dropped += 1
+            self._urgent.append(event)
+            if len(self._urgent) > self.max_pending:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        self.dropped += 1
+        later = Counter(event.job_id for event in self._urgent)
+        fallback = None
+        for i, event in enumerate(self._urgent):
+            later[event.job_id] -= 1
+            if not later[event.job_id]:
+                continue  # último evento do job: ainda é o estado atual
+            if event.phase != ERROR:
+                del self._urgent[i]
+                return
+            if fallback is None:
+                fallback = i
+        del self._urgent[fallback if fallback is not None else 0]
+
+    def drain(self, now: Optional[float] = None) -> list[ProgressEvent]:
+        """Eventos a exibir agora: urgentes sempre, progresso se já passou o intervalo de `rate`."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            events = list(self._urgent)
+            self._urgent.clear()
+            if self._latest and now - self._last_flush >= self.interval:
+                events.extend(self._latest.values())
+                self._latest.clear()
+                self._last_flush = now
+        return events
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from yt_dlp.postprocessor import FFmpegMetadataPP, FFmpegThumbnailsConvertorPP
+from yt_dlp.postprocessor.common import PostProcessor
+from yt_dlp.utils import ISO639Utils, prepend_extension, replace_extension
+
+from Downloadium.backend.subtitle_convert import convert as convert_subtitle
+
+
+# -----------------
+# Capacidades do ffmpeg (sondadas uma vez por processo)
+# -----------------
+
+
+@dataclass(frozen=True)
+class FFmpegCapabilities:
+    ffmpeg: Optional[str] = None
+    ffprobe: Optional[str] = None
+    versions: dict[str, str] = field(default_factory=dict)
+    features: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.ffmpeg and self.ffprobe and self.versions.get("ffmpeg"))
+
+
+_capabilities: Optional[FFmpegCapabilities] = None
+_capabilities_lock = threading.Lock()
+
+
+def probe_ffmpeg(refresh: bool = False) -> FFmpegCapabilities:
+    """Localiza ffmpeg/ffprobe e lê versão e recursos; o resultado fica em cache até `refresh`."""
+    global _capabilities
+    with _capabilities_lock:
+        if _capabilities is None or refresh:
+            ffmpeg, ffprobe = shutil.which("ffmpeg"), shutil.which("ffprobe")
+            versions: dict[str, str] = {}
+            features: dict[str, Any] = {}
+            if ffmpeg and ffprobe:
+                try:
+                    found, features = FFmpegMetadataPP.get_versions_and_features()
+                    versions = {k: str(v) for k, v in (found or {}).items() if v}
+                except Exception:
+                    versions = {}
+            _capabilities = FFmpegCapabilities(ffmpeg, ffprobe, versions, dict(features or {}))
+        return _capabilities
+
+
+def ffmpeg_available() -> bool:
+    """True se ffmpeg e ffprobe estão no PATH e respondem (necessários para o finalize)."""
+    return probe_ffmpeg().available
+
+
+# -----------------
+# Finalize: legendas, capa, capítulos e metadados em uma única passada
+# -----------------
+
+_COVER_EXTS = ("jpg", "jpeg", "png")
+_ATTACHED_PIC_EXTS = ("mp4", "m4a", "mov")
+_ATTACHMENT_EXTS = ("mkv", "mka")
+_SUBTITLE_EXTS = ("mp4", "mov", "m4a", "webm", "mkv", "mka")
+_FFMPEG_SUBS = ("vtt", "srt", "ass")
+_CONVERTIBLE_SUBS = ("vtt", "srt", "ttml", "dfxp", "json3")
+
+
+@dataclass
+class FinalizePlan:
+    inputs: list[str]
+    options: list[str]
+    files_to_delete: list[str]
+    embedded: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.embedded)
+
+
+class FinalizePP(FFmpegMetadataPP):
+    """Embute legendas, capa, capítulos e metadados com UMA invocação do ffmpeg.
+
+    Cada PP do yt-dlp (EmbedSubtitle, EmbedThumbnail, Metadata) relê e reescreve o arquivo
+    inteiro; aqui tudo entra numa só passada com cópia de streams, gravada num temporário ao
+    lado do destino (mesmo sistema de arquivos) e trocada com `os.replace` no fim.
+    """
+
+    def __init__(
+        self,
+        downloader: Any = None,
+        subtitles: bool = True,
+        thumbnail: bool = True,
+        chapters: bool = True,
+        metadata: bool = True,
+    ):
+        super().__init__(downloader, add_metadata=metadata, add_chapters=chapters, add_infojson=False)
+        self._add_subtitles = subtitles
+        self._add_thumbnail = thumbnail
+
+    @classmethod
+    def pp_key(cls) -> str:
+        return "DownloadiumFinalize"
+
+    @staticmethod
+    def _is_automatic(info: dict[str, Any], lang: str, sub: dict[str, Any]) -> bool:
+        """A trilha escolhida veio de `automatic_captions` (e não das legendas manuais)?"""
+        url = sub.get("url")
+        if not url:
+            return False
+        manual = (info.get("subtitles") or {}).get(lang) or []
+        auto = (info.get("automatic_captions") or {}).get(lang) or []
+        return any(t.get("url") == url for t in auto) and not any(t.get("url") == url for t in manual)
+
+    def _subtitle_inputs(self, info: dict[str, Any]) -> list[tuple[str, str, Optional[str], list[str]]]:
+        """(arquivo a embutir, idioma, nome, arquivos a apagar depois) de cada legenda."""
+        if not self._add_subtitles or info["ext"] not in _SUBTITLE_EXTS:
+            return []
+        subs = []
+        for lang, sub in (info.get("requested_subtitles") or {}).items():
+            path, sub_ext = sub.get("filepath") or "", sub.get("ext")
+            if not os.path.exists(path) or sub_ext == "json":
+                continue
+            # webm só aceita WebVTT e o ffmpeg não lê TTML/json3: converte aqui, sem outro processo.
+            needs_vtt = sub_ext != "vtt" if info["ext"] == "webm" else sub_ext not in _FFMPEG_SUBS
+            if needs_vtt and sub_ext in _CONVERTIBLE_SUBS:
+                converted = replace_extension(path, "vtt", sub_ext)
+                try:
+                    convert_subtitle(path, converted, dedupe=self._is_automatic(info, lang, sub))
+                except (OSError, ValueError) as e:
+                    self.report_warning(f"Skipping {lang} subtitle: {e}")
+                    continue
+                subs.append((converted, lang, sub.get("name"), [path, converted]))
+                continue
+            if needs_vtt:
+                continue
+            subs.append((path, lang, sub.get("name"), [path]))
+        return subs
+
+    def _cover(self, info: dict[str, Any]) -> list[str]:
+        """Capa a embutir (último item) e, se houve conversão, o arquivo original antes dela."""
+        if not self._add_thumbnail or info["ext"] not in _ATTACHED_PIC_EXTS + _ATTACHMENT_EXTS:
+            return []
+        path = next((t["filepath"] for t in reversed(info.get("thumbnails") or []) if t.get("filepath")), None)
+        if not path or not os.path.exists(path):
+            return []
+        if path.rsplit(".", 1)[-1].lower() in _COVER_EXTS:
+            return [path]
+        # Só a imagem (pequena) é convertida; o vídeo continua com uma única passada.
+        return [path, FFmpegThumbnailsConvertorPP(self._downloader).convert_thumbnail(path, "jpg")]
+
+    @staticmethod
+    def _media_streams(info: dict[str, Any]) -> int:
+        """Streams do arquivo baixado (mesma contagem usada pelos metadados por stream)."""
+        return sum(
+            2 if "none" not in (fmt.get("vcodec"), fmt.get("acodec")) else 1
+            for fmt in info.get("requested_formats") or [info]
+        )
+
+    def plan(self, info: dict[str, Any]) -> FinalizePlan:
+        """Entradas e opções do ffmpeg para finalizar `info["filepath"]` (sem executar nada)."""
+        filename, ext = info["filepath"], info["ext"]
+        inputs, files_to_delete, embedded = [filename], [], []
+        options = ["-map", "0", "-map", "-0:s", "-dn", "-ignore_unknown", "-c", "copy"]
+        if ext in _ATTACHED_PIC_EXTS:
+            options += ["-c:s", "mov_text"]
+
+        # Capítulos: o arquivo ffmetadata precisa ser a entrada 1 (`-map_metadata 1`).
+        if self._add_chapters and info.get("chapters"):
+            self._fixup_chapters(info)
+            meta_file = replace_extension(filename, "meta")
+            for opts in self._get_chapter_opts(info["chapters"], meta_file):
+                options.extend(opts)
+            inputs.append(meta_file)
+            files_to_delete.append(meta_file)
+            embedded.append("chapters")
+        if self._add_metadata:
+            for opts in self._get_metadata_opts(info):
+                options.extend(opts)
+            embedded.append("metadata")
+
+        out_stream = self._media_streams(info)
+        subs = self._subtitle_inputs(info)
+        for i, (path, lang, name, sub_files) in enumerate(subs):
+            options += ["-map", f"{len(inputs)}:0", f"-metadata:s:s:{i}", f"language={ISO639Utils.short2long(lang) or lang}"]
+            if name:
+                options += [f"-metadata:s:s:{i}", f"handler_name={name}", f"-metadata:s:s:{i}", f"title={name}"]
+            inputs.append(path)
+            files_to_delete.extend(sub_files)
+            out_stream += 1
+        if subs:
+            embedded.append("subtitles")
+
+        cover_files = self._cover(info)
+        cover = cover_files[-1] if cover_files else None
+        if cover and ext in _ATTACHED_PIC_EXTS:
+            options += ["-map", str(len(inputs)), f"-disposition:{out_stream}", "attached_pic"]
+            inputs.append(cover)
+        elif cover:
+            mimetype = "image/png" if cover.endswith("png") else "image/jpeg"
+            options += ["-attach", self._ffmpeg_filename_argument(cover),
+                        f"-metadata:s:{out_stream}", f"mimetype={mimetype}",
+                        f"-metadata:s:{out_stream}", f"filename=cover.{cover.rsplit('.', 1)[-1]}"]
+        if cover:
+            files_to_delete.extend(cover_files)
+            embedded.append("thumbnail")
+        elif self._add_thumbnail:
+            # Contêiner sem capa (ex.: webm): a miniatura baixada para isso não deve sobrar na pasta.
+            files_to_delete.extend(t["filepath"] for t in info.get("thumbnails") or [] if t.get("filepath"))
+
+        return FinalizePlan(inputs, options, files_to_delete, embedded)
+
+    @PostProcessor._restrict_to(images=False)
+    def run(self, info: dict[str, Any]) -> tuple[list[str], dict[str, Any]]:
+        plan = self.plan(info)
+        if not plan:
+            return [], info
+
+        filename = info["filepath"]
+        temp_filename = prepend_extension(filename, "temp")
+        self.to_screen(f'Finalizing "{filename}" ({", ".join(plan.embedded)})')
+        try:
+            self.run_ffmpeg_multiple_files(plan.inputs, temp_filename, plan.options)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+        return plan.files_to_delete, info
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from Downloadium.backend.throughput import FRAGMENTED, PROGRESSIVE, protocol_kind
+
+
+# Codecs que cada contêiner aceita sem recodificar (None = aceita qualquer um).
+_CONTAINER_CODECS: dict[str, tuple[Optional[frozenset], Optional[frozenset]]] = {
+    "mp4": (frozenset({"avc1", "h264", "av01", "hev1", "hvc1"}), frozenset({"mp4a", "aac"})),
+    "webm": (frozenset({"vp9", "vp8", "av01"}), frozenset({"opus", "vorbis"})),
+    "mkv": (None, None),
+}
+
+_HEIGHT_RE = re.compile(r"(\d{3,4})p", re.IGNORECASE)
+
+
+def codec_family(codec: Optional[str]) -> str:
+    """Família do codec: "avc1.64001F" -> "avc1", "vp09.00.40.08" -> "vp9", ausente -> "none"."""
+    family = str(codec or "none").split(".")[0].lower()
+    return {"vp09": "vp9", "vp08": "vp8"}.get(family, family)
+
+
+def container_accepts(container: Optional[str], vcodec: Optional[str] = None, acodec: Optional[str] = None) -> bool:
+    """True se o contêiner recebe esses codecs só com cópia de streams (sem recodificar)."""
+    video_codecs, audio_codecs = _CONTAINER_CODECS.get((container or "").lower(), (None, None))
+    video, audio = codec_family(vcodec), codec_family(acodec)
+    return (video == "none" or video_codecs is None or video in video_codecs) and (
+        audio == "none" or audio_codecs is None or audio in audio_codecs
+    )
+
+
+def height_from_label(label: Optional[str]) -> Optional[int]:
+    """Altura pedida em "720p", "1080p60" ou "720"; None para "Melhor"/"best"/desconhecido."""
+    text = (label or "").strip().lower()
+    match = _HEIGHT_RE.search(text)
+    if match:
+        return int(match.group(1))
+    return int(text) if text.isdigit() else None
+
+
+@dataclass(frozen=True)
+class FormatEntry:
+    format_id: str
+    height: int
+    vcodec: str
+    acodec: str
+    ext: str
+    protocol: str
+    size: Optional[int]
+    tbr: float
+    fps: float
+    note: str
+
+    @property
+    def has_video(self) -> bool:
+        return self.vcodec != "none"
+
+    @property
+    def has_audio(self) -> bool:
+        return self.acodec != "none"
+
+    @classmethod
+    def from_format(cls, fmt: dict[str, Any], duration: Optional[float] = None) -> "FormatEntry":
+        tbr = float(fmt.get("tbr") or 0)
+        size = fmt.get("filesize") or fmt.get("filesize_approx")
+        if not size and tbr and duration:
+            size = tbr * 1000 / 8 * duration  # tbr em kbit/s
+        return cls(
+            format_id=str(fmt.get("format_id")),
+            height=int(fmt.get("height") or 0),
+            vcodec=codec_family(fmt.get("vcodec")),
+            acodec=codec_family(fmt.get("acodec")),
+            ext=str(fmt.get("ext") or ""),
+            protocol=str(fmt.get("protocol") or ""),
+            size=int(size) if size else None,
+            tbr=tbr,
+            fps=float(fmt.get("fps") or 0),
+            note=str(fmt.get("format_note") or ""),
+        )
+
+
+@dataclass(frozen=True)
+class FormatChoice:
+    format_ids: tuple[str, ...]
+    height: int
+    size: Optional[int]
+    fps: float = 0.0
+    tbr: float = 0.0
+    kind: str = PROGRESSIVE
+    # False quando os codecs não cabem no contêiner pedido (o merge vai para mkv).
+    remux: bool = True
+
+    @property
+    def spec(self) -> str:
+        return "+".join(self.format_ids)
+
+    @classmethod
+    def combine(cls, entries: Iterable[FormatEntry], container: str) -> "FormatChoice":
+        parts = tuple(entries)
+        sizes = [e.size for e in parts]
+        remux = all(container_accepts(container, e.vcodec, e.acodec) for e in parts)
+        return cls(
+            format_ids=tuple(e.format_id for e in parts),
+            height=max(e.height for e in parts),
+            size=sum(sizes) if all(sizes) else None,  # type: ignore[arg-type]
+            fps=max(e.fps for e in parts),
+            tbr=sum(e.tbr for e in parts),
+            kind=FRAGMENTED if any(protocol_kind(e.protocol) == FRAGMENTED for e in parts) else PROGRESSIVE,
+            remux=remux,
+        )
+
+
+class CostModel:
+    """Tempo estimado (segundos) para baixar e juntar uma combinação de formatos.
+
+    Usa a vazão medida para o host (ThroughputHistory) por tipo de protocolo e, sem histórico,
+    `default_rate`. Fragmentos pagam `fragment_overhead`. O merge é sempre por cópia de streams,
+    então o contêiner não entra no custo (só desempata em `FormatIndex.choose`).
+    """
+
+    def __init__(
+        self,
+        history: Any = None,
+        host: Optional[str] = None,
+        default_rate: float = 2 * 1024 * 1024,
+        fragment_overhead: float = 1.25,
+    ):
+        self.history = history
+        self.host = host
+        self.default_rate = default_rate
+        self.fragment_overhead = fragment_overhead
+
+    def rate(self, kind: str) -> float:
+        measured = self.history.rate(self.host, kind) if self.history is not None else None
+        return measured or self.default_rate
+
+    def seconds(self, choice: FormatChoice) -> Optional[float]:
+        if not choice.size:
+            return None
+        seconds = choice.size / self.rate(choice.kind)
+        if choice.kind == FRAGMENTED:
+            seconds *= self.fragment_overhead
+        return seconds
+
+
+class DeadlineBudget:
+    """Prazo de um job inteiro (`seconds`), repartido entre as entradas que ainda faltam.
+
+    Cada vídeo que começa recebe `tempo restante / entradas restantes` (vezes os `parallel`
+    downloads simultâneos): um vídeo lento encurta a fatia dos próximos, um rápido a alonga.
+    """
+
+    def __init__(self, seconds: float, entries: int = 1, parallel: int = 1, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.ends_at = clock() + max(0.0, seconds)
+        self.remaining = max(1, entries)
+        self.parallel = max(1, parallel)
+        self._lock = threading.Lock()
+
+    def next_deadline(self) -> float:
+        """Segundos para o próximo vídeo; a entrada sai das restantes."""
+        with self._lock:
+            left = max(0.0, self.ends_at - self._clock())
+            share = left * min(self.parallel, self.remaining) / self.remaining
+            self.remaining = max(1, self.remaining - 1)
+            return share
+
+
+class FormatIndex:
+    """Tabela de formatos de UM vídeo agrupada por altura, pronta para escolher IDs exatos.
+
+    Montada a partir dos formatos já extraídos (ou dos formatos enxutos do MetadataCache), serve
+    ao menu de resoluções, à estimativa de tamanho e ao seletor usado no download.
+    """
+
+    def __init__(self, formats: Iterable[dict[str, Any]], duration: Optional[float] = None):
+        self.duration = duration
+        entries = []
+        for fmt in formats or []:
+            if not fmt.get("format_id") or fmt.get("ext") == "mhtml":
+                continue  # storyboards
+            entries.append(FormatEntry.from_format(fmt, duration))
+        self.entries: tuple[FormatEntry, ...] = tuple(entries)
+
+        self.by_height: dict[int, list[FormatEntry]] = {}
+        for entry in self.entries:
+            if entry.has_video:
+                self.by_height.setdefault(entry.height, []).append(entry)
+        self.audio: list[FormatEntry] = [e for e in self.entries if e.has_audio and not e.has_video]
+
+    @classmethod
+    def from_info(cls, info: dict[str, Any]) -> "FormatIndex":
+        return cls(info.get("formats") or [], duration=info.get("duration"))
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+
+    @property
+    def heights(self) -> list[int]:
+        return sorted((h for h in self.by_height if h), reverse=True)
+
+    def resolution_labels(self) -> list[str]:
+        """Rótulos do menu ("Melhor", "1080p60", "720p", ...), do maior para o menor."""
+        labels: list[tuple[int, str]] = []
+        seen: set[str] = set()
+        for height in self.heights:
+            for entry in self.by_height[height]:
+                label = entry.note or f"{height}p"
+                if label not in seen:
+                    seen.add(label)
+                    labels.append((height, label))
+        labels.sort(key=lambda item: item[0], reverse=True)
+        return ["Melhor"] + [label for _, label in labels]
+
+    # -----------------
+    # Seleção
+    # -----------------
+
+    def candidates(self, container: str = "mp4") -> list[FormatChoice]:
+        """Combinações baixáveis: cada vídeo sem áudio com o melhor áudio, e cada formato único."""
+        audio = max(self.audio, key=lambda e: (container_accepts(container, acodec=e.acodec), e.tbr), default=None)
+        out: list[FormatChoice] = []
+        for height in self.heights:
+            for entry in self.by_height[height]:
+                if entry.has_audio:
+                    out.append(FormatChoice.combine([entry], container))
+                elif audio is not None:
+                    out.append(FormatChoice.combine([entry, audio], container))
+        if not out and audio is not None:
+            out.append(FormatChoice.combine([audio], container))
+        return out
+
+    def choose(
+        self,
+        height: Optional[int] = None,
+        container: str = "mp4",
+        cost: Optional[CostModel] = None,
+        deadline: Optional[float] = None,
+    ) -> Optional[FormatChoice]:
+        """Melhor combinação com altura até `height`.
+
+        Sem prazo, a qualidade manda: fica com a maior altura (e fps) possível e o custo só
+        desempata (codecs que cabem no contêiner pedido antes dos que vão para mkv, depois o
+        mais rápido). Com `deadline` (segundos para ESTE vídeo; o prazo de um job sai de
+        DeadlineBudget), o custo decide primeiro: descarta o que não termina a tempo e, se nada
+        couber, fica com a mais rápida.
+        """
+        candidates = self.candidates(container)
+        if not candidates:
+            return None
+        allowed = [c for c in candidates if height is None or c.height <= height]
+        if not allowed:
+            lowest = min(c.height for c in candidates)
+            allowed = [c for c in candidates if c.height == lowest]
+
+        cost = cost or CostModel()
+        seconds = {c: cost.seconds(c) for c in allowed}
+        unknown = float("inf")
+
+        if deadline is not None:
+            in_time = [c for c in allowed if (seconds[c] or unknown) <= deadline]
+            if not in_time:
+                return min(allowed, key=lambda c: (seconds[c] or unknown, -c.height))
+            allowed = in_time
+
+        top = max((c.height, c.fps) for c in allowed)
+        best = [c for c in allowed if (c.height, c.fps) == top]
+        return min(best, key=lambda c: (not c.remux, seconds[c] or unknown, -c.tbr))
+
+    def selector(
+        self,
+        height: Optional[int] = None,
+        container: str = "mp4",
+        cost: Optional[CostModel] = None,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """Seletor do yt-dlp com os IDs exatos primeiro e os genéricos só como rede de segurança."""
+        generic = f"bestvideo[height<={height}]+bestaudio/best[height<={height}]/best" if height else "bestvideo+bestaudio/best"
+        choice = self.choose(height, container, cost, deadline)
+        return f"{choice.spec}/{generic}" if choice else generic
+
+    def estimate_size(self, height: Optional[int] = None, container: str = "mp4") -> Optional[int]:
+        choice = self.choose(height, container)
+        return choice.size if choice else None
+
+
+class IndexedFormatSelector:
+    """Formato "callable" do yt-dlp: monta o FormatIndex de cada vídeo e escolhe os IDs exatos.
+
+    Usado em playlists, onde cada entrada tem a sua tabela. DownloadiumYDL chama `bind()` com a
+    própria instância para compilar os seletores com as mesmas opções do download, e `prepare()`
+    com o info dict de cada vídeo: o ctx do seletor só traz os formatos, sem id nem duração.
+    Um índice já montado (ex.: o da ExtractionSession) entra por `use_index()` e é reaproveitado.
+    Com `budget`, cada vídeo escolhe dentro da sua fatia do prazo do job.
+    """
+
+    MAX_INDEXES = 16
+
+    def __init__(
+        self,
+        height: Optional[int] = None,
+        container: str = "mp4",
+        cost: Optional[CostModel] = None,
+        budget: Optional[DeadlineBudget] = None,
+    ):
+        self.height = height
+        self.container = container
+        self.cost = cost
+        self.budget = budget
+        self._ydl: Any = None
+        self._compiled: dict[str, Callable[[dict], Iterable[dict]]] = {}
+        self._indexes: dict[str, FormatIndex] = {}
+        self._video: tuple[Optional[str], Optional[float]] = (None, None)
+
+    def bind(self, ydl: Any) -> "IndexedFormatSelector":
+        # O budget é do job: os workers de uma playlist dividem o mesmo.
+        bound = IndexedFormatSelector(self.height, self.container, self.cost, self.budget)
+        bound._ydl = ydl
+        return bound
+
+    def use_index(self, video_id: Optional[str], index: FormatIndex) -> None:
+        if video_id and index:
+            self._indexes[video_id] = index
+            while len(self._indexes) > self.MAX_INDEXES:
+                self._indexes.pop(next(iter(self._indexes)))
+
+    def prepare(self, info: dict[str, Any]) -> None:
+        """Vídeo cujos formatos a próxima chamada vai receber."""
+        self._video = (info.get("id"), info.get("duration"))
+
+    def _index(self, ctx: dict[str, Any]) -> FormatIndex:
+        video_id, duration = self._video
+        index = self._indexes.get(video_id) if video_id else None
+        if index is None:
+            index = FormatIndex(ctx.get("formats") or [], duration=duration)
+            self.use_index(video_id, index)
+        return index
+
+    def __call__(self, ctx: dict[str, Any]) -> Iterator[dict]:
+        if self._ydl is None:
+            raise RuntimeError("IndexedFormatSelector precisa de bind(ydl) antes do uso")
+        deadline = self.budget.next_deadline() if self.budget is not None else None
+        spec = self._index(ctx).selector(self.height, self.container, self.cost, deadline)
+        compiled = self._compiled.get(spec)
+        if compiled is None:
+            compiled = self._compiled[spec] = self._ydl.build_format_selector(spec)
+        yield from compiled(ctx)
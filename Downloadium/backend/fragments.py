@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Optional
+
+from yt_dlp.downloader.dash import DashSegmentsFD
+from yt_dlp.downloader.hls import HlsFD
+from yt_dlp.networking.exceptions import HTTPError, IncompleteRead
+from yt_dlp.utils import DownloadError, RetryManager
+from yt_dlp.utils.networking import HTTPHeaderDict
+
+from Downloadium.backend.utils import url_host
+
+
+DEFAULT_START = 2
+DEFAULT_MAX = 8
+# Status HTTP tratados como "servidor pedindo para ir mais devagar".
+_THROTTLE_STATUSES = {403, 429, 503}
+
+_learned: dict[str, int] = {}
+_learned_lock = threading.Lock()
+
+
+def learned_concurrency(host: str, default: int = DEFAULT_START) -> int:
+    """Concorrência com que o último download do host terminou (ponto de partida do próximo)."""
+    with _learned_lock:
+        return _learned.get(host, default)
+
+
+def remember_concurrency(host: str, limit: int) -> None:
+    with _learned_lock:
+        _learned[host] = limit
+
+
+class AdaptiveConcurrency:
+    """Escolhe quantos fragmentos baixar ao mesmo tempo a partir da vazão medida.
+
+    A cada rodada (`limit` fragmentos concluídos) compara a vazão com a rodada anterior: sobe um
+    nível enquanto ela melhora, desce um nível se piorar, e corta pela metade em erro/throttling.
+    """
+
+    def __init__(self, start: int = DEFAULT_START, minimum: int = 1, maximum: int = DEFAULT_MAX,
+                 gain: float = 1.05, loss: float = 0.9):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, start))
+        self.gain = gain
+        self.loss = loss
+
+        self._last_throughput = 0.0
+        self._round_bytes = 0
+        self._round_count = 0
+        self._round_started = time.monotonic()
+
+    def _reset_round(self) -> None:
+        self._round_bytes = 0
+        self._round_count = 0
+        self._round_started = time.monotonic()
+
+    def record(self, nbytes: int, error: bool = False, throttled: bool = False) -> int:
+        if error or throttled:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._last_throughput = 0.0
+            self._reset_round()
+            return self.limit
+
+        self._round_bytes += nbytes
+        self._round_count += 1
+        if self._round_count < self.limit:
+            return self.limit
+
+        elapsed = max(time.monotonic() - self._round_started, 1e-6)
+        throughput = self._round_bytes / elapsed
+        if not self._last_throughput or throughput > self._last_throughput * self.gain:
+            self.limit = min(self.maximum, self.limit + 1)
+        elif throughput < self._last_throughput * self.loss:
+            self.limit = max(self.minimum, self.limit - 1)
+        self._last_throughput = throughput
+        self._reset_round()
+        return self.limit
+
+
+class AdaptiveFragmentMixin:
+    """Substitui o pool fixo do FragmentFD (concurrent_fragment_downloads) por uma janela adaptativa.
+
+    Fragmentos concluídos fora de ordem ficam em disco até o anterior ser anexado; a janela
+    (`fragment_reorder_window`) limita quantos podem estar em voo ou esperando, o que também
+    limita a memória/disco usados pela reordenação. Lives e downloads paralelos de vídeo+áudio
+    seguem o caminho original do yt-dlp.
+    """
+
+    params: dict[str, Any]
+
+    def download_and_append_fragments(
+        self, ctx: dict, fragments: Iterable[dict], info_dict: dict, *,
+        is_fatal: Callable[[int], bool] = (lambda idx: False),
+        pack_func: Callable[[bytes, int], bytes] = (lambda content, idx: content),
+        finish_func: Optional[Callable[[], bytes]] = None,
+        tpe: Any = None, interrupt_trigger: Any = (True, ),
+    ) -> Any:
+        if ctx.get("live") or info_dict.get("is_live") or ctx.get("max_progress", 1) > 1 or self.params.get("test"):
+            return super().download_and_append_fragments(  # type: ignore[misc]
+                ctx, fragments, info_dict, is_fatal=is_fatal, pack_func=pack_func,
+                finish_func=finish_func, tpe=tpe, interrupt_trigger=interrupt_trigger)
+
+        if not self.params.get("skip_unavailable_fragments", True):
+            is_fatal = lambda _: True  # noqa: E731
+
+        host = url_host(info_dict.get("url"))
+        maximum = int(self.params.get("max_concurrent_fragments") or DEFAULT_MAX)
+        start = learned_concurrency(host, int(self.params.get("concurrent_fragment_downloads") or DEFAULT_START))
+        controller = AdaptiveConcurrency(start=start, maximum=maximum)
+        window = int(self.params.get("fragment_reorder_window") or maximum * 4)
+        decrypt_fragment = self.decrypter(info_dict)  # type: ignore[attr-defined]
+
+        def download_fragment(fragment: dict) -> tuple[dict, dict, int]:
+            # Mesmo fluxo do FragmentFD.download_and_append_fragments, com uma cópia do ctx por thread.
+            frag_ctx = ctx.copy()
+            frag_index = frag_ctx["fragment_index"] = fragment["frag_index"]
+            frag_ctx["last_error"] = None
+            headers = HTTPHeaderDict(info_dict.get("http_headers"))
+            byte_range = fragment.get("byte_range")
+            if byte_range:
+                headers["Range"] = "bytes=%d-%d" % (byte_range["start"], byte_range["end"] - 1)
+            fatal = is_fatal(fragment.get("index") or (frag_index - 1))
+
+            def error_callback(err: Exception, count: int, retries: int) -> None:
+                self.report_retry(err, count, retries, frag_index, fatal)  # type: ignore[attr-defined]
+                frag_ctx["last_error"] = err
+
+            for retry in RetryManager(self.params.get("fragment_retries"), error_callback):
+                try:
+                    frag_ctx["fragment_count"] = fragment.get("fragment_count")
+                    if not self._download_fragment(  # type: ignore[attr-defined]
+                            frag_ctx, fragment["url"], info_dict, headers, info_dict.get("request_data")):
+                        break
+                except (HTTPError, IncompleteRead) as err:
+                    retry.error = err
+                    continue
+                except DownloadError:
+                    if fatal:
+                        raise
+
+            name = frag_ctx.get("fragment_filename_sanitized")
+            size = os.path.getsize(name) if name and os.path.isfile(name) else 0
+            return fragment, frag_ctx, size
+
+        def append_fragment(fragment: dict, frag_ctx: dict) -> bool:
+            frag_index = fragment["frag_index"]
+            ctx.update({
+                "fragment_filename_sanitized": frag_ctx.get("fragment_filename_sanitized"),
+                "fragment_index": frag_index,
+            })
+            frag_content = decrypt_fragment(fragment, self._read_fragment(ctx))  # type: ignore[attr-defined]
+            if frag_content:
+                self._append_fragment(ctx, pack_func(frag_content, frag_index))  # type: ignore[attr-defined]
+            elif not is_fatal(frag_index - 1):
+                self.report_skip_fragment(frag_index, "fragment not found")  # type: ignore[attr-defined]
+            else:
+                ctx["dest_stream"].close()
+                self.report_error(f"fragment {frag_index} not found, unable to continue")  # type: ignore[attr-defined]
+                return False
+            return True
+
+        source = iter(fragments)
+        exhausted = False
+        submitted = 0
+        next_append = 0
+        inflight: dict[Future, int] = {}
+        ready: dict[int, tuple[dict, dict]] = {}
+
+        with ThreadPoolExecutor(max_workers=controller.maximum, thread_name_prefix="downloadium-frag") as pool:
+            try:
+                while True:
+                    while (not exhausted and interrupt_trigger[0] and len(inflight) < controller.limit
+                           and submitted - next_append < window):
+                        fragment = next(source, None)
+                        if fragment is None:
+                            exhausted = True
+                            break
+                        inflight[pool.submit(download_fragment, fragment)] = submitted
+                        submitted += 1
+
+                    if not inflight and (exhausted or not interrupt_trigger[0]) and next_append not in ready:
+                        break
+
+                    if inflight:
+                        done, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+                        for future in done:
+                            position = inflight.pop(future)
+                            fragment, frag_ctx, size = future.result()
+                            error = frag_ctx.get("last_error")
+                            throttled = isinstance(error, HTTPError) and error.status in _THROTTLE_STATUSES
+                            controller.record(size, error=error is not None, throttled=throttled)
+                            ready[position] = (fragment, frag_ctx)
+
+                    # Anexa em ordem tudo o que já chegou.
+                    while next_append in ready:
+                        fragment, frag_ctx = ready.pop(next_append)
+                        if not append_fragment(fragment, frag_ctx):
+                            return False
+                        next_append += 1
+            except BaseException:
+                for future in inflight:
+                    future.cancel()
+                raise
+
+        remember_concurrency(host, controller.limit)
+        if finish_func is not None:
+            ctx["dest_stream"].write(finish_func())
+            ctx["dest_stream"].flush()
+        return self._finish_frag_download(ctx, info_dict)  # type: ignore[attr-defined]
+
+
+class AdaptiveDashFD(AdaptiveFragmentMixin, DashSegmentsFD):
+    FD_NAME = "dashsegments"
+
+
+class AdaptiveHlsFD(AdaptiveFragmentMixin, HlsFD):
+    FD_NAME = "hlsnative"
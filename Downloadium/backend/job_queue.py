@@ -0,0 +1,773 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, cast
+
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadCancelled
+
+from Downloadium.backend.events import (
+    CANCELLED,
+    DONE,
+    ENCODING,
+    ERROR,
+    LISTING,
+    MESSAGE,
+    PAUSED,
+    QUEUED,
+    RATE_LIMITED,
+    RETRYING,
+    SKIPPING,
+    TRANSCODING,
+    EventCallback,
+    ProgressEvent,
+    download_event,
+    event_sink,
+)
+from Downloadium.backend.finalize import ffmpeg_available
+from Downloadium.backend.formats import DeadlineBudget
+from Downloadium.backend.pipeline import PostProcessPipeline
+from Downloadium.backend.rate_limit import is_rate_limited
+from Downloadium.backend.remux import JobStats, MergePlan
+from Downloadium.backend.scheduler import EntryRetry
+from Downloadium.backend.utils import get_app_data_dir, url_host
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+# Estados de job e de entrada persistidos no journal.
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_PAUSED = "paused"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELED = "canceled"
+
+ENTRY_PENDING = "pending"
+ENTRY_DOWNLOADING = "downloading"
+ENTRY_DONE = "done"
+ENTRY_FAILED = "failed"
+ENTRY_SKIPPED = "skipped"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'queued',
+    expanded INTEGER NOT NULL DEFAULT 0,
+    playlist_extra TEXT NOT NULL DEFAULT '{}',
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    started_at REAL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    job_id INTEGER NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    entry_id TEXT,
+    data TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    partial_path TEXT,
+    filename TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS entries_state ON entries (state, job_id, idx);
+"""
+
+
+@dataclass
+class Job:
+    id: int
+    url: str
+    options: dict[str, Any]
+    priority: int
+    state: str
+    expanded: bool
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+    # Primeira vez que o job rodou (âncora do `deadline` do job); None enquanto não começou.
+    started_at: Optional[float] = None
+    counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def finished(self) -> int:
+        return self.counts.get(ENTRY_DONE, 0) + self.counts.get(ENTRY_SKIPPED, 0)
+
+
+@dataclass
+class JobEntry:
+    job_id: int
+    index: int
+    entry_id: Optional[str]
+    data: dict[str, Any]
+    state: str
+    partial_path: Optional[str] = None
+    filename: Optional[str] = None
+    error: Optional[str] = None
+
+
+def flat_entry(entry: dict, fallback_url: Optional[str] = None) -> dict[str, Any]:
+    """Reduz uma entrada a um resultado do tipo url (o que persiste bem: sem URLs de mídia que expiram)."""
+    if entry.get("_type") in ("url", "url_transparent") and entry.get("url"):
+        keep = ("_type", "url", "id", "ie_key", "title", "duration", "channel", "channel_id", "uploader")
+        return {k: entry[k] for k in keep if entry.get(k) is not None}
+
+    out: dict[str, Any] = {
+        "_type": "url",
+        "url": entry.get("webpage_url") or entry.get("original_url") or fallback_url or entry.get("url"),
+        "id": entry.get("id"),
+        "ie_key": entry.get("extractor_key") or entry.get("ie_key"),
+        "title": entry.get("title"),
+    }
+    return {k: v for k, v in out.items() if v is not None}
+
+
+class JobQueue:
+    """Fila de downloads persistente (SQLite em modo WAL) com prioridades, pausa e retomada.
+
+    Guarda os jobs, a lista expandida de entradas (para não enumerar o canal de novo) e o estado de
+    cada entrada, incluindo o arquivo parcial (.part) que o yt-dlp retoma depois de uma queda.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_app_data_dir(), "queue.sqlite3")
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._interrupted: set[int] = set()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Cada transição de estado precisa sobreviver a uma queda de energia.
+            self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self.recover()
+
+    def _migrate(self) -> None:
+        """Colunas que bancos de versões anteriores ainda não têm."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "started_at" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN started_at REAL")
+
+    # -----------------
+    # Recuperação
+    # -----------------
+
+    def recover(self) -> int:
+        """Volta jobs/entradas interrompidos (queda, reboot) para a fila. Retorna quantos jobs voltaram."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET state = ? WHERE state = ?",
+                (ENTRY_PENDING, ENTRY_DOWNLOADING),
+            )
+            cur = self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE state = ?",
+                (JOB_QUEUED, time.time(), JOB_RUNNING),
+            )
+            self._interrupted = {
+                row[0] for row in self._conn.execute("SELECT id FROM jobs WHERE state IN (?, ?)", (JOB_PAUSED, JOB_CANCELED))
+            }
+            return cur.rowcount
+
+    # -----------------
+    # Jobs
+    # -----------------
+
+    def add(self, url: str, options: Optional[dict[str, Any]] = None, priority: int = 0) -> int:
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO jobs (url, options, priority, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, json.dumps(options or {}), int(priority), JOB_QUEUED, now, now),
+            )
+            self._wakeup.notify_all()
+            return int(cur.lastrowid or 0)
+
+    def _row_to_job(self, row: tuple, counts: Optional[dict[str, int]] = None) -> Job:
+        job = Job(
+            id=row[0],
+            url=row[1],
+            options=json.loads(row[2] or "{}"),
+            priority=row[3],
+            state=row[4],
+            expanded=bool(row[5]),
+            error=row[6],
+            created_at=row[7],
+            updated_at=row[8],
+            started_at=row[9],
+        )
+        if counts is None:
+            counts = dict(
+                self._conn.execute("SELECT state, COUNT(*) FROM entries WHERE job_id = ? GROUP BY state", (job.id,))
+            )
+        job.counts = counts
+        return job
+
+    _JOB_COLUMNS = "id, url, options, priority, state, expanded, error, created_at, updated_at, started_at"
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {self._JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._row_to_job(row) if row else None
+
+    def jobs(self, states: Optional[tuple[str, ...]] = None) -> list[Job]:
+        """Jobs por prioridade; as contagens de todos saem de uma única consulta agrupada."""
+        where, params = "", ()
+        if states:
+            where = f" WHERE state IN ({','.join('?' * len(states))})"
+            params = tuple(states)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._JOB_COLUMNS} FROM jobs{where} ORDER BY priority DESC, id ASC", params
+            ).fetchall()
+            counts: dict[int, dict[str, int]] = {row[0]: {} for row in rows}
+            for job_id, state, count in self._conn.execute(
+                "SELECT job_id, state, COUNT(*) FROM entries "
+                f"WHERE job_id IN (SELECT id FROM jobs{where}) GROUP BY job_id, state",
+                params,
+            ):
+                if job_id in counts:
+                    counts[job_id][state] = count
+            return [self._row_to_job(row, counts[row[0]]) for row in rows]
+
+    def _set_job_state(self, job_id: int, state: str, error: Optional[str] = None) -> None:
+        now = time.time()
+        self._conn.execute(
+            "UPDATE jobs SET state = ?, error = COALESCE(?, error), updated_at = ? WHERE id = ?",
+            (state, error, now, job_id),
+        )
+        if state == JOB_RUNNING:
+            self._conn.execute("UPDATE jobs SET started_at = COALESCE(started_at, ?) WHERE id = ?", (now, job_id))
+
+    def set_priority(self, job_id: int, priority: int) -> None:
+        """Vale também para jobs em andamento: a próxima entrada escolhida já respeita a nova ordem."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET priority = ?, updated_at = ? WHERE id = ?",
+                (int(priority), time.time(), job_id),
+            )
+            self._wakeup.notify_all()
+
+    def pause(self, job_id: int) -> None:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND state IN (?, ?)",
+                (JOB_PAUSED, time.time(), job_id, JOB_QUEUED, JOB_RUNNING),
+            )
+            # Job já terminado (ou inexistente) não tem o que interromper.
+            if cursor.rowcount:
+                self._interrupted.add(job_id)
+
+    def resume(self, job_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND state IN (?, ?)",
+                (JOB_QUEUED, time.time(), job_id, JOB_PAUSED, JOB_FAILED),
+            )
+            # Entradas que falharam ganham nova chance ao retomar o job.
+            self._conn.execute(
+                "UPDATE entries SET state = ?, error = NULL WHERE job_id = ? AND state = ?",
+                (ENTRY_PENDING, job_id, ENTRY_FAILED),
+            )
+            # A última entrada pode ter terminado durante a pausa (ex.: no pós-processamento adiado).
+            self._refresh_job_locked(job_id)
+            self._interrupted.discard(job_id)
+            self._wakeup.notify_all()
+
+    def cancel(self, job_id: int) -> None:
+        with self._lock, self._conn:
+            self._set_job_state(job_id, JOB_CANCELED)
+            self._interrupted.add(job_id)
+
+    def remove(self, job_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._interrupted.discard(job_id)
+
+    def is_interrupted(self, job_id: int) -> bool:
+        """Consulta barata (em memória), feita a cada callback de progresso."""
+        return job_id in self._interrupted
+
+    def is_cancelled(self, job_id: int) -> bool:
+        """Motivo da interrupção: True para cancelamento (ou job removido), False para pausa."""
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return row is None or row[0] == JOB_CANCELED
+
+    def fail_job(self, job_id: int, error: str) -> None:
+        with self._lock, self._conn:
+            self._set_job_state(job_id, JOB_FAILED, error)
+
+    # -----------------
+    # Entradas
+    # -----------------
+
+    def set_entries(
+        self,
+        job_id: int,
+        entries: list[dict],
+        playlist_extra: Optional[dict[str, Any]] = None,
+        skipped: Optional[set[int]] = None,
+    ) -> None:
+        """Grava a expansão do job uma única vez (retomadas não enumeram o canal de novo).
+
+        `skipped` são índices (base 1) já presentes no arquivo de downloads; ficam registrados
+        como ENTRY_SKIPPED para manter a numeração da playlist.
+        """
+        skipped = skipped or set()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries (job_id, idx, entry_id, data, state) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        job_id,
+                        i + 1,
+                        entry.get("id"),
+                        json.dumps(entry, default=str),
+                        ENTRY_SKIPPED if i + 1 in skipped else ENTRY_PENDING,
+                    )
+                    for i, entry in enumerate(entries)
+                ],
+            )
+            self._conn.execute(
+                "UPDATE jobs SET expanded = 1, playlist_extra = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(playlist_extra or {}, default=str), time.time(), job_id),
+            )
+            self._refresh_job_locked(job_id)
+            self._wakeup.notify_all()
+
+    def playlist_extra(self, job_id: int) -> dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT playlist_extra FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return json.loads(row[0]) if row and row[0] else {}
+
+    def entries(self, job_id: int) -> list[JobEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, idx, entry_id, data, state, partial_path, filename, error "
+                "FROM entries WHERE job_id = ? ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+        return [JobEntry(r[0], r[1], r[2], json.loads(r[3]), r[4], r[5], r[6], r[7]) for r in rows]
+
+    def update_entry(
+        self,
+        job_id: int,
+        index: int,
+        state: Optional[str] = None,
+        partial_path: Optional[str] = None,
+        filename: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET state = COALESCE(?, state), partial_path = COALESCE(?, partial_path), "
+                "filename = COALESCE(?, filename), error = ? WHERE job_id = ? AND idx = ?",
+                (state, partial_path, filename, error, job_id, index),
+            )
+            if state is not None:
+                self._refresh_job_locked(job_id)
+                self._wakeup.notify_all()
+
+    def _refresh_job_locked(self, job_id: int) -> None:
+        row = self._conn.execute("SELECT state, expanded FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or not row[1] or row[0] not in (JOB_QUEUED, JOB_RUNNING):
+            return
+        counts = dict(
+            self._conn.execute("SELECT state, COUNT(*) FROM entries WHERE job_id = ? GROUP BY state", (job_id,)).fetchall()
+        )
+        if counts.get(ENTRY_PENDING) or counts.get(ENTRY_DOWNLOADING):
+            return
+        self._set_job_state(job_id, JOB_FAILED if counts.get(ENTRY_FAILED) else JOB_DONE)
+
+    # -----------------
+    # Escalonamento
+    # -----------------
+
+    def claim_next(self) -> Optional[tuple[Job, Optional[JobEntry]]]:
+        """Reserva o próximo trabalho por prioridade: expandir um job novo ou baixar uma entrada.
+
+        Retorna (job, None) para expansão ou (job, entrada) para download.
+        """
+        with self._lock, self._conn:
+            expand = self._conn.execute(
+                "SELECT id, priority FROM jobs WHERE state = ? AND expanded = 0 ORDER BY priority DESC, id ASC LIMIT 1",
+                (JOB_QUEUED,),
+            ).fetchone()
+            entry = self._conn.execute(
+                "SELECT e.job_id, e.idx, j.priority FROM entries e JOIN jobs j ON j.id = e.job_id "
+                "WHERE e.state = ? AND j.state IN (?, ?) AND j.expanded = 1 "
+                "ORDER BY j.priority DESC, j.id ASC, e.idx ASC LIMIT 1",
+                (ENTRY_PENDING, JOB_QUEUED, JOB_RUNNING),
+            ).fetchone()
+
+            if expand and (not entry or (expand[1], -expand[0]) > (entry[2], -entry[0])):
+                self._set_job_state(expand[0], JOB_RUNNING)
+                job = self.get(expand[0])
+                return (job, None) if job else None
+
+            if not entry:
+                return None
+
+            job_id, index = entry[0], entry[1]
+            self._conn.execute(
+                "UPDATE entries SET state = ? WHERE job_id = ? AND idx = ?",
+                (ENTRY_DOWNLOADING, job_id, index),
+            )
+            self._set_job_state(job_id, JOB_RUNNING)
+            job = self.get(job_id)
+            row = self._conn.execute(
+                "SELECT job_id, idx, entry_id, data, state, partial_path, filename, error FROM entries "
+                "WHERE job_id = ? AND idx = ?",
+                (job_id, index),
+            ).fetchone()
+            if job is None or row is None:
+                return None
+            return job, JobEntry(row[0], row[1], row[2], json.loads(row[3]), row[4], row[5], row[6], row[7])
+
+    def release(self, job_id: int, index: int) -> None:
+        """Devolve uma entrada interrompida (pausa) para a fila, mantendo o arquivo parcial."""
+        self.update_entry(job_id, index, ENTRY_PENDING)
+
+    def wait(self, timeout: float) -> None:
+        with self._wakeup:
+            self._wakeup.wait(timeout)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JobInterrupted(DownloadCancelled):
+    """Levantada no hook de progresso quando o job é pausado ou cancelado."""
+
+    msg = "Job interrompido"
+
+
+def _when_done(futures: list[Future], fn: Callable[[], Any]) -> None:
+    """Chama `fn` quando todos os `futures` terminarem (na hora, se não houver nenhum)."""
+    futures = list(futures)
+    if not futures:
+        fn()
+        return
+    lock = threading.Lock()
+    pending = [len(futures)]
+
+    def done(_future: Future) -> None:
+        with lock:
+            pending[0] -= 1
+            last = pending[0] == 0
+        if last:
+            fn()
+
+    for future in futures:
+        future.add_done_callback(done)
+
+
+class QueueRunner:
+    """Executa a JobQueue com um pool fixo de threads, uma entrada por vez por thread.
+
+    `manager_factory(**job.options)` deve retornar um DownloadManager (com open_session e
+    build_ydl_opts). `on_event(event)` recebe o progresso de cada job como ProgressEvent (com
+    `job_id`); `on_update(job_id, status, percent)` é o adaptador de texto, mantido para quem já usa.
+
+    Cada entrada segue a mesma política do PlaylistScheduler (EntryRetry: nova tentativa por causa,
+    formato alternativo) e o merge/embed vai para um PostProcessPipeline compartilhado: a thread
+    já pega a próxima entrada e a atual só fica "done" quando o ffmpeg termina.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        manager_factory: Callable[..., Any],
+        workers: int = 1,
+        on_update: Optional[Callable[[int, str, Optional[float]], None]] = None,
+        on_finished: Optional[Callable[[Job], None]] = None,
+        on_event: Optional[EventCallback] = None,
+    ):
+        self.queue = queue
+        self.manager_factory = manager_factory
+        self.workers = max(1, workers)
+        self.on_update = on_update
+        self.on_finished = on_finished
+        self.on_event = on_event
+        self._emit = event_sink(on_event, self._legacy_update if on_update is not None else None)
+
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._sessions: dict[int, Any] = {}
+        self._primed: dict[int, Any] = {}
+        self._notified: set[tuple[int, float]] = set()
+        self._notify_lock = threading.Lock()
+        self._stats: dict[int, JobStats] = {}
+        self._pipeline: Optional[PostProcessPipeline] = None
+        # Um budget por job: o `deadline` vale para o lote inteiro, não para cada entrada.
+        self._budgets: dict[int, Optional[DeadlineBudget]] = {}
+
+    def stats(self, job_id: int) -> JobStats:
+        """Contadores (merges, legendas) das entradas já baixadas do job (nesta execução do app)."""
+        with self._notify_lock:
+            stats = self._stats.get(job_id)
+            if stats is None:
+                stats = self._stats[job_id] = JobStats()
+            return stats
+
+    def prime_session(self, job_id: int, session: Any) -> None:
+        """Reaproveita uma ExtractionSession já resolvida (ex.: da listagem de resoluções) na expansão do job."""
+        self._primed[job_id] = session
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._loop, name=f"downloadium-queue-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        with self.queue._wakeup:
+            self.queue._wakeup.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads.clear()
+        with self._notify_lock:
+            pipeline, self._pipeline = self._pipeline, None
+        if pipeline is not None:
+            pipeline.close()
+
+    def _postprocess_pipeline(self, manager: Any) -> Optional[PostProcessPipeline]:
+        """Pipeline de pós-processamento da fila (criado na primeira entrada; 0 workers desliga)."""
+        workers = getattr(manager, "postprocess_workers", 0)
+        if not workers:
+            return None
+        with self._notify_lock:
+            if self._pipeline is None:
+                self._pipeline = PostProcessPipeline(workers, collect_errors=False)
+            return self._pipeline
+
+    def _job_budget(self, job: Job, manager: Any) -> Optional[DeadlineBudget]:
+        """Budget do job, criado na primeira entrada desta execução com o prazo que resta desde `started_at`."""
+        make = getattr(manager, "deadline_budget", None)
+        if make is None:
+            return None
+        with self._notify_lock:
+            if job.id not in self._budgets:
+                remaining = job.counts.get(ENTRY_PENDING, 0) + job.counts.get(ENTRY_DOWNLOADING, 0)
+                self._budgets[job.id] = make(max(1, remaining), started_at=job.started_at, parallel=self.workers)
+            return self._budgets[job.id]
+
+    def _sleep(self, job_id: int, seconds: float) -> None:
+        """Espera antes de uma nova tentativa; pausar/cancelar o job (ou parar a fila) interrompe."""
+        ends_at = time.monotonic() + seconds
+        while not (self.queue.is_interrupted(job_id) or self._stop.is_set()):
+            left = ends_at - time.monotonic()
+            if left <= 0:
+                return
+            self._stop.wait(min(left, 1.0))
+        raise JobInterrupted()
+
+    def _legacy_update(self, event: ProgressEvent) -> None:
+        if self.on_update is not None:
+            self.on_update(cast(int, event.job_id), event.status_line(), event.percent)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            claimed = self.queue.claim_next()
+            if claimed is None:
+                self.queue.wait(1.0)
+                continue
+            job, entry = claimed
+            if entry is None:
+                self._expand(job)
+            else:
+                self._download(job, entry)
+
+    def _expand(self, job: Job) -> None:
+        self._emit(ProgressEvent(LISTING, job.id))
+        try:
+            manager = self.manager_factory(**job.options)
+            session = self._primed.pop(job.id, None) or manager.open_session(job.url)
+            info = session.info
+            if session.is_playlist:
+                raw = [e for e in session.entries if e]
+                entries = [flat_entry(e) for e in raw]
+                extra = YoutubeDL._playlist_infodict(info, n_entries=len(entries))
+            else:
+                entries = [flat_entry(info, fallback_url=job.url)]
+                extra = {}
+                # Vídeo único: o download reaproveita a extração enquanto ela estiver fresca.
+                self._sessions[job.id] = session
+        except Exception as e:
+            self.queue.fail_job(job.id, str(e))
+            self._emit(ProgressEvent(ERROR, job.id, percent=0.0, detail=str(e)))
+            self._notify_finished(job.id)
+            return
+        archive = None if getattr(manager, "ignore_archive", False) else getattr(manager, "archive", None)
+        skipped: set[int] = set()
+        if archive is not None and len(archive):
+            skipped = {i + 1 for i, e in enumerate(entries) if archive.contains_entry(e)}
+
+        self.queue.set_entries(job.id, entries, extra, skipped)
+        if skipped:
+            self._emit(ProgressEvent(SKIPPING, job.id, detail=f"{len(skipped)} already downloaded"))
+        self._emit(ProgressEvent(QUEUED, job.id, index=0, count=len(entries) - len(skipped), percent=0.0))
+        self._notify_finished(job.id)
+
+    def _download(self, job: Job, entry: JobEntry) -> None:
+        total = job.total or 1
+        state: dict[str, Optional[str]] = {"partial": entry.partial_path, "filename": entry.filename}
+
+        def progress_hook(d: dict) -> None:
+            if self.queue.is_interrupted(job.id) or self._stop.is_set():
+                raise JobInterrupted()
+
+            tmp = d.get("tmpfilename") or d.get("filename")
+            if tmp and tmp != state["partial"]:
+                state["partial"] = tmp
+                self.queue.update_entry(job.id, entry.index, partial_path=tmp)
+
+            if d.get("status") == "downloading":
+                self._emit(download_event(d, job.id, entry.index, total))
+            elif d.get("status") == "finished":
+                state["filename"] = d.get("filename") or state["filename"]
+                self._emit(ProgressEvent(ENCODING, job.id, entry.index, total, percent=100.0))
+
+        def postprocessor_hook(d: dict) -> None:
+            if d.get("status") == "finished" and d.get("info_dict"):
+                state["filename"] = d["info_dict"].get("filepath") or state["filename"]
+
+        def merge_plan_hook(plan: MergePlan, info: dict) -> None:
+            if plan.transcode:
+                self._emit(ProgressEvent(TRANSCODING, job.id, entry.index, total, detail=plan.reason))
+            elif plan.fallback:
+                self._emit(ProgressEvent(MESSAGE, job.id, entry.index, total, detail=plan.reason))
+
+        def notify(detail: str) -> None:
+            self._emit(ProgressEvent(RETRYING, job.id, entry.index, total, detail=detail))
+
+        host = url_host(entry.data.get("url") or job.url)
+        manager: Any = None
+        rc = None
+        retry = EntryRetry()
+        pp_jobs: list[Future] = []
+
+        def requeue(error: Exception) -> bool:
+            retries = getattr(manager, "rate_limit_retries", 0)
+            return rc is not None and is_rate_limited(error) and rc.strikes(host) < retries
+
+        try:
+            manager = self.manager_factory(**job.options)
+            rc = getattr(manager, "rate_controller", None)
+            embed = ffmpeg_available()
+            opts = manager.build_ydl_opts(
+                [progress_hook], [postprocessor_hook], embed, host=host, budget=self._job_budget(job, manager)
+            )
+            opts["merge_stats"] = opts["subtitle_stats"] = opts["side_asset_stats"] = self.stats(job.id)
+            opts["merge_plan_hook"] = merge_plan_hook
+            opts["postprocess_pipeline"] = self._postprocess_pipeline(manager) if embed else None
+            extra = {**self.queue.playlist_extra(job.id), "playlist_index": entry.index, "playlist_autonumber": entry.index}
+            session = self._sessions.pop(job.id, None)
+
+            while True:
+                if rc is not None:
+                    rc.wait(host, lambda: self.queue.is_interrupted(job.id) or self._stop.is_set())
+                attempt = dict(opts)
+                if retry.format:
+                    attempt["format"] = retry.format
+                try:
+                    ydl = DownloadiumYDL(cast(Any, attempt))
+                    try:
+                        if session is not None and session.is_fresh():
+                            session.process(ydl)
+                        else:
+                            ydl.process_ie_result(dict(entry.data), download=True, extra_info=extra)
+                    finally:
+                        pp_jobs = ydl.take_postprocess_jobs()
+                        # O merge/embed adiado ainda usa este YoutubeDL: ele só fecha depois do pipeline.
+                        _when_done(pp_jobs, ydl.close)
+                    break
+                except JobInterrupted:
+                    raise
+                except Exception as e:
+                    if requeue(e):
+                        raise
+                    # Mesma política das playlists: só desiste quando a causa não tem mais tentativas.
+                    delay = retry.next_delay(e, notify)
+                    if delay is None:
+                        raise
+                    if delay:
+                        self._sleep(job.id, delay)
+        except JobInterrupted:
+            if self.queue.is_cancelled(job.id):
+                # Cancelado não volta para a fila: a entrada termina aqui (resume() não vale para o job).
+                self.queue.update_entry(job.id, entry.index, ENTRY_FAILED, error="cancelled")
+                self._emit(ProgressEvent(CANCELLED, job.id, entry.index, total))
+                return
+            self.queue.release(job.id, entry.index)
+            self._emit(ProgressEvent(PAUSED, job.id, entry.index, total))
+            return
+        except Exception as e:
+            if requeue(e):
+                # Volta para a fila; a próxima tentativa espera o backoff do host em rc.wait().
+                cooldown = rc.record_rate_limit(host)
+                self.queue.release(job.id, entry.index)
+                self._emit(ProgressEvent(RATE_LIMITED, job.id, entry.index, total, detail=f"retrying in {cooldown:.0f}s"))
+                return
+            self._fail_entry(job.id, entry.index, total, e)
+            return
+
+        if rc is not None:
+            rc.record_success(host)
+        # O merge/embed segue no pipeline; a entrada fecha quando o último job dela terminar.
+        _when_done(pp_jobs, lambda: self._finish_entry(job.id, entry.index, total, state["filename"], pp_jobs))
+
+    def _finish_entry(self, job_id: int, index: int, total: int, filename: Optional[str], pp_jobs: list[Future]) -> None:
+        """Marca a entrada como baixada, ou como falha se o pós-processamento dela deu erro."""
+        for future in pp_jobs:
+            error = None if future.cancelled() else future.exception()
+            if error is not None:
+                self._fail_entry(job_id, index, total, error)
+                return
+        self.queue.update_entry(job_id, index, ENTRY_DONE, filename=filename)
+        self._emit(ProgressEvent(DONE, job_id, index, total, percent=100.0))
+        self._notify_finished(job_id)
+
+    def _fail_entry(self, job_id: int, index: int, total: int, error: BaseException) -> None:
+        self.queue.update_entry(job_id, index, ENTRY_FAILED, error=str(error))
+        self._emit(ProgressEvent(ERROR, job_id, index, total, percent=0.0, detail=str(error)))
+        self._notify_finished(job_id)
+
+    def _notify_finished(self, job_id: int) -> None:
+        job = self.queue.get(job_id)
+        if job is None or job.state not in (JOB_DONE, JOB_FAILED):
+            return
+        with self._notify_lock:
+            self._budgets.pop(job_id, None)
+            if self.on_finished is None:
+                return
+            key = (job.id, job.updated_at)
+            if key in self._notified:
+                return
+            self._notified.add(key)
+        try:
+            self.on_finished(job)
+        except Exception:
+            pass
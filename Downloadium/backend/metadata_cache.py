@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from Downloadium.backend.utils import get_app_data_dir
+
+
+# TTL padrão (segundos) por tipo de dado guardado no cache.
+DEFAULT_TTLS: dict[str, float] = {
+    # Canais/playlists ganham vídeos novos com frequência.
+    "count": 30 * 60,
+    # Tabela de formatos (sem URLs de mídia, que expiram em poucas horas).
+    "formats": 6 * 60 * 60,
+    # URLs de thumbnail praticamente não mudam.
+    "thumbnail": 7 * 24 * 60 * 60,
+}
+
+# Campos da tabela de formatos que valem a pena persistir.
+FORMAT_FIELDS: tuple[str, ...] = (
+    "format_id",
+    "format_note",
+    "ext",
+    "container",
+    "protocol",
+    "vcodec",
+    "acodec",
+    "width",
+    "height",
+    "fps",
+    "tbr",
+    "vbr",
+    "abr",
+    "asr",
+    "filesize",
+    "filesize_approx",
+    "dynamic_range",
+    "language",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS metadata_accessed ON metadata (accessed_at);
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def _extractor_classes() -> tuple[Any, ...]:
+    from yt_dlp.extractor import gen_extractor_classes
+
+    return tuple(gen_extractor_classes())
+
+
+@functools.lru_cache(maxsize=2048)
+def canonical_key(url: str, single_video: bool = False) -> str:
+    """Chave estável para uma URL: "<extractor>:<id>" quando o yt-dlp reconhece o ID sem rede.
+
+    Com single_video=True (noplaylist), URLs do tipo watch?v=X&list=Y são resolvidas para o vídeo X.
+    """
+    url = (url or "").strip()
+    parsed = urlparse(url)
+
+    for ie in _extractor_classes():
+        if ie.ie_key() == "Generic" or not ie.suitable(url):
+            continue
+        temp_id = ie.get_temp_id(url)
+        if not temp_id:
+            break
+        ie_key = ie.ie_key().lower()
+        if single_video and ie_key.startswith("youtube"):
+            video_id = (parse_qs(parsed.query).get("v") or [None])[0]
+            if video_id:
+                return f"youtube:{video_id}"
+        return f"{ie_key}:{temp_id}"
+
+    netloc = parsed.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    normalized = parsed._replace(scheme=parsed.scheme.lower(), netloc=netloc, fragment="").geturl()
+    return f"url:{normalized}"
+
+
+def slim_formats(formats: Optional[Iterable[dict]]) -> list[dict[str, Any]]:
+    """Reduz a lista de formatos do yt-dlp aos campos úteis (sem URLs/headers)."""
+    out: list[dict[str, Any]] = []
+    for fmt in formats or []:
+        out.append({k: fmt[k] for k in FORMAT_FIELDS if fmt.get(k) is not None})
+    return out
+
+
+class MetadataCache:
+    """Cache SQLite de metadados com TTL por tipo, despejo LRU por tamanho e contadores de acerto."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttls: Optional[dict[str, float]] = None,
+        max_entries: int = 20_000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.path = path or os.path.join(get_app_data_dir("cache"), "metadata.sqlite3")
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, kind: str, url: str, single_video: bool = False) -> Any:
+        """Retorna o valor em cache (ou None se ausente/expirado)."""
+        key = canonical_key(url, single_video)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM metadata WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM metadata WHERE kind = ? AND key = ?", (kind, key))
+                self._misses[kind] = self._misses.get(kind, 0) + 1
+                return None
+
+            self._conn.execute(
+                "UPDATE metadata SET accessed_at = ? WHERE kind = ? AND key = ?",
+                (now, kind, key),
+            )
+            self._hits[kind] = self._hits.get(kind, 0) + 1
+        return json.loads(row[0])
+
+    def set(self, kind: str, url: str, value: Any, ttl: Optional[float] = None, single_video: bool = False) -> None:
+        key = canonical_key(url, single_video)
+        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+        ttl = self.ttls.get(kind, 60 * 60) if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (kind, key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, key, payload, len(payload), now + ttl, now),
+            )
+            self._evict_locked(now)
+
+    def invalidate(self, url: str, kind: Optional[str] = None) -> None:
+        keys = {canonical_key(url, False), canonical_key(url, True)}
+        with self._lock:
+            for key in keys:
+                if kind is None:
+                    self._conn.execute("DELETE FROM metadata WHERE key = ?", (key,))
+                else:
+                    self._conn.execute("DELETE FROM metadata WHERE kind = ? AND key = ?", (kind, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM metadata")
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM metadata").fetchone()
+            hits = dict(self._hits)
+            misses = dict(self._misses)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": sum(hits.values()),
+            "misses": sum(misses.values()),
+            "by_kind": {k: {"hits": hits.get(k, 0), "misses": misses.get(k, 0)} for k in sorted(set(hits) | set(misses))},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict_locked(self, now: float) -> None:
+        self._conn.execute("DELETE FROM metadata WHERE expires_at <= ?", (now,))
+        entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM metadata").fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+
+        # Remove os menos usados recentemente até voltar ao orçamento.
+        excess_entries = max(0, entries - self.max_entries)
+        excess_bytes = max(0, size - self.max_bytes)
+        removed = freed = 0
+        victims: list[tuple[str, str]] = []
+        for kind, key, row_size in self._conn.execute(
+            "SELECT kind, key, size FROM metadata ORDER BY accessed_at ASC"
+        ):
+            if removed >= excess_entries and freed >= excess_bytes:
+                break
+            victims.append((kind, key))
+            removed += 1
+            freed += row_size
+        self._conn.executemany("DELETE FROM metadata WHERE kind = ? AND key = ?", victims)
+
+
+_default_cache: Optional[MetadataCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> MetadataCache:
+    """Instância compartilhada do cache (cai para memória se o disco não estiver disponível)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = MetadataCache()
+            except (OSError, sqlite3.Error):
+                _default_cache = MetadataCache(path=":memory:")
+        return _default_cache
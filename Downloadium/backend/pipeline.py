@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+
+class PostProcessPipeline:
+    """Estágio de pós-processamento (merge/embed/mover arquivos) separado do download.
+
+    As threads de rede entregam cada vídeo baixado aqui e seguem para o próximo; o ffmpeg roda
+    em `workers` threads próprias (é um subprocesso, então o GIL não atrapalha). A fila entre os
+    estágios é limitada: com `workers + max_pending` itens em aberto, `submit` bloqueia quem
+    baixa até o ffmpeg alcançar, o que limita o disco ocupado por arquivos ainda não processados.
+
+    Com `collect_errors=False` (pipeline de vida longa, ex.: o da fila) os erros ficam só nos
+    Futures e `join()` devolve sempre uma lista vazia.
+    """
+
+    def __init__(self, workers: int = 1, max_pending: int = 2, collect_errors: bool = True):
+        self.workers = max(1, workers)
+        self.max_pending = max(0, max_pending)
+        self.collect_errors = collect_errors
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="downloadium-postprocess")
+        self._lock = threading.Lock()
+        self._futures: list[Future] = []
+        self._errors: list[BaseException] = []
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._futures.append(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future) -> None:
+        self._slots.release()
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            if future in self._futures:
+                self._futures.remove(future)
+            if error is not None and self.collect_errors:
+                self._errors.append(error)
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for f in self._futures if not f.done())
+
+    def join(self) -> list[BaseException]:
+        """Espera tudo o que foi enviado e devolve os erros ainda não entregues (não relança).
+
+        Quem precisa do erro de cada vídeo guarda o Future devolvido por `submit`; a lista aqui
+        serve para quem não acompanha os vídeos um a um.
+        """
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from yt_dlp.networking.exceptions import HTTPError
+
+from Downloadium.backend.utils import get_app_data_dir
+
+
+# Só o status HTTP 429: um "429" solto pode ser parte de um id, título ou tamanho.
+_RATE_LIMIT_RE = re.compile(r"HTTP Error 429\b|too many requests|rate[- ]?limit", re.IGNORECASE)
+
+
+def error_chain(error: BaseException) -> Iterator[BaseException]:
+    """A exceção e as causas que o yt-dlp embrulha (exc_info, cause, __cause__)."""
+    seen: set[int] = set()
+    pending: list[Any] = [error]
+    while pending:
+        current = pending.pop()
+        if not isinstance(current, BaseException) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        exc_info = getattr(current, "exc_info", None)
+        if isinstance(exc_info, tuple) and len(exc_info) > 1:
+            pending.append(exc_info[1])
+        pending.extend([getattr(current, "cause", None), current.__cause__, current.__context__])
+
+
+def is_rate_limited(error: Any) -> bool:
+    """True se a mensagem/exceção indica que o site limitou a taxa de requisições."""
+    if isinstance(error, BaseException) and any(
+        isinstance(e, HTTPError) and e.status == 429 for e in error_chain(error)
+    ):
+        return True
+    text = str(error or "")
+    return bool(_RATE_LIMIT_RE.search(text)) or "this content isn't available" in text.lower()
+
+
+@dataclass
+class HostPacing:
+    delay: float
+    successes: int = 0
+    strikes: int = 0
+    blocked_until: float = 0.0
+    updated_at: float = 0.0
+
+
+class RateController:
+    """Controle de ritmo AIMD por host, no lugar dos intervalos fixos de sleep.
+
+    Cada sucesso reduz o atraso em `decrease` segundos (aumento aditivo da taxa); cada 429/aviso
+    de rate-limit multiplica o atraso por `factor` e bloqueia o host por um backoff exponencial
+    com jitter. O atraso aprendido por host é salvo em JSON e reaproveitado nas próximas execuções.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.0,
+        max_delay: float = 120.0,
+        decrease: float = 0.25,
+        factor: float = 2.0,
+        max_backoff: float = 15 * 60,
+        spread: float = 2.5,
+        request_ratio: float = 0.5,
+        save_interval: float = 10.0,
+    ):
+        self.path = path
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decrease = decrease
+        self.factor = factor
+        self.max_backoff = max_backoff
+        # max_sleep_interval = delay * spread; sleep_interval_requests = delay * request_ratio
+        self.spread = spread
+        self.request_ratio = request_ratio
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        self._hosts: dict[str, HostPacing] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._load()
+
+    # -----------------
+    # Persistência
+    # -----------------
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            for host, values in (data or {}).items():
+                pacing = HostPacing(**{k: v for k, v in values.items() if k in HostPacing.__dataclass_fields__})
+                pacing.delay = min(self.max_delay, max(self.min_delay, float(pacing.delay)))
+                self._hosts[host] = pacing
+        except (OSError, ValueError, TypeError):
+            self._hosts = {}
+
+    def save(self, force: bool = False) -> None:
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            if not force and time.time() - self._saved_at < self.save_interval:
+                return
+            data = {host: asdict(p) for host, p in self._hosts.items()}
+            self._dirty = False
+            self._saved_at = time.time()
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    # -----------------
+    # Estado por host
+    # -----------------
+
+    def _pacing_locked(self, host: str, default: Optional[float] = None) -> HostPacing:
+        pacing = self._hosts.get(host)
+        if pacing is None:
+            delay = self.initial_delay if default is None else default
+            pacing = self._hosts[host] = HostPacing(delay=min(self.max_delay, max(self.min_delay, delay)))
+        return pacing
+
+    def delay(self, host: str) -> float:
+        with self._lock:
+            return self._pacing_locked(host).delay
+
+    def apply(self, params: dict[str, Any], host: str) -> dict[str, Any]:
+        """Atualiza os sleeps do yt-dlp em `params` com o ritmo aprendido para o host.
+
+        O YoutubeDL guarda o próprio dict de opções, então chamar isto entre entradas vale para
+        a próxima requisição sem recriar a instância. Hosts sem histórico partem do sleep_interval
+        já configurado.
+        """
+        with self._lock:
+            pacing = self._pacing_locked(host, default=params.get("sleep_interval"))
+            delay = pacing.delay
+        params["sleep_interval"] = delay
+        params["max_sleep_interval"] = delay * self.spread
+        params["sleep_interval_requests"] = delay * self.request_ratio
+        return params
+
+    def record_success(self, host: str) -> float:
+        with self._lock:
+            pacing = self._pacing_locked(host)
+            pacing.successes += 1
+            pacing.strikes = 0
+            pacing.delay = max(self.min_delay, pacing.delay - self.decrease)
+            pacing.updated_at = time.time()
+            self._dirty = True
+            delay = pacing.delay
+        self.save()
+        return delay
+
+    def record_rate_limit(self, host: str, retry_after: Optional[float] = None) -> float:
+        """Registra um 429 e retorna quantos segundos esperar antes de tentar o host de novo."""
+        now = time.time()
+        with self._lock:
+            pacing = self._pacing_locked(host)
+            pacing.strikes += 1
+            pacing.successes = 0
+            pacing.delay = min(self.max_delay, max(pacing.delay * self.factor, self.decrease * 4, 1.0))
+            if retry_after and retry_after > 0:
+                cooldown = min(self.max_backoff, retry_after)
+            else:
+                ceiling = min(self.max_backoff, pacing.delay * (2 ** min(pacing.strikes, 10)))
+                cooldown = random.uniform(ceiling / 2, ceiling)
+            pacing.blocked_until = max(pacing.blocked_until, now + cooldown)
+            pacing.updated_at = now
+            self._dirty = True
+        self.save(force=True)
+        return cooldown
+
+    def strikes(self, host: str) -> int:
+        """Quantos rate-limits seguidos o host deu desde o último sucesso."""
+        with self._lock:
+            pacing = self._hosts.get(host)
+            return pacing.strikes if pacing else 0
+
+    def progress_hook(self, host: str, params: dict[str, Any]) -> Callable[[dict], None]:
+        """Hook de progresso que conta cada vídeo concluído como sucesso e reajusta `params`.
+
+        Serve para playlists baixadas sequencialmente pelo próprio yt-dlp (um YoutubeDL só).
+        """
+        last = {"id": None}
+
+        def hook(d: dict) -> None:
+            if d.get("status") != "finished":
+                return
+            video_id = (d.get("info_dict") or {}).get("id")
+            if video_id == last["id"]:
+                return  # vídeo e áudio do mesmo item
+            last["id"] = video_id
+            self.record_success(host)
+            self.apply(params, host)
+
+        return hook
+
+    def wait(self, host: str, cancelled: Optional[Callable[[], bool]] = None) -> float:
+        """Bloqueia enquanto o host estiver em backoff. Retorna quanto tempo esperou."""
+        started = time.time()
+        while True:
+            with self._lock:
+                pacing = self._hosts.get(host)
+                remaining = (pacing.blocked_until - time.time()) if pacing else 0.0
+            if remaining <= 0 or (cancelled is not None and cancelled()):
+                return time.time() - started
+            time.sleep(min(remaining, 0.5))
+
+    def retry_sleep(self, host: str, base: float = 1.0) -> Callable[[int], float]:
+        """Função para `retry_sleep_functions` do yt-dlp: backoff exponencial com jitter."""
+
+        def sleep_for(n: int) -> float:
+            ceiling = min(self.max_backoff, max(base, self.delay(host)) * (2 ** min(n, 10)))
+            return random.uniform(ceiling / 2, ceiling)
+
+        return sleep_for
+
+    def snapshot(self) -> dict[str, HostPacing]:
+        with self._lock:
+            return {host: HostPacing(**asdict(p)) for host, p in self._hosts.items()}
+
+
+_default_controller: Optional[RateController] = None
+_default_lock = threading.Lock()
+
+
+def get_default_controller() -> RateController:
+    """Instância compartilhada, persistida em <app data>/rate_limits.json."""
+    global _default_controller
+    with _default_lock:
+        if _default_controller is None:
+            try:
+                path: Optional[str] = os.path.join(get_app_data_dir(), "rate_limits.json")
+            except OSError:
+                path = None
+            _default_controller = RateController(path=path)
+        return _default_controller
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from Downloadium.backend.formats import codec_family, container_accepts
+
+
+REMUX = "remux"
+# Codecs não cabem no contêiner pedido: o merge (ainda por cópia) vai para FALLBACK_CONTAINER.
+FALLBACK = "fallback"
+TRANSCODE = "transcode"
+
+# Contêiner que aceita qualquer par de codecs com cópia de streams.
+FALLBACK_CONTAINER = "mkv"
+
+
+@dataclass(frozen=True)
+class MergePlan:
+    container: str
+    action: str
+    vcodec: str = "none"
+    acodec: str = "none"
+
+    @property
+    def transcode(self) -> bool:
+        return self.action == TRANSCODE
+
+    @property
+    def fallback(self) -> bool:
+        return self.action == FALLBACK
+
+    @property
+    def merge_ext(self) -> str:
+        """Extensão do arquivo final: o merge é sempre por cópia de streams, nunca recodifica o vídeo."""
+        return FALLBACK_CONTAINER if self.fallback else self.container
+
+    @property
+    def reason(self) -> str:
+        codecs = "/".join(c for c in (self.vcodec, self.acodec) if c != "none") or "?"
+        if self.fallback:
+            return f"{codecs} cannot be stream-copied into {self.container}, merged into {FALLBACK_CONTAINER}"
+        if self.transcode:
+            return f"{codecs} cannot be stream-copied into any container"
+        return f"{codecs} remuxed into {self.container}"
+
+
+def plan_merge(formats: Iterable[dict[str, Any]], container: str) -> MergePlan:
+    """Decide como juntar os formatos escolhidos só com cópia de streams.
+
+    Se os codecs não cabem em `container`, o merge vai para FALLBACK_CONTAINER; TRANSCODE só
+    sobra quando nem ele aceita os codecs (aí o yt-dlp decide, e o plano só informa).
+    """
+    vcodec = acodec = "none"
+    for fmt in formats:
+        if vcodec == "none":
+            vcodec = codec_family(fmt.get("vcodec"))
+        if acodec == "none":
+            acodec = codec_family(fmt.get("acodec"))
+    if container_accepts(container, vcodec, acodec):
+        action = REMUX
+    elif container_accepts(FALLBACK_CONTAINER, vcodec, acodec):
+        action = FALLBACK
+    else:
+        action = TRANSCODE
+    return MergePlan(container=container, action=action, vcodec=vcodec, acodec=acodec)
+
+
+class JobStats:
+    """Contadores de um download/job (thread-safe): merges (remux x recodificação, e quantos remux
+    foram para o contêiner alternativo), legendas e arquivos auxiliares baixados em paralelo."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.remuxed = 0
+        self.transcoded = 0
+        self.container_fallbacks = 0
+        self.last_plan: Optional[MergePlan] = None
+        self.subtitle_tracks = 0
+        self.subtitle_requests = 0
+        self.subtitle_bytes = 0
+        self.side_assets = 0
+        self.side_assets_failed = 0
+        self.side_asset_seconds = 0.0
+
+    def record(self, plan: MergePlan) -> None:
+        with self._lock:
+            if plan.transcode:
+                self.transcoded += 1
+            else:
+                self.remuxed += 1
+            if plan.fallback:
+                self.container_fallbacks += 1
+            self.last_plan = plan
+
+    def record_subtitle_plan(self, tracks: int) -> None:
+        with self._lock:
+            self.subtitle_tracks += tracks
+
+    def record_subtitle_download(self, nbytes: int) -> None:
+        with self._lock:
+            self.subtitle_requests += 1
+            self.subtitle_bytes += nbytes
+
+    def record_side_asset(self, result: Any) -> None:
+        with self._lock:
+            self.side_assets += 1
+            if not result.ok:
+                self.side_assets_failed += 1
+            self.side_asset_seconds += result.elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "remuxed": self.remuxed,
+                "transcoded": self.transcoded,
+                "container_fallbacks": self.container_fallbacks,
+                "subtitle_tracks": self.subtitle_tracks,
+                "subtitle_requests": self.subtitle_requests,
+                "subtitle_bytes": self.subtitle_bytes,
+                "side_assets": self.side_assets,
+                "side_assets_failed": self.side_assets_failed,
+                "side_asset_seconds": round(self.side_asset_seconds, 3),
+            }
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"JobStats({fields})"
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import copy
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional, cast
+
+from yt_dlp.utils import DownloadCancelled
+
+from Downloadium.backend.archive import DownloadArchive
+from Downloadium.backend.errors import RETRY_POLICIES, classify_error
+from Downloadium.backend.events import (
+    DOWNLOADING,
+    EMBEDDING,
+    ENCODING,
+    RATE_LIMITED,
+    RETRYING,
+    SKIPPING,
+    EventCallback,
+    ProgressEvent,
+)
+from Downloadium.backend.rate_limit import RateController, is_rate_limited
+from Downloadium.backend.session import ExtractionSession
+from Downloadium.backend.utils import url_host
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+def entry_host(entry: dict) -> str:
+    """Host usado para o limite de conexões simultâneas de uma entrada."""
+    host = url_host(entry.get("webpage_url") or entry.get("url"))
+    return host or str(entry.get("ie_key") or entry.get("extractor_key") or "unknown").lower()
+
+
+@dataclass
+class EntryResult:
+    index: int
+    entry_id: Optional[str]
+    ok: bool
+    error: Optional[str] = None
+    cause: Optional[str] = None
+    attempts: int = 1
+
+
+FALLBACK_FORMAT = "bestvideo+bestaudio/best"
+
+
+class EntryRetry:
+    """Política de nova tentativa de UMA entrada (RETRY_POLICIES), usada pelo PlaylistScheduler e pela fila.
+
+    `format` é o seletor da próxima tentativa (None = o do job); erro de formato troca para
+    `fallback_format` uma única vez.
+    """
+
+    def __init__(self, fallback_format: str = FALLBACK_FORMAT):
+        self.fallback_format = fallback_format
+        self.format: Optional[str] = None
+        self.cause: Optional[str] = None
+        self._retries: dict[str, int] = {}
+
+    def next_delay(self, error: BaseException, notify: Callable[[str], None]) -> Optional[float]:
+        """Classifica `error` e devolve a espera (s) antes da nova tentativa, ou None se a entrada desiste."""
+        cause = self.cause = classify_error(error)
+        policy = RETRY_POLICIES[cause]
+        self._retries[cause] = self._retries.get(cause, 0) + 1
+        if self._retries[cause] > policy.retries or (policy.fallback_format and self.format == self.fallback_format):
+            return None
+
+        if policy.fallback_format:
+            self.format = self.fallback_format
+            notify(f"requested format unavailable, retrying with {self.format}")
+        delay = policy.delay(self._retries[cause])
+        if delay:
+            notify(f"{cause} error, retrying in {delay:.0f}s")
+        return delay
+
+
+class ProgressAggregator:
+    """Soma o progresso das entradas que estão baixando em paralelo em um único percentual."""
+
+    def __init__(self, total: int, emit: EventCallback):
+        self.total = max(total, 1)
+        self._emit = emit
+        self._lock = threading.Lock()
+        self._fractions: dict[int, float] = {}
+        self._done = 0
+
+    def _percent_locked(self) -> float:
+        return max(0.0, min(100.0, (self._done + sum(self._fractions.values())) / self.total * 100))
+
+    def _current_locked(self) -> int:
+        return min(self._done + 1, self.total)
+
+    def update(
+        self,
+        index: int,
+        downloaded: float,
+        total_bytes: Optional[float],
+        speed: Optional[float] = None,
+        eta: Optional[float] = None,
+    ) -> None:
+        with self._lock:
+            if total_bytes:
+                self._fractions[index] = max(0.0, min(1.0, downloaded / total_bytes))
+            else:
+                self._fractions.setdefault(index, 0.0)
+            percent = self._percent_locked()
+            current = self._current_locked()
+        self._emit(ProgressEvent(
+            DOWNLOADING, index=current, count=self.total, downloaded_bytes=int(downloaded),
+            total_bytes=int(total_bytes) if total_bytes else None, speed=speed, eta=eta, percent=percent,
+        ))
+
+    def status(self, phase: str) -> None:
+        with self._lock:
+            current = self._current_locked()
+        self._emit(ProgressEvent(phase, index=current, count=self.total))
+
+    def finish(self, index: int) -> None:
+        with self._lock:
+            self._fractions.pop(index, None)
+            self._done += 1
+            percent = self._percent_locked()
+            current = min(self._done, self.total)
+        self._emit(ProgressEvent(DOWNLOADING, index=current, count=self.total, percent=percent))
+
+
+class PlaylistScheduler:
+    """Baixa as entradas de uma playlist/canal com N workers, cada um com seu próprio YoutubeDL.
+
+    As entradas vêm da lista plana da ExtractionSession; cada uma é processada com os mesmos
+    campos de playlist que o yt-dlp adicionaria (mantendo o layout %(channel)s/%(playlist)s).
+
+    Uma entrada que falha não interrompe as outras: o erro é classificado (errors.classify_error)
+    e só ela é tentada de novo, conforme RETRY_POLICIES; erro de formato tenta `fallback_format`.
+    """
+
+    def __init__(
+        self,
+        ydl_opts: dict[str, Any],
+        emit: EventCallback,
+        workers: int = 3,
+        max_per_host: int = 2,
+        archive: Optional[DownloadArchive] = None,
+        rate_controller: Optional[RateController] = None,
+        rate_limit_retries: int = 3,
+        cancel_event: Optional[threading.Event] = None,
+        fallback_format: str = FALLBACK_FORMAT,
+    ):
+        self.ydl_opts = ydl_opts
+        self.emit = emit
+        self.workers = max(1, workers)
+        self.max_per_host = max(1, max_per_host)
+        self.archive = archive
+        self.rate_controller = rate_controller
+        self.rate_limit_retries = max(0, rate_limit_retries)
+        self.fallback_format = fallback_format
+
+        # Um Event externo (ex.: cancelamento de uma task asyncio) também interrompe a fila.
+        self._cancel = cancel_event if cancel_event is not None else threading.Event()
+        self._local = threading.local()
+        self._ydls: list[DownloadiumYDL] = []
+        self._lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._aggregator: Optional[ProgressAggregator] = None
+        # Merge/embed adiados (PostProcessPipeline) de cada entrada baixada, por playlist_index.
+        self._pp_jobs: dict[int, list[Future]] = {}
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+
+    def _worker_ydl(self, fmt: Optional[str] = None) -> tuple[DownloadiumYDL, dict[str, Optional[int]]]:
+        """YoutubeDL da thread atual (um por formato: o seletor é montado na criação).
+
+        Devolve também a entrada corrente desse YoutubeDL: o hook de progresso a recebe via
+        `partial`, porque o HLS/DASH chama os hooks das threads de fragmento, não desta.
+        """
+        ydls = getattr(self._local, "ydls", None)
+        if ydls is None:
+            ydls = self._local.ydls = {}
+        worker = ydls.get(fmt)
+        if worker is not None:
+            return worker
+
+        current: dict[str, Optional[int]] = {"index": None}
+        opts = dict(self.ydl_opts)
+        opts["progress_hooks"] = [functools.partial(self._progress_hook, current)]
+        opts["postprocessor_hooks"] = [self._postprocessor_hook]
+        if fmt:
+            opts["format"] = fmt
+        ydl = DownloadiumYDL(cast(Any, opts))
+        worker = ydls[fmt] = (ydl, current)
+        with self._lock:
+            self._ydls.append(ydl)
+        return worker
+
+    def _progress_hook(self, current: dict[str, Optional[int]], d: dict) -> None:
+        if self.cancelled:
+            raise DownloadCancelled()
+        aggregator = self._aggregator
+        index = current["index"]
+        if aggregator is None or index is None:
+            return
+        if d.get("status") == "downloading":
+            aggregator.update(
+                index,
+                d.get("downloaded_bytes") or 0,
+                d.get("total_bytes") or d.get("total_bytes_estimate"),
+                d.get("speed"),
+                d.get("eta"),
+            )
+
+    def _postprocessor_hook(self, d: dict) -> None:
+        aggregator = self._aggregator
+        if aggregator is None or d.get("status") != "started":
+            return
+        pp = str(d.get("postprocessor") or "")
+        aggregator.status(EMBEDDING if "EmbedSubtitle" in pp else ENCODING)
+
+    def _run_entry(self, playlist_extra: dict[str, Any], index: int, entry: dict) -> EntryResult:
+        entry_id = entry.get("id")
+        host = entry_host(entry)
+        extra = {**playlist_extra, "playlist_index": index, "playlist_autonumber": index}
+        retry = EntryRetry(self.fallback_format)
+        attempts = 0
+
+        def notify(detail: str) -> None:
+            self.emit(ProgressEvent(RETRYING, index=index, detail=detail))
+
+        while True:
+            if self.cancelled:
+                return EntryResult(index, entry_id, False, "cancelled", attempts=attempts)
+            attempts += 1
+            error: Optional[Exception] = None
+            with self._slot(host):
+                if self.cancelled:
+                    return EntryResult(index, entry_id, False, "cancelled", attempts=attempts)
+                ydl, current = self._worker_ydl(retry.format)
+                current["index"] = index
+                try:
+                    self._process_paced(ydl, host, entry, extra)
+                except DownloadCancelled:
+                    self.cancel()
+                    return EntryResult(index, entry_id, False, "cancelled", attempts=attempts)
+                except Exception as e:
+                    error = e
+                finally:
+                    current["index"] = None
+                    pp_jobs = ydl.take_postprocess_jobs()
+
+            if error is None:
+                if pp_jobs:
+                    with self._lock:
+                        self._pp_jobs[index] = pp_jobs
+                break
+
+            # Só esta entrada é tentada de novo; as outras seguem na fila.
+            delay = retry.next_delay(error, notify)
+            if delay is None:
+                # Entrada desistida conta como processada no percentual geral.
+                if self._aggregator is not None:
+                    self._aggregator.finish(index)
+                return EntryResult(index, entry_id, False, str(error), cause=retry.cause, attempts=attempts)
+            if delay:
+                self._cancel.wait(delay)
+
+        if self._aggregator is not None:
+            self._aggregator.finish(index)
+        return EntryResult(index, entry_id, True, attempts=attempts)
+
+    def _process_paced(self, ydl: DownloadiumYDL, host: str, entry: dict, extra: dict[str, Any]) -> None:
+        """Processa a entrada no ritmo aprendido para o host, com backoff e nova tentativa em 429."""
+        rc = self.rate_controller
+        for attempt in range(self.rate_limit_retries + 1):
+            if rc is not None:
+                rc.wait(host, lambda: self.cancelled)
+                rc.apply(ydl.params, host)
+            try:
+                ydl.process_ie_result(copy.deepcopy(entry), download=True, extra_info=extra)
+            except Exception as e:
+                if rc is None or self.cancelled or not is_rate_limited(e) or attempt >= self.rate_limit_retries:
+                    raise
+                cooldown = rc.record_rate_limit(host)
+                self.emit(ProgressEvent(RATE_LIMITED, detail=f"retrying in {cooldown:.0f}s"))
+                continue
+            if rc is not None:
+                rc.record_success(host)
+            return
+
+    def run(self, session: ExtractionSession) -> list[EntryResult]:
+        """Processa todas as entradas da sessão. Falhas ficam nos resultados (ok=False, cause)."""
+        info = session.info
+        entries = [e for e in session.entries if e]
+        playlist_extra = DownloadiumYDL._playlist_infodict(info, n_entries=len(entries))
+
+        # Entradas já baixadas saem antes de qualquer extração (playlist_index original é mantido).
+        pending = [(i + 1, e) for i, e in enumerate(entries)]
+        if self.archive is not None and len(self.archive):
+            pending = [(i, e) for i, e in pending if not self.archive.contains_entry(e)]
+            skipped = len(entries) - len(pending)
+            if skipped:
+                self.emit(ProgressEvent(SKIPPING, detail=f"{skipped} already downloaded"))
+
+        self._aggregator = ProgressAggregator(len(pending), self.emit)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="downloadium-entry") as pool:
+                futures = [pool.submit(self._run_entry, playlist_extra, i, e) for i, e in pending]
+                results = [self._postprocess_result(future.result()) for future in futures]
+        finally:
+            for ydl in self._ydls:
+                try:
+                    ydl.close()
+                except Exception:
+                    pass
+            self._ydls.clear()
+
+        return results
+
+    def _postprocess_result(self, result: EntryResult) -> EntryResult:
+        """Espera o pós-processamento da entrada; um erro do ffmpeg vira falha só dela."""
+        with self._lock:
+            jobs = self._pp_jobs.pop(result.index, [])
+        wait(jobs)
+        for job in jobs:
+            error = None if job.cancelled() else job.exception()
+            if error is not None:
+                return replace(result, ok=False, error=str(error), cause=classify_error(error))
+        return result
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Optional
+
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.downloader.common import FileDownloader
+from yt_dlp.downloader.http import HttpFD
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError, TransportError
+from yt_dlp.utils import ContentTooShortError, RetryManager
+from yt_dlp.utils.networking import HTTPHeaderDict
+
+
+# Opções extras (no mesmo dict de params do yt-dlp) lidas por este downloader.
+DEFAULT_CONNECTIONS = 4
+DEFAULT_MIN_SIZE = 4 * 1024 * 1024
+DEFAULT_SEGMENT_SIZE = 8 * 1024 * 1024
+
+_BLOCK_SIZE = 256 * 1024
+_STATE_SAVE_INTERVAL = 1.0
+_PROGRESS_INTERVAL = 0.2
+
+
+def _parse_content_range(value: Optional[str]) -> Optional[int]:
+    """Tamanho total em "bytes 0-0/12345" (None se desconhecido)."""
+    if not value or "/" not in value:
+        return None
+    total = value.rsplit("/", 1)[1].strip()
+    return int(total) if total.isdigit() else None
+
+
+class _Segment:
+    __slots__ = ("start", "end", "done")
+
+    def __init__(self, start: int, end: int, done: int = 0):
+        self.start = start
+        self.end = end  # inclusivo
+        self.done = done
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.size
+
+
+class SegmentedHttpFD(FileDownloader):
+    """Baixa formatos progressivos (http/https) em faixas de bytes com várias conexões.
+
+    O arquivo .part é pré-alocado com o tamanho final e cada faixa é escrita na sua posição.
+    O avanço de cada faixa fica em "<arquivo>.part.segments", então uma falha (ou pausa) retoma
+    só o que faltava de cada faixa. Servidores sem suporte a Range caem no HttpFD normal.
+    """
+
+    FD_NAME = "segmented"
+
+    @classmethod
+    def suitable(cls, info_dict: dict[str, Any], params: dict[str, Any]) -> bool:
+        if int(params.get("segmented_connections") or 0) < 2:
+            return False
+        if info_dict.get("is_live") or info_dict.get("request_data") or params.get("test"):
+            return False
+        if params.get("external_downloader") or params.get("ratelimit"):
+            return False
+        try:
+            return get_suitable_downloader(dict(info_dict), params) is HttpFD
+        except Exception:
+            return False
+
+    def _fallback(self, filename: str, info_dict: dict[str, Any]) -> Any:
+        fd = HttpFD(self.ydl, self.params)
+        for ph in self._progress_hooks:
+            fd.add_progress_hook(ph)
+        return fd.real_download(filename, info_dict)
+
+    def _request(self, info_dict: dict[str, Any], start: int, end: int) -> Any:
+        headers = HTTPHeaderDict({"Accept-Encoding": "identity"}, info_dict.get("http_headers"))
+        headers["Range"] = f"bytes={start}-{end}"
+        return self.ydl.urlopen(Request(info_dict["url"], headers=headers))
+
+    def _probe_size(self, info_dict: dict[str, Any]) -> Optional[int]:
+        """Confirma suporte a Range e descobre o tamanho com um pedido de 1 byte."""
+        try:
+            response = self._request(info_dict, 0, 0)
+        except (HTTPError, TransportError):
+            return None
+        try:
+            if response.status != 206:
+                return None
+            return _parse_content_range(response.headers.get("Content-Range"))
+        finally:
+            response.close()
+
+    # -----------------
+    # Estado das faixas
+    # -----------------
+
+    @staticmethod
+    def _state_path(tmpfilename: str) -> str:
+        return f"{tmpfilename}.segments"
+
+    def _load_state(self, tmpfilename: str, size: int) -> Optional[list[_Segment]]:
+        path = self._state_path(tmpfilename)
+        if not self.params.get("continuedl", True) or not os.path.isfile(path) or not os.path.isfile(tmpfilename):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("size") != size or os.path.getsize(tmpfilename) != size:
+                return None
+            return [_Segment(int(s), int(e), int(d)) for s, e, d in data["segments"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_state(self, tmpfilename: str, size: int, segments: list[_Segment]) -> None:
+        path = self._state_path(tmpfilename)
+        data = {"size": size, "segments": [[s.start, s.end, s.done] for s in segments]}
+        try:
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            pass
+
+    def _plan(self, size: int, connections: int) -> list[_Segment]:
+        segment_size = int(self.params.get("segmented_segment_size") or DEFAULT_SEGMENT_SIZE)
+        # Pelo menos uma faixa por conexão; faixas menores equilibram conexões lentas e rápidas.
+        count = max(connections, -(-size // segment_size))
+        step = -(-size // count)
+        return [_Segment(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+    # -----------------
+    # Download
+    # -----------------
+
+    def _fetch_segment(
+        self,
+        info_dict: dict[str, Any],
+        tmpfilename: str,
+        segment: _Segment,
+        lock: threading.Lock,
+        stop: threading.Event,
+    ) -> None:
+        # Sem buffer: o que o arquivo de estado marca como feito já foi entregue ao sistema.
+        with open(tmpfilename, "r+b", buffering=0) as out:
+            for retry in RetryManager(self.params.get("retries"), self.report_retry):
+                if stop.is_set() or segment.finished:
+                    return
+                try:
+                    response = self._request(info_dict, segment.start + segment.done, segment.end)
+                    try:
+                        if response.status != 206:
+                            raise ContentTooShortError(segment.done, segment.size)
+                        out.seek(segment.start + segment.done)
+                        while not stop.is_set() and not segment.finished:
+                            block = response.read(min(_BLOCK_SIZE, segment.size - segment.done))
+                            if not block:
+                                break
+                            view = memoryview(block)
+                            while view:
+                                view = view[out.write(view) or 0:]
+                            with lock:
+                                segment.done += len(block)
+                    finally:
+                        response.close()
+                    if not segment.finished and not stop.is_set():
+                        # Conexão fechada antes do fim da faixa: retoma do ponto atual.
+                        raise ContentTooShortError(segment.done, segment.size)
+                except (HTTPError, TransportError, ContentTooShortError, OSError) as err:
+                    retry.error = err
+
+    def real_download(self, filename: str, info_dict: dict[str, Any]) -> Any:
+        size = self._probe_size(info_dict)
+        if not size or size < int(self.params.get("segmented_min_size") or DEFAULT_MIN_SIZE):
+            return self._fallback(filename, info_dict)
+
+        tmpfilename = self.temp_name(filename)
+        connections = int(self.params.get("segmented_connections") or DEFAULT_CONNECTIONS)
+
+        segments = self._load_state(tmpfilename, size)
+        if segments is None:
+            segments = self._plan(size, connections)
+            self.report_destination(filename)
+            with open(tmpfilename, "wb") as f:
+                f.truncate(size)  # pré-alocação (esparsa onde o sistema de arquivos suporta)
+        else:
+            self.to_screen(f"[download] Resuming segmented download of {filename}")
+        self._save_state(tmpfilename, size, segments)
+
+        lock = threading.Lock()
+        stop = threading.Event()
+        start_time = time.time()
+        resumed = sum(s.done for s in segments)
+        pending = [s for s in segments if not s.finished]
+
+        def downloaded() -> int:
+            with lock:
+                return sum(s.done for s in segments)
+
+        def report() -> None:
+            now = time.time()
+            current = downloaded()
+            self._hook_progress({
+                "status": "downloading",
+                "downloaded_bytes": current,
+                "total_bytes": size,
+                "tmpfilename": tmpfilename,
+                "filename": filename,
+                "eta": self.calc_eta(start_time, now, size - resumed, current - resumed),
+                "speed": self.calc_speed(start_time, now, current - resumed),
+                "elapsed": now - start_time,
+                "ctx_id": info_dict.get("ctx_id"),
+            }, info_dict)
+
+        pool = ThreadPoolExecutor(max_workers=min(connections, len(pending)) or 1, thread_name_prefix="downloadium-segment")
+        try:
+            futures = {pool.submit(self._fetch_segment, info_dict, tmpfilename, s, lock, stop) for s in pending}
+            saved_at = 0.0
+            while futures:
+                done, futures = wait(futures, timeout=_PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    future.result()
+                # Hooks de progresso rodam nesta thread (pausa/cancelamento levantam aqui).
+                report()
+                if time.time() - saved_at >= _STATE_SAVE_INTERVAL:
+                    self._save_state(tmpfilename, size, segments)
+                    saved_at = time.time()
+        except BaseException:
+            stop.set()
+            pool.shutdown(wait=True)
+            self._save_state(tmpfilename, size, segments)
+            raise
+        pool.shutdown(wait=True)
+
+        if downloaded() != size:
+            self._save_state(tmpfilename, size, segments)
+            raise ContentTooShortError(downloaded(), size)
+
+        try:
+            os.remove(self._state_path(tmpfilename))
+        except OSError:
+            pass
+        self.try_rename(tmpfilename, filename)
+        self._hook_progress({
+            "downloaded_bytes": size,
+            "total_bytes": size,
+            "filename": filename,
+            "status": "finished",
+            "elapsed": time.time() - start_time,
+            "ctx_id": info_dict.get("ctx_id"),
+        }, info_dict)
+        return True
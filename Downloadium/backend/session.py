@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from typing import Any, Optional, cast
+
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import PagedList, UnavailableVideoError
+
+from Downloadium.backend.formats import FormatIndex
+from Downloadium.backend.metadata_cache import MetadataCache, canonical_key, slim_formats
+
+
+def _materialize(entries: Any) -> list:
+    if entries is None:
+        return []
+    if isinstance(entries, PagedList):
+        return entries.getslice()
+    return list(entries)
+
+
+class ExtractionSession:
+    """Guarda o resultado de UMA extração do yt-dlp para reuso em contagem, resoluções e download.
+
+    A extração é feita com process=False: playlists/canais ficam com as entradas planas
+    (sem extrair cada vídeo) e vídeos únicos ficam com a tabela de formatos crua. O download
+    depois entrega esse info dict a `YoutubeDL.process_ie_result`, sem extrair a URL de novo.
+    """
+
+    # URLs de mídia do YouTube expiram em algumas horas; acima disso extraímos de novo.
+    DEFAULT_MAX_AGE = 30 * 60
+
+    def __init__(
+        self,
+        url: str,
+        cookies_file: Optional[str] = None,
+        noplaylist: bool = False,
+        metadata_cache: Optional[MetadataCache] = None,
+        extra_opts: Optional[dict[str, Any]] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.url = url
+        self.cookies_file = cookies_file
+        self.noplaylist = noplaylist
+        self.metadata_cache = metadata_cache
+        self.extra_opts = dict(extra_opts or {})
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._info: Optional[dict] = None
+        self._resolved_at: float = 0.0
+        self._format_index: Optional[tuple[int, FormatIndex]] = None
+
+    def _extract_opts(self) -> dict[str, Any]:
+        opts: dict[str, Any] = {
+            "ignoreconfig": True,
+            "quiet": True,
+            "skip_download": True,
+            "noplaylist": self.noplaylist,
+            "nocolor": True,
+            "cachedir": False,
+            "retries": 5,
+            "socket_timeout": 30,
+            "no_warnings": True,
+        }
+        if self.cookies_file and os.path.exists(self.cookies_file):
+            opts["cookiefile"] = self.cookies_file
+        opts.update(self.extra_opts)
+        return opts
+
+    @property
+    def resolved(self) -> bool:
+        return self._info is not None
+
+    def is_fresh(self) -> bool:
+        return self._info is not None and (time.time() - self._resolved_at) < self.max_age
+
+    def matches(self, url: str, noplaylist: bool = False) -> bool:
+        """True se a sessão pode ser reaproveitada para a URL (mesmo ID canônico e escopo)."""
+        if not url or noplaylist != self.noplaylist:
+            return False
+        return url == self.url or canonical_key(url) == canonical_key(self.url)
+
+    def resolve(self) -> dict:
+        """Executa a extração (apenas na primeira chamada, ou se a sessão expirou)."""
+        with self._lock:
+            if self._info is not None and self.is_fresh():
+                return self._info
+
+            with YoutubeDL(cast(Any, self._extract_opts())) as ydl:
+                info = ydl.extract_info(self.url, download=False, process=False)
+
+                # Segue redirecionamentos simples até chegar em um vídeo/playlist.
+                hops = 0
+                while info and info.get("_type") in ("url", "url_transparent") and hops < 5:
+                    inner = ydl.extract_info(info["url"], download=False, ie_key=info.get("ie_key"), process=False)
+                    if inner and info.get("_type") == "url_transparent":
+                        outer = {k: v for k, v in info.items() if v is not None and k not in {"_type", "url", "ie_key"}}
+                        inner = {**inner, **outer}
+                    info = inner
+                    hops += 1
+
+            if not info:
+                raise ValueError("Não foi possível extrair informações da URL.")
+
+            if info.get("_type") in ("playlist", "multi_video"):
+                info["entries"] = _materialize(info.get("entries"))
+
+            self._info = info
+            self._resolved_at = time.time()
+            self._store_in_cache(info)
+            return info
+
+    def _store_in_cache(self, info: dict) -> None:
+        if self.metadata_cache is None:
+            return
+        self.metadata_cache.set("count", self.url, self._count(info))
+        if not self._is_playlist(info):
+            self.metadata_cache.set("formats", self.url, slim_formats(info.get("formats")), single_video=True)
+            self.metadata_cache.set(
+                "thumbnail",
+                self.url,
+                {
+                    "id": info.get("id"),
+                    "title": info.get("title"),
+                    "duration": info.get("duration"),
+                    "thumbnail": info.get("thumbnail"),
+                    "thumbnails": info.get("thumbnails") or [],
+                },
+                single_video=True,
+            )
+
+    @staticmethod
+    def _is_playlist(info: dict) -> bool:
+        return info.get("_type") in ("playlist", "multi_video")
+
+    @staticmethod
+    def _count(info: dict) -> int:
+        if info.get("_type") not in ("playlist", "multi_video"):
+            return 1
+        playlist_count = info.get("playlist_count")
+        if isinstance(playlist_count, int) and playlist_count > 0:
+            return playlist_count
+        return len(info.get("entries") or []) or 1
+
+    @property
+    def info(self) -> dict:
+        return self.resolve()
+
+    @property
+    def is_playlist(self) -> bool:
+        return self._is_playlist(self.resolve())
+
+    @property
+    def entry_count(self) -> int:
+        return self._count(self.resolve())
+
+    @property
+    def entries(self) -> list:
+        return list(self.resolve().get("entries") or [])
+
+    @property
+    def formats(self) -> list[dict]:
+        info = self.resolve()
+        if self._is_playlist(info):
+            return []
+        return list(info.get("formats") or [])
+
+    @property
+    def format_index(self) -> FormatIndex:
+        """FormatIndex do vídeo (vazio em playlists), refeito só quando a extração muda."""
+        info = self.resolve()
+        cached = self._format_index
+        if cached is None or cached[0] != id(info):
+            index = FormatIndex([]) if self._is_playlist(info) else FormatIndex.from_info(info)
+            cached = self._format_index = (id(info), index)
+        return cached[1]
+
+    @property
+    def thumbnail(self) -> Optional[str]:
+        return self.resolve().get("thumbnail")
+
+    def info_for_download(self) -> dict:
+        """Cópia do info dict (process_ie_result altera o dict recebido)."""
+        info = self.resolve()
+        try:
+            return copy.deepcopy(info)
+        except Exception:
+            return dict(info)
+
+    def process(self, ydl: YoutubeDL, download: bool = True) -> Any:
+        """Entrega o resultado já extraído ao YoutubeDL informado (com as opções de download dele)."""
+        try:
+            return ydl.process_ie_result(self.info_for_download(), download=download)
+        except UnavailableVideoError as e:
+            # Mesmo tratamento de YoutubeDL.download()
+            ydl.report_error(e)
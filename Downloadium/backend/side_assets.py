@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+SUBTITLES = "subtitles"
+THUMBNAIL = "thumbnail"
+INFO_JSON = "infojson"
+
+_local = threading.local()
+
+
+def in_side_asset() -> bool:
+    """True dentro de uma tarefa do pool (ex.: para não mandar o progresso da legenda como o do vídeo)."""
+    return getattr(_local, "active", False)
+
+
+@dataclass(frozen=True)
+class SideAssetResult:
+    kind: str
+    ok: bool
+    files: list[tuple[str, str]] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+class SideAssetPool:
+    """Pool pequeno e compartilhado para os arquivos auxiliares de um vídeo.
+
+    Legendas, miniatura e info JSON são poucos bytes mas um round-trip cada; aqui eles são baixados
+    enquanto a thread do vídeo já está no download principal. Cada tarefa termina num
+    SideAssetResult: exceções viram `ok=False` e nunca chegam a quem espera o Future.
+    """
+
+    def __init__(self, workers: int = 4):
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="downloadium-assets")
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """Roda `fn(*args)`; o retorno do yt-dlp (lista de arquivos, True/"exists", None = erro) vira o resultado."""
+
+        def run() -> SideAssetResult:
+            _local.active = True
+            started = time.monotonic()
+            try:
+                value = fn(*args)
+            except Exception as e:
+                return SideAssetResult(kind, False, error=str(e), elapsed=time.monotonic() - started)
+            finally:
+                _local.active = False
+            elapsed = time.monotonic() - started
+            if value is None:
+                return SideAssetResult(kind, False, error=f"could not write {kind}", elapsed=elapsed)
+            files = [tuple(pair) for pair in value] if isinstance(value, list) else []
+            return SideAssetResult(kind, True, files, elapsed=elapsed)
+
+        return self._executor.submit(run)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+_default_pool: Optional[SideAssetPool] = None
+_default_lock = threading.Lock()
+
+
+def get_default_side_asset_pool() -> SideAssetPool:
+    """Instância compartilhada por todos os downloads do processo (poucas threads, muitos vídeos)."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = SideAssetPool()
+        return _default_pool
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import html
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import IO, Iterable, Iterator, Optional
+
+
+# Conversão de legendas em Python puro (sem abrir um ffmpeg por arquivo).
+# Entrada: VTT, SRT, TTML/DFXP e json3 do YouTube. Saída: SRT, VTT ou TTML.
+
+INPUT_EXTS = {
+    "vtt": "vtt",
+    "srt": "srt",
+    "ttml": "ttml",
+    "dfxp": "ttml",
+    "json3": "json3",
+}
+OUTPUT_EXTS = ("srt", "vtt", "ttml")
+
+
+@dataclass(frozen=True)
+class Cue:
+    start: float
+    end: float
+    text: str
+
+
+# -----------------
+# Tempo
+# -----------------
+
+_CLOCK_RE = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{2})(?:[.,:](\d{1,3}))?")
+_OFFSET_RE = re.compile(r"([\d.]+)(h|m|s|ms|f|t)")
+_TIMING_RE = re.compile(r"^\s*(\S+)\s+-->\s+(\S+)")
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def parse_clock(value: str, tick_rate: float = 10_000_000.0, frame_rate: float = 30.0) -> float:
+    """Segundos de "01:02:03.456", "02:03,456", "1.5s", "1500ms" ou "12345t" (ticks TTML)."""
+    value = value.strip()
+    match = _CLOCK_RE.fullmatch(value)
+    if match:
+        hours, minutes, seconds, fraction = match.groups()
+        frac = int(fraction.ljust(3, "0")) / 1000 if fraction else 0.0
+        return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + frac
+    match = _OFFSET_RE.fullmatch(value)
+    if match:
+        number, unit = float(match.group(1)), match.group(2)
+        scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001, "f": 1 / frame_rate, "t": 1 / tick_rate}[unit]
+        return number * scale
+    raise ValueError(f"invalid timestamp: {value!r}")
+
+
+def _format_clock(seconds: float, separator: str) -> str:
+    millis = max(0, round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _clean_text(lines: Iterable[str]) -> str:
+    text = "\n".join(html.unescape(_TAG_RE.sub("", line)).strip() for line in lines)
+    return "\n".join(line for line in text.split("\n") if line)
+
+
+# -----------------
+# Leitura (geradores: o arquivo nunca é carregado inteiro, exceto json3)
+# -----------------
+
+
+def _blocks(lines: Iterable[str]) -> Iterator[list[str]]:
+    block: list[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n").lstrip("\ufeff")
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _timed_blocks(lines: Iterable[str]) -> Iterator[Cue]:
+    for block in _blocks(lines):
+        for i, line in enumerate(block):
+            match = _TIMING_RE.match(line)
+            if match:
+                text = _clean_text(block[i + 1:])
+                if text:
+                    yield Cue(parse_clock(match.group(1)), parse_clock(match.group(2)), text)
+                break
+
+
+def parse_vtt(lines: Iterable[str]) -> Iterator[Cue]:
+    """Cues de um WebVTT (cabeçalho, NOTE/STYLE/REGION e tags inline são descartados)."""
+    return _timed_blocks(lines)
+
+
+def parse_srt(lines: Iterable[str]) -> Iterator[Cue]:
+    return _timed_blocks(lines)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_ttml(fp: IO) -> Iterator[Cue]:
+    """Cues de um TTML/DFXP lido com iterparse (cada <p> é liberado depois de convertido)."""
+    tick_rate, frame_rate = 10_000_000.0, 30.0
+    for event, elem in ET.iterparse(fp, events=("start", "end")):
+        name = _local(elem.tag)
+        if event == "start":
+            if name == "tt":
+                for key, value in elem.attrib.items():
+                    if _local(key) == "tickRate":
+                        tick_rate = float(value)
+                    elif _local(key) == "frameRate":
+                        frame_rate = float(value)
+            continue
+        if name == "br":
+            elem.tail = "\n" + (elem.tail or "")
+            continue
+        if name != "p":
+            continue
+        attrs = {_local(k): v for k, v in elem.attrib.items()}
+        if "begin" in attrs:
+            start = parse_clock(attrs["begin"], tick_rate, frame_rate)
+            if "end" in attrs:
+                end = parse_clock(attrs["end"], tick_rate, frame_rate)
+            else:
+                end = start + parse_clock(attrs.get("dur", "0s"), tick_rate, frame_rate)
+            text = _clean_text("".join(elem.itertext()).split("\n"))
+            if text:
+                yield Cue(start, end, text)
+        elem.clear()
+
+
+def parse_json3(fp: IO) -> Iterator[Cue]:
+    """Cues do json3 do YouTube (eventos com tStartMs/dDurationMs/segs)."""
+    data = json.load(fp)
+    for event in data.get("events") or []:
+        segs = event.get("segs")
+        if not segs or event.get("aAppend"):
+            continue
+        text = _clean_text("".join(seg.get("utf8", "") for seg in segs).split("\n"))
+        if not text:
+            continue
+        start = event.get("tStartMs", 0) / 1000
+        yield Cue(start, start + event.get("dDurationMs", 0) / 1000, text)
+
+
+def read_cues(fp: IO, fmt: str) -> Iterator[Cue]:
+    if fmt == "ttml":
+        return parse_ttml(fp)
+    if fmt == "json3":
+        return parse_json3(fp)
+    return parse_vtt(fp) if fmt == "vtt" else parse_srt(fp)
+
+
+# -----------------
+# Limpeza: legendas automáticas "rolantes" e cues repetidas
+# -----------------
+
+
+def dedupe_rolling(cues: Iterable[Cue]) -> Iterator[Cue]:
+    """Remove as linhas repetidas das legendas automáticas do YouTube.
+
+    Cada cue rolante repete a(s) linha(s) da anterior antes da nova; aqui só a parte nova fica.
+    Cues sem nada novo (as de ~10 ms que só repetem o texto) saem com o texto da anterior, para
+    que `merge_cues` as junte a ela.
+    """
+    previous: list[str] = []
+    emitted: Optional[str] = None
+    for cue in cues:
+        lines = cue.text.split("\n")
+        overlap = 0
+        for size in range(min(len(previous), len(lines)), 0, -1):
+            if lines[:size] == previous[-size:]:
+                overlap = size
+                break
+        new = lines[overlap:]
+        previous = lines
+        if new or emitted is None:
+            emitted = "\n".join(new) or cue.text
+        yield Cue(cue.start, cue.end, emitted)
+
+
+def merge_cues(cues: Iterable[Cue], gap: float = 0.05) -> Iterator[Cue]:
+    """Junta cues consecutivas de mesmo texto separadas por até `gap` segundos."""
+    current: Optional[Cue] = None
+    for cue in cues:
+        if current is not None and cue.text == current.text and cue.start - current.end <= gap:
+            current = Cue(current.start, max(current.end, cue.end), current.text)
+            continue
+        if current is not None:
+            yield current
+        current = cue
+    if current is not None:
+        yield current
+
+
+# -----------------
+# Escrita
+# -----------------
+
+
+def write_srt(cues: Iterable[Cue], out: IO) -> int:
+    count = 0
+    for count, cue in enumerate(cues, 1):
+        out.write(f"{count}\n{_format_clock(cue.start, ',')} --> {_format_clock(cue.end, ',')}\n{cue.text}\n\n")
+    return count
+
+
+def write_vtt(cues: Iterable[Cue], out: IO) -> int:
+    out.write("WEBVTT\n\n")
+    count = 0
+    for cue in cues:
+        count += 1
+        out.write(f"{_format_clock(cue.start, '.')} --> {_format_clock(cue.end, '.')}\n{cue.text}\n\n")
+    return count
+
+
+def write_ttml(cues: Iterable[Cue], out: IO) -> int:
+    out.write('<?xml version="1.0" encoding="utf-8"?>\n<tt xmlns="http://www.w3.org/ns/ttml"><body><div>\n')
+    count = 0
+    for cue in cues:
+        count += 1
+        text = "<br/>".join(html.escape(line, quote=False) for line in cue.text.split("\n"))
+        out.write(f'<p begin="{_format_clock(cue.start, ".")}" end="{_format_clock(cue.end, ".")}">{text}</p>\n')
+    out.write("</div></body></tt>\n")
+    return count
+
+
+_WRITERS = {"srt": write_srt, "vtt": write_vtt, "ttml": write_ttml}
+
+
+def subtitle_format(path: str) -> Optional[str]:
+    """Formato de entrada pelo nome do arquivo ("video.en.vtt" -> "vtt"), ou None."""
+    return INPUT_EXTS.get(path.rsplit(".", 1)[-1].lower()) if "." in path else None
+
+
+def convert(src: str, dst: str, dedupe: bool = False) -> int:
+    """Converte `src` para o formato da extensão de `dst`; retorna o número de cues escritas.
+
+    `dedupe` só serve para legendas automáticas (linhas que rolam de uma cue para a próxima):
+    numa legenda manual, uma fala repetida de propósito seria apagada.
+    A saída vai para um temporário ao lado de `dst` e é trocada com `os.replace` no fim.
+    """
+    fmt_in = subtitle_format(src)
+    fmt_out = dst.rsplit(".", 1)[-1].lower()
+    if fmt_in is None:
+        raise ValueError(f"unsupported subtitle format: {src}")
+    if fmt_out not in _WRITERS:
+        raise ValueError(f"unsupported output format: {dst}")
+
+    tmp = f"{dst}.part"
+    mode = "rb" if fmt_in == "ttml" else "r"
+    encoding = None if fmt_in == "ttml" else "utf-8"
+    try:
+        with open(src, mode, encoding=encoding) as fin, open(tmp, "w", encoding="utf-8", newline="\n") as fout:
+            cues: Iterable[Cue] = read_cues(fin, fmt_in)
+            if dedupe:
+                cues = merge_cues(dedupe_rolling(cues))
+            count = _WRITERS[fmt_out](cues, fout)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return count
+
+
+# -----------------
+# Lote
+# -----------------
+
+
+@dataclass(frozen=True)
+class ConversionResult:
+    src: str
+    dst: str
+    cues: int = 0
+    error: Optional[str] = None
+
+
+def _convert_job(job: tuple[str, str, bool]) -> ConversionResult:
+    src, dst, dedupe = job
+    try:
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        return ConversionResult(src, dst, convert(src, dst, dedupe))
+    except Exception as e:
+        return ConversionResult(src, dst, error=str(e))
+
+
+def convert_tree(
+    root: str,
+    target: str = "srt",
+    out_root: Optional[str] = None,
+    workers: Optional[int] = None,
+    dedupe: bool = False,
+) -> list[ConversionResult]:
+    """Converte todas as legendas sob `root` para `target` num pool de processos.
+
+    Com `out_root` a árvore de pastas é espelhada lá; sem ele, cada saída fica ao lado da
+    origem. Arquivos que já estão no formato de destino são ignorados.
+    """
+    if target not in _WRITERS:
+        raise ValueError(f"unsupported output format: {target}")
+    jobs: list[tuple[str, str, bool]] = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            fmt = subtitle_format(name)
+            if fmt is None or fmt == target:
+                continue
+            src = os.path.join(dirpath, name)
+            dst_dir = os.path.join(out_root, os.path.relpath(dirpath, root)) if out_root else dirpath
+            jobs.append((src, os.path.join(dst_dir, f"{name.rsplit('.', 1)[0]}.{target}"), dedupe))
+    if not jobs:
+        return []
+    if workers == 1 or len(jobs) == 1:
+        return [_convert_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_convert_job, jobs, chunksize=max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))))
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+
+# Formatos de legenda em ordem de preferência; "best" = o último que o extrator listou.
+DEFAULT_SUBTITLE_FORMATS = ("vtt", "srt", "best")
+
+Tracks = Optional[dict[str, list[dict[str, Any]]]]
+
+
+def _language_keys(language: str, available: Iterable[str], automatic: bool) -> list[str]:
+    """Chaves de `available` que servem para `language`, da melhor para a pior.
+
+    "en" aceita "en", depois (nas automáticas) "en-orig" e por fim variantes regionais ("en-US").
+    Um pedido regional ("pt-BR") aceita a própria chave e, sem ela, a base ("pt") antes das demais.
+    """
+    keys = list(available)
+    wanted = language.lower()
+    base = wanted.split("-")[0]
+    by_lower = {k.lower(): k for k in keys}
+    order = [wanted]
+    if base != wanted:
+        order.append(base)
+    if automatic:
+        order.append(f"{base}-orig")
+    found = [by_lower[k] for k in order if k in by_lower]
+    found += sorted(k for k in keys if k.lower().startswith(f"{base}-") and k not in found and not k.lower().endswith("-orig"))
+    return found
+
+
+def _pick_format(formats: list[dict[str, Any]], preference: Iterable[str]) -> Optional[dict[str, Any]]:
+    if not formats:
+        return None
+    for ext in preference:
+        if ext == "best":
+            return formats[-1]
+        matches = [f for f in formats if f.get("ext") == ext]
+        if matches:
+            return matches[-1]
+    return formats[-1]
+
+
+class SubtitlePlanner:
+    """Escolhe exatamente UMA trilha (e um formato) por idioma pedido.
+
+    Com `subtitleslangs: ["en.*"]` o yt-dlp baixa todas as variantes que casam com a regex
+    (en, en-orig, en-US, traduções automáticas...), cada uma um request e um arquivo. Aqui cada
+    idioma vira uma trilha: a manual quando existe, senão a automática; idiomas pedidos que
+    caem na mesma trilha são baixados uma vez só.
+    """
+
+    def __init__(
+        self,
+        languages: Iterable[str] = ("en",),
+        formats: Iterable[str] = DEFAULT_SUBTITLE_FORMATS,
+        automatic: bool = True,
+    ):
+        self.languages = tuple(languages)
+        self.formats = tuple(formats)
+        self.automatic = automatic
+
+    def select(self, subtitles: Tracks, automatic_captions: Tracks = None) -> dict[str, dict[str, Any]]:
+        """{chave da trilha: formato escolhido} no formato de `requested_subtitles` do yt-dlp."""
+        manual = subtitles or {}
+        auto = (automatic_captions or {}) if self.automatic else {}
+        chosen: dict[str, dict[str, Any]] = {}
+        for language in self.languages:
+            for tracks, is_auto in ((manual, False), (auto, True)):
+                key = next((k for k in _language_keys(language, tracks, is_auto) if tracks.get(k)), None)
+                if key is None:
+                    continue
+                if key not in chosen:
+                    fmt = _pick_format(tracks[key], self.formats)
+                    if fmt is not None:
+                        chosen[key] = fmt
+                break
+        return chosen
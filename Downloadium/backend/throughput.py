@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from Downloadium.backend.utils import get_app_data_dir, url_host
+
+
+PROGRESSIVE = "progressive"
+FRAGMENTED = "fragmented"
+
+_FRAGMENTED_PROTOCOLS = ("m3u8", "dash", "ism", "f4m", "http_dash_segments")
+
+# Downloads menores/mais curtos que isso medem mais latência do que vazão.
+_MIN_SAMPLE_BYTES = 512 * 1024
+_MIN_SAMPLE_SECONDS = 1.0
+
+
+def protocol_kind(protocol: Optional[str]) -> str:
+    """PROGRESSIVE (um arquivo via http) ou FRAGMENTED (HLS/DASH/...)."""
+    text = str(protocol or "").lower()
+    return FRAGMENTED if any(p in text for p in _FRAGMENTED_PROTOCOLS) else PROGRESSIVE
+
+
+class ThroughputHistory:
+    """Vazão medida (bytes/s) por host e tipo de protocolo, em média móvel exponencial.
+
+    Alimentada pelo hook de progresso de cada download concluído e salva em JSON, para que o
+    modelo de custo dos formatos parta de números reais já na próxima execução.
+    """
+
+    def __init__(self, path: Optional[str] = None, alpha: float = 0.3, save_interval: float = 10.0):
+        self.path = path
+        self.alpha = alpha
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        self._rates: dict[str, dict[str, float]] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._rates = {
+                host: {kind: float(rate) for kind, rate in kinds.items() if float(rate) > 0}
+                for host, kinds in (data or {}).items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            self._rates = {}
+
+    def save(self, force: bool = False) -> None:
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            if not force and time.time() - self._saved_at < self.save_interval:
+                return
+            data = {host: dict(kinds) for host, kinds in self._rates.items()}
+            self._dirty = False
+            self._saved_at = time.time()
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def record(self, host: str, kind: str, nbytes: float, seconds: float) -> Optional[float]:
+        """Registra um download concluído; retorna a nova média (None se a amostra foi descartada)."""
+        if not host or nbytes < _MIN_SAMPLE_BYTES or seconds < _MIN_SAMPLE_SECONDS:
+            return None
+        sample = nbytes / seconds
+        with self._lock:
+            kinds = self._rates.setdefault(host, {})
+            previous = kinds.get(kind)
+            rate = kinds[kind] = sample if previous is None else previous + self.alpha * (sample - previous)
+            self._dirty = True
+        self.save()
+        return rate
+
+    def rate(self, host: Optional[str], kind: str = PROGRESSIVE) -> Optional[float]:
+        """Vazão esperada para o host; usa a do outro tipo de protocolo se este não tiver histórico."""
+        with self._lock:
+            kinds = self._rates.get(host or "") or {}
+            if kind in kinds:
+                return kinds[kind]
+            return next(iter(kinds.values()), None)
+
+    def progress_hook(self, d: dict) -> None:
+        """Hook de progresso do yt-dlp: cada arquivo concluído vira uma amostra do host da página."""
+        if d.get("status") != "finished":
+            return
+        info = d.get("info_dict") or {}
+        nbytes = d.get("total_bytes") or d.get("downloaded_bytes") or 0
+        elapsed = d.get("elapsed") or 0
+        host = url_host(info.get("webpage_url") or info.get("original_url"))
+        self.record(host, protocol_kind(info.get("protocol")), float(nbytes), float(elapsed))
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {host: dict(kinds) for host, kinds in self._rates.items()}
+
+
+_default_history: Optional[ThroughputHistory] = None
+_default_lock = threading.Lock()
+
+
+def get_default_history() -> ThroughputHistory:
+    """Instância compartilhada, persistida em <app data>/throughput.json."""
+    global _default_history
+    with _default_lock:
+        if _default_history is None:
+            try:
+                path: Optional[str] = os.path.join(get_app_data_dir(), "throughput.json")
+            except OSError:
+                path = None
+            _default_history = ThroughputHistory(path=path)
+        return _default_history
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from Downloadium.backend.utils import ensure_directory_exists, sanitize_filename
+
+
+DOWNLOADED = "downloaded"
+NOT_MODIFIED = "not_modified"
+FAILED = "failed"
+
+# ETag/Last-Modified de cada miniatura já baixada, guardados na própria pasta de destino.
+VALIDATORS_FILE = ".thumbnails.json"
+
+_IMAGE_EXTS = ("jpg", "jpeg", "png", "webp")
+
+
+@dataclass(frozen=True)
+class ThumbnailResult:
+    url: str
+    path: str
+    status: str
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != FAILED
+
+
+def best_thumbnail(entry: dict[str, Any]) -> Optional[str]:
+    """URL da melhor miniatura de um info dict ou entrada plana (maior `preference`, depois maior área)."""
+    thumbnails = [t for t in entry.get("thumbnails") or [] if t.get("url")]
+    if thumbnails:
+        best = max(
+            enumerate(thumbnails),
+            key=lambda item: (
+                item[1].get("preference") or 0,
+                (item[1].get("width") or 0) * (item[1].get("height") or 0),
+                item[0],  # o yt-dlp ordena do pior para o melhor
+            ),
+        )
+        return best[1]["url"]
+    return entry.get("thumbnail")
+
+
+def thumbnail_filename(entry: dict[str, Any], url: str) -> str:
+    """"<título> [<id>]_thumbnail.<ext>": o id separa vídeos de mesmo título ("#shorts", "Live")."""
+    path = urlparse(url).path
+    ext = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    ext = ext if ext in _IMAGE_EXTS else "jpg"
+    title, video_id = entry.get("title"), entry.get("id")
+    if title and video_id:
+        name = f"{title} [{video_id}]"
+    else:
+        name = title or video_id or "thumbnail"
+    return f"{sanitize_filename(str(name))}_thumbnail.{ext}"
+
+
+def thumbnail_jobs(info: dict[str, Any], output_path: str) -> list[tuple[str, str]]:
+    """Pares (url, destino) para um vídeo ou para as entradas planas de uma playlist/canal.
+
+    Entradas sem miniatura nos metadados planos ficam de fora (não extraímos vídeo por vídeo).
+    """
+    entries = info.get("entries") if info.get("_type") in ("playlist", "multi_video") else [info]
+    jobs: list[tuple[str, str]] = []
+    seen: set[str] = set()
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            continue
+        url = best_thumbnail(entry)
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        jobs.append((url, os.path.join(output_path, thumbnail_filename(entry, url))))
+    return jobs
+
+
+class ThumbnailFetcher:
+    """Baixa miniaturas em lote com um `requests.Session` compartilhado (keep-alive).
+
+    - No máximo `max_workers` downloads simultâneos, e o pool de conexões do mesmo tamanho.
+    - A resposta é gravada em blocos num `.part` e só então renomeada para o destino.
+    - GET condicional (If-None-Match/If-Modified-Since): miniaturas que não mudaram desde a
+      última sincronização voltam 304 e o arquivo existente é mantido.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: tuple[float, float] = (10.0, 30.0),
+        chunk_size: int = 64 * 1024,
+        session: Optional[requests.Session] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+
+        self._owns_session = session is None
+        self.session = session or requests.Session()
+        if self._owns_session:
+            adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=2)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._validators: dict[str, dict[str, dict[str, str]]] = {}
+
+    # -----------------
+    # Validadores (ETag/Last-Modified) por pasta
+    # -----------------
+
+    def _load_validators(self, directory: str) -> dict[str, dict[str, str]]:
+        with self._lock:
+            cached = self._validators.get(directory)
+            if cached is not None:
+                return cached
+            path = os.path.join(directory, VALIDATORS_FILE)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                cached = {str(k): dict(v) for k, v in data.items()} if isinstance(data, dict) else {}
+            except (OSError, ValueError, TypeError):
+                cached = {}
+            self._validators[directory] = cached
+            return cached
+
+    def _save_validators(self, directory: str) -> None:
+        with self._lock:
+            data = dict(self._validators.get(directory) or {})
+        path = os.path.join(directory, VALIDATORS_FILE)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    # -----------------
+    # Download
+    # -----------------
+
+    def fetch(self, url: str, path: str, save: bool = True) -> ThumbnailResult:
+        """Baixa uma miniatura para `path` (ou confirma que a cópia local ainda vale)."""
+        directory = os.path.dirname(path) or "."
+        ensure_directory_exists(directory)
+        validators = self._load_validators(directory)
+
+        headers: dict[str, str] = {}
+        known = validators.get(url)
+        if known and known.get("path") == os.path.basename(path) and os.path.exists(path):
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
+
+        part = f"{path}.part"
+        try:
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 304 and headers:
+                    return ThumbnailResult(url, path, NOT_MODIFIED)
+                response.raise_for_status()
+                with open(part, "wb") as f:
+                    for chunk in response.iter_content(self.chunk_size):
+                        f.write(chunk)
+                os.replace(part, path)
+                etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        except (requests.RequestException, OSError) as e:
+            if os.path.exists(part):
+                os.remove(part)
+            return ThumbnailResult(url, path, FAILED, str(e))
+
+        entry = {"path": os.path.basename(path)}
+        if etag:
+            entry["etag"] = etag
+        if last_modified:
+            entry["last_modified"] = last_modified
+        with self._lock:
+            validators[url] = entry
+        if save:
+            self._save_validators(directory)
+        return ThumbnailResult(url, path, DOWNLOADED)
+
+    def fetch_many(
+        self,
+        jobs: Iterable[tuple[str, str]],
+        on_result: Optional[Callable[[ThumbnailResult], None]] = None,
+    ) -> list[ThumbnailResult]:
+        """Baixa vários pares (url, destino) com concorrência limitada; resultados na ordem dos jobs."""
+        jobs = list(jobs)
+        if not jobs:
+            return []
+
+        def run(job: tuple[str, str]) -> ThumbnailResult:
+            result = self.fetch(*job, save=False)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs)), thread_name_prefix="thumbs") as pool:
+            results = list(pool.map(run, jobs))
+        # Um único JSON por pasta no fim, em vez de um por miniatura.
+        for directory in {os.path.dirname(path) or "." for _, path in jobs}:
+            self._save_validators(directory)
+        return results
+
+    def close(self) -> None:
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self) -> "ThumbnailFetcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def summarize_results(results: Iterable[ThumbnailResult]) -> dict[str, int]:
+    counts = {DOWNLOADED: 0, NOT_MODIFIED: 0, FAILED: 0}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return counts
+
+
+_default_fetcher: Optional[ThumbnailFetcher] = None
+_default_lock = threading.Lock()
+
+
+def get_default_fetcher() -> ThumbnailFetcher:
+    """Instância compartilhada: as conexões keep-alive sobrevivem entre cliques/sincronizações."""
+    global _default_fetcher
+    with _default_lock:
+        if _default_fetcher is None:
+            _default_fetcher = ThumbnailFetcher()
+        return _default_fetcher
@@ -29,3 +29,42 @@ def validate_url(url):
     :return: True if valid, False otherwise.
     """
     return url.startswith("http://") or url.startswith("https://")
+
+def get_app_data_dir(*parts):
+    """
+    Returns the per-user Downloadium data directory, creating it if needed.
+
+    Honors the DOWNLOADIUM_HOME environment variable when set.
+
+    :param parts: Optional subdirectories appended to the base directory.
+    :return: Path to the directory.
+    """
+    base = os.environ.get("DOWNLOADIUM_HOME")
+    if not base:
+        if os.name == "nt":
+            root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+            base = os.path.join(root, "Downloadium")
+        else:
+            root = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+            base = os.path.join(root, "downloadium")
+    path = os.path.join(base, *parts)
+    ensure_directory_exists(path)
+    return path
+
+def url_host(url):
+    """
+    Returns the normalized host of a URL, used to group requests per site.
+
+    Strips "www." and maps youtu.be to youtube.com.
+
+    :param url: URL string.
+    :return: Lowercase host, or an empty string if the URL has none.
+    """
+    from urllib.parse import urlparse
+
+    host = urlparse(str(url or "")).netloc.lower().rsplit("@", 1)[-1].split(":", 1)[0]
+    if host.startswith("www."):
+        host = host[4:]
+    if host == "youtu.be":
+        host = "youtube.com"
+    return host
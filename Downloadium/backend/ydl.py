@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, wait
+from typing import Any, Optional
+
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.downloader.dash import DashSegmentsFD
+from yt_dlp.downloader.hls import HlsFD
+
+from Downloadium.backend.finalize import FinalizePP
+from Downloadium.backend.formats import IndexedFormatSelector
+from Downloadium.backend.fragments import AdaptiveDashFD, AdaptiveHlsFD
+from Downloadium.backend.remux import plan_merge
+from Downloadium.backend.segmented import SegmentedHttpFD
+from Downloadium.backend.side_assets import INFO_JSON, SUBTITLES, THUMBNAIL, SideAssetResult, in_side_asset
+
+
+class DownloadiumYDL(YoutubeDL):
+    """YoutubeDL com os downloaders do Downloadium.
+
+    - Formatos progressivos (http/https): SegmentedHttpFD quando `segmented_connections` > 1.
+    - DASH/HLS: fragmentos com concorrência adaptativa quando `adaptive_fragments` está ligado.
+    - `format` pode ser um IndexedFormatSelector (IDs exatos escolhidos pela tabela de cada vídeo).
+    - Merges: sempre por cópia de streams; codecs que o `merge_output_format` não aceita vão para
+      mkv, sem recodificar (o plano vai para `merge_plan_hook` e os contadores para `merge_stats`).
+    - `finalize`: legendas, capa, capítulos e metadados embutidos numa só passada (FinalizePP).
+    - Legendas: com `subtitle_planner` (SubtitlePlanner), uma trilha por idioma pedido em vez de
+      todas as que casam com `subtitleslangs`; trilhas, requests e bytes vão para `subtitle_stats`.
+    - Arquivos auxiliares: com `side_asset_pool` (SideAssetPool), legendas, miniatura e info JSON
+      são baixados em paralelo com a mídia; cada um termina em `side_asset_hook`/`side_asset_stats`
+      e uma falha vira aviso em vez de derrubar o vídeo.
+    - `ignore_archive`: o `download_archive` não pula nada (o vídeo é baixado de novo), mas
+      continua sendo atualizado.
+    - Pós-processamento: com `postprocess_pipeline` (PostProcessPipeline) nos params, o merge/embed
+      de cada vídeo roda no pool do pipeline enquanto esta instância já baixa o próximo.
+
+    Todo o resto segue o caminho normal do yt-dlp.
+    """
+
+    def __init__(self, params: Optional[dict[str, Any]] = None, auto_init: Any = True):
+        self._pp_lock = threading.Lock()
+        self._pp_jobs: list[Future] = []
+        self._pp_by_archive_id: dict[Optional[str], Future] = {}
+        self._side_jobs: list[Future] = []
+        super().__init__(params, auto_init)
+        # O mesmo seletor pode estar nos params de vários workers: cada instância usa uma cópia ligada a si.
+        if isinstance(self.format_selector, IndexedFormatSelector):
+            self.format_selector = self.format_selector.bind(self)
+        # Vazão de cada arquivo concluído alimenta o modelo de custo dos próximos formatos.
+        history = self.params.get("throughput_history")
+        if history is not None:
+            self.add_progress_hook(history.progress_hook)
+        if self.params.get("finalize"):
+            self.add_post_processor(FinalizePP(self), when="post_process")
+
+    def process_video_result(self, info_dict: dict[str, Any], download: bool = True) -> Any:
+        if isinstance(self.format_selector, IndexedFormatSelector):
+            self.format_selector.prepare(info_dict)
+        return super().process_video_result(info_dict, download)
+
+    def _downloader_for(self, name: str, info: dict[str, Any]) -> Optional[type]:
+        if name == "-" or not info.get("url"):
+            return None
+        if SegmentedHttpFD.suitable(info, self.params):
+            return SegmentedHttpFD
+        if not self.params.get("adaptive_fragments"):
+            return None
+        try:
+            fd = get_suitable_downloader(dict(info), self.params)
+        except Exception:
+            return None
+        return {DashSegmentsFD: AdaptiveDashFD, HlsFD: AdaptiveHlsFD}.get(fd)
+
+    def dl(self, name: str, info: dict[str, Any], subtitle: bool = False, test: bool = False) -> Any:
+        if subtitle:
+            if in_side_asset() and not test:
+                # Fora da thread do vídeo: sem progress hooks, que tratariam a legenda como a mídia.
+                fd = get_suitable_downloader(info, self.params, to_stdout=(name == "-"))(self, self.params)
+                new_info = self._copy_infodict(info)
+                if new_info.get("http_headers") is None:
+                    new_info["http_headers"] = self._calc_headers(new_info)
+                result = fd.download(name, new_info, subtitle)
+            else:
+                result = super().dl(name, info, subtitle=subtitle, test=test)
+            stats = self.params.get("subtitle_stats")
+            if stats is not None:
+                stats.record_subtitle_download(os.path.getsize(name) if os.path.exists(name) else 0)
+            return result
+        fd_cls = None if test else self._downloader_for(name, info)
+        if fd_cls is None:
+            return super().dl(name, info, subtitle=subtitle, test=test)
+
+        fd = fd_cls(self, self.params)
+        for ph in self._progress_hooks:
+            fd.add_progress_hook(ph)
+        self.write_debug(f'Invoking {fd.FD_NAME} downloader on "{info["url"]}"')
+
+        # Mesmo preparo do YoutubeDL.dl original
+        new_info = self._copy_infodict(info)
+        if new_info.get("http_headers") is None:
+            new_info["http_headers"] = self._calc_headers(new_info)
+        return fd.download(name, new_info, subtitle)
+
+    # -----------------
+    # Legendas: uma trilha por idioma
+    # -----------------
+
+    def process_subtitles(self, video_id: str, normal_subtitles: Any, automatic_captions: Any) -> Any:
+        planner = self.params.get("subtitle_planner")
+        if planner is None:
+            return super().process_subtitles(video_id, normal_subtitles, automatic_captions)
+        if not (self.params.get("writesubtitles") or self.params.get("writeautomaticsub")):
+            return None
+        subs = planner.select(
+            normal_subtitles if self.params.get("writesubtitles") else None,
+            automatic_captions if self.params.get("writeautomaticsub") else None,
+        )
+        stats = self.params.get("subtitle_stats")
+        if stats is not None:
+            stats.record_subtitle_plan(len(subs))
+        if subs:
+            self.to_screen(f"[info] {video_id}: Downloading subtitles: {', '.join(subs)}")
+        return subs or None
+
+    # -----------------
+    # Merge: remux sempre que possível
+    # -----------------
+
+    def _plan_merge(self, info: dict[str, Any]) -> None:
+        container = str(self.params.get("merge_output_format") or "")
+        formats = info.get("requested_formats")
+        if not formats or not container or "/" in container:
+            return
+        plan = plan_merge(formats, container)
+        stats = self.params.get("merge_stats")
+        if stats is not None:
+            stats.record(plan)
+        hook = self.params.get("merge_plan_hook")
+        if hook is not None:
+            hook(plan, info)
+        if plan.fallback:
+            # Cópia de streams num contêiner que aceita os codecs, em vez de recodificar o vídeo.
+            info["ext"] = plan.merge_ext
+
+    def process_info(self, info_dict: dict[str, Any]) -> Any:
+        self._plan_merge(info_dict)
+        self._side_jobs = []
+        try:
+            return super().process_info(info_dict)
+        finally:
+            # Download principal falhou/pulado antes do pós-processamento: nada fica escrevendo depois.
+            if self._side_jobs:
+                self._collect_side_assets(info_dict, {})
+
+    # -----------------
+    # Arquivos auxiliares em paralelo com a mídia
+    # -----------------
+
+    def _defer_side_assets(self, label: str) -> bool:
+        if label != "video" or self.params.get("side_asset_pool") is None:
+            return False
+        # PPs "before_dl" (ex.: --convert-subs) e skip_download precisam dos arquivos antes do download.
+        return not (self._pps["before_dl"] or self.params.get("skip_download"))
+
+    def _write_subtitles(self, info_dict: dict[str, Any], filename: str) -> Any:
+        if not self._defer_side_assets("video"):
+            return super()._write_subtitles(info_dict, filename)
+        pool = self.params["side_asset_pool"]
+        self._side_jobs.append(pool.submit(SUBTITLES, super()._write_subtitles, info_dict, filename))
+        return []
+
+    def _write_thumbnails(self, label: str, info_dict: dict[str, Any], filename: str, thumb_filename_base: Optional[str] = None) -> Any:
+        if not self._defer_side_assets(label):
+            return super()._write_thumbnails(label, info_dict, filename, thumb_filename_base)
+        pool = self.params["side_asset_pool"]
+        self._side_jobs.append(pool.submit(THUMBNAIL, super()._write_thumbnails, label, info_dict, filename, thumb_filename_base))
+        return []
+
+    def _write_info_json(self, label: str, ie_result: dict[str, Any], infofn: str, overwrite: Optional[bool] = None) -> Any:
+        if not self._defer_side_assets(label) or not self.params.get("writeinfojson") or not infofn:
+            return super()._write_info_json(label, ie_result, infofn, overwrite)
+        # O JSON reflete o info dict de agora, não o que o download vai mudar enquanto ele é gravado.
+        snapshot = self.sanitize_info(ie_result, self.params.get("clean_infojson", True))
+        pool = self.params["side_asset_pool"]
+        self._side_jobs.append(pool.submit(INFO_JSON, super()._write_info_json, label, snapshot, infofn, overwrite))
+        return True
+
+    def _collect_side_assets(self, info: dict[str, Any], files_to_move: dict[str, str]) -> list[SideAssetResult]:
+        """Espera os arquivos auxiliares deste vídeo e junta os que precisam ser movidos no fim."""
+        jobs, self._side_jobs = self._side_jobs, []
+        stats = self.params.get("side_asset_stats")
+        hook = self.params.get("side_asset_hook")
+        results = []
+        for job in jobs:
+            result: SideAssetResult = job.result()
+            if result.ok:
+                files_to_move.update(dict(result.files))
+            else:
+                self.report_warning(f"Skipping {result.kind} for {info.get('id')}: {result.error}")
+            if stats is not None:
+                stats.record_side_asset(result)
+            if hook is not None:
+                hook(result, info)
+            results.append(result)
+        return results
+
+    # -----------------
+    # Pós-processamento em pipeline
+    # -----------------
+
+    def _defer_postprocess(self, info: dict[str, Any]) -> bool:
+        if self.params.get("postprocess_pipeline") is None or self._post_hooks:
+            return False
+        # Só vale a pena sair da thread quando há trabalho de ffmpeg (merge, embed, ...).
+        return bool(info.get("__postprocessors") or self._pps["post_process"])
+
+    def post_process(self, filename: str, info: dict[str, Any], files_to_move: Optional[dict] = None) -> Any:
+        if self._side_jobs:
+            files_to_move = files_to_move if files_to_move is not None else {}
+            self._collect_side_assets(info, files_to_move)
+
+        if not self._defer_postprocess(info):
+            return super().post_process(filename, info, files_to_move)
+
+        pipeline = self.params["postprocess_pipeline"]
+        # Cópia rasa: os PPs alteram o dict enquanto esta thread segue para a próxima entrada.
+        job = pipeline.submit(super().post_process, filename, dict(info), dict(files_to_move or {}))
+        with self._pp_lock:
+            self._pp_jobs.append(job)
+            self._pp_by_archive_id[self._make_archive_id(info)] = job
+        info["filepath"] = filename
+        return info
+
+    def in_download_archive(self, info_dict: dict[str, Any]) -> bool:
+        if self.params.get("ignore_archive"):
+            return False
+        return super().in_download_archive(info_dict)
+
+    def record_download_archive(self, info_dict: dict[str, Any]) -> None:
+        # Com o pós-processamento adiado, o vídeo só entra no arquivo depois que o ffmpeg terminar bem.
+        with self._pp_lock:
+            job = self._pp_by_archive_id.pop(self._make_archive_id(info_dict), None)
+        if job is None:
+            return super().record_download_archive(info_dict)
+
+        def record(f: Future) -> None:
+            if not f.cancelled() and f.exception() is None:
+                super(DownloadiumYDL, self).record_download_archive(info_dict)
+
+        job.add_done_callback(record)
+
+    def take_postprocess_jobs(self) -> list[Future]:
+        """Pós-processamentos adiados desde a última chamada (para ligar cada um à sua entrada)."""
+        with self._pp_lock:
+            jobs, self._pp_jobs = self._pp_jobs, []
+        return jobs
+
+    def wait_postprocessing(self) -> None:
+        """Espera o pós-processamento adiado por esta instância (os erros ficam nos Futures)."""
+        wait(self.take_postprocess_jobs())
+
+    def close(self) -> None:
+        self.wait_postprocessing()
+        super().close()
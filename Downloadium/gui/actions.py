@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+
+@dataclass(frozen=True)
+class ActionResult:
+    """Resultado de uma ação: `value` ou `error`, e `latency` (s) do clique até o resultado."""
+
+    key: Hashable
+    value: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+ActionCallback = Callable[[ActionResult], None]
+
+
+class ActionRunner:
+    """Ações pontuais da GUI (miniatura, legendas...) num pool compartilhado, fora da thread do Tk.
+
+    `submit()` e os callbacks rodam na thread da GUI: os Futures são conferidos a cada `poll_ms`
+    via `schedule` (o `after` do Tk), então nenhuma thread do pool toca em widgets. Um segundo
+    `submit()` com a mesma chave enquanto a primeira ainda roda é ignorado (clique duplo).
+    """
+
+    def __init__(self, schedule: Callable[[int, Callable[[], None]], Any], workers: int = 2, poll_ms: int = 50):
+        self.schedule = schedule
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="downloadium-action")
+        self._pending: dict[Hashable, tuple[Future, ActionCallback, float]] = {}
+        self._polling = False
+
+    def running(self, key: Hashable) -> bool:
+        return key in self._pending
+
+    def pending(self) -> list[Hashable]:
+        return list(self._pending)
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args: Any, on_done: ActionCallback) -> bool:
+        """Agenda `fn(*args)`; False se a mesma ação (`key`) ainda está em andamento."""
+        if key in self._pending:
+            return False
+        self._pending[key] = (self._pool.submit(fn, *args), on_done, time.monotonic())
+        if not self._polling:
+            self._polling = True
+            self.schedule(self.poll_ms, self.poll)
+        return True
+
+    def poll(self) -> None:
+        now = time.monotonic()
+        done = [key for key, (future, _, _) in self._pending.items() if future.done()]
+        try:
+            for key in done:
+                future, on_done, started = self._pending.pop(key)
+                error = future.exception()
+                on_done(ActionResult(key, None if error else future.result(), error, now - started))
+        finally:
+            # Um callback com erro não pode deixar as outras ações sem entrega.
+            if self._pending:
+                self.schedule(self.poll_ms, self.poll)
+            else:
+                self._polling = False
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
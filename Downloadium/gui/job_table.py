@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from yt_dlp.utils import format_bytes, formatSeconds
+
+from Downloadium.backend.events import DOWNLOADING, MESSAGE, ProgressEvent
+
+
+# Estados da JobQueue que encerram o job: a fase do último evento deixa de importar.
+_FINAL_STATES = {"paused": "Paused", "done": "Done", "failed": "Failed", "canceled": "Cancelled"}
+
+
+@dataclass
+class JobRow:
+    """Uma linha da tabela: estado do journal (via `sync`) mais o último evento do job."""
+
+    job_id: int
+    url: str = ""
+    state: str = "queued"
+    priority: int = 0
+    finished: int = 0
+    total: int = 0
+    phase: str = "Queued"
+    detail: Optional[str] = None
+    percent: Optional[float] = None
+    speed: Optional[float] = None
+    eta: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        status = _FINAL_STATES.get(self.state, self.phase)
+        return f"{status} | {self.detail}" if self.detail and status == self.phase else status
+
+    def values(self) -> tuple[str, ...]:
+        live = self.phase == DOWNLOADING and self.state not in _FINAL_STATES
+        return (
+            f"#{self.job_id}",
+            self.url,
+            self.status,
+            f"{self.finished}/{self.total}" if self.total else "—",
+            f"{self.percent:.1f}%" if self.percent is not None else "",
+            f"{format_bytes(self.speed)}/s" if live and self.speed else "",
+            formatSeconds(self.eta) if live and self.eta is not None else "",
+            str(self.priority),
+        )
+
+
+class JobTable:
+    """Jobs da fila num ttk.Treeview (ou só o modelo, com `tree=None`), redesenhado em lote.
+
+    `apply()` e `sync()` só mudam o modelo e marcam as linhas alteradas; `flush()` (uma vez por
+    ciclo da UI) toca no widget apenas nessas linhas, então centenas de jobs não custam centenas
+    de `tree.item` por evento.
+    """
+
+    COLUMNS = (
+        ("id", "#", 56),
+        ("url", "URL", 280),
+        ("status", "Status", 200),
+        ("items", "Itens", 70),
+        ("progress", "Progresso", 80),
+        ("speed", "Velocidade", 90),
+        ("eta", "ETA", 70),
+        ("priority", "Prioridade", 70),
+    )
+
+    def __init__(self, tree: Any = None):
+        self.tree = tree
+        self.rows: dict[int, JobRow] = {}
+        self._order: list[int] = []
+        self._dirty: set[int] = set()
+        self._removed: set[int] = set()
+        self._reorder = False
+        if tree is not None:
+            tree.configure(columns=[c[0] for c in self.COLUMNS], show="headings", selectmode="extended")
+            for column, title, width in self.COLUMNS:
+                tree.heading(column, text=title)
+                tree.column(column, width=width, stretch=column in ("url", "status"))
+
+    def _row(self, job_id: int) -> JobRow:
+        row = self.rows.get(job_id)
+        if row is None:
+            row = self.rows[job_id] = JobRow(job_id)
+            self._order.append(job_id)
+            self._removed.discard(job_id)
+        return row
+
+    def apply(self, event: ProgressEvent) -> None:
+        if event.job_id is None or event.phase == MESSAGE:
+            return
+        row = self._row(event.job_id)
+        row.phase = event.phase
+        row.detail = event.detail
+        if event.percent is not None:
+            row.percent = event.percent
+        row.speed, row.eta = event.speed, event.eta
+        self._dirty.add(row.job_id)
+
+    def sync(self, jobs: Iterable[Any]) -> None:
+        """Acerta estado, prioridade, contagens e ordem com `JobQueue.jobs()` (já ordenada)."""
+        order = []
+        for job in jobs:
+            row = self._row(job.id)
+            current = (row.url, row.state, row.priority, row.finished, row.total)
+            row.url, row.state, row.priority = job.url, job.state, job.priority
+            row.finished, row.total = job.finished, job.total
+            if current != (row.url, row.state, row.priority, row.finished, row.total):
+                self._dirty.add(job.id)
+            order.append(job.id)
+        for job_id in set(self.rows) - set(order):
+            self.remove(job_id)
+        if order != self._order:
+            self._order = order
+            self._reorder = True
+
+    def remove(self, job_id: int) -> None:
+        if self.rows.pop(job_id, None) is not None:
+            self._order.remove(job_id)
+            self._dirty.discard(job_id)
+            self._removed.add(job_id)
+
+    def row(self, job_id: int) -> Optional[JobRow]:
+        return self.rows.get(job_id)
+
+    def selected(self) -> list[int]:
+        if self.tree is None:
+            return []
+        return [int(iid) for iid in self.tree.selection() if int(iid) in self.rows]
+
+    def flush(self) -> int:
+        """Leva as mudanças pendentes ao Treeview; retorna quantas linhas foram tocadas."""
+        touched = len(self._dirty) + len(self._removed)
+        if self.tree is not None:
+            for job_id in self._removed:
+                if self.tree.exists(str(job_id)):
+                    self.tree.delete(str(job_id))
+            for job_id in self._dirty:
+                iid = str(job_id)
+                if self.tree.exists(iid):
+                    self.tree.item(iid, values=self.rows[job_id].values())
+                else:
+                    self.tree.insert("", "end", iid=iid, values=self.rows[job_id].values())
+                    self._reorder = True
+            if self._reorder:
+                for position, job_id in enumerate(self._order):
+                    self.tree.move(str(job_id), "", position)
+        self._dirty.clear()
+        self._removed.clear()
+        self._reorder = False
+        return touched
+
+
+class JobSync:
+    """Relê `queue.jobs()` no pool de ações (fora da thread do Tk) e aplica na JobTable na volta.
+
+    `request()` roda na thread da GUI; um pedido enquanto a leitura anterior ainda roda não
+    dispara outra, mas garante mais uma ao fim dela (a anterior pode ter lido antes da mudança).
+    """
+
+    KEY = "sync-jobs"
+
+    def __init__(self, table: JobTable, queue: Any, actions: Any):
+        self.table = table
+        self.queue = queue
+        self.actions = actions
+        self._again = False
+
+    def request(self) -> None:
+        if not self.actions.submit(self.KEY, self.queue.jobs, on_done=self._done):
+            self._again = True
+
+    def run(self, key: Any, fn: Callable[..., Any], *args: Any, on_done: Optional[Callable[[Any], None]] = None) -> bool:
+        """Roda uma mudança na fila (pausar, prioridade, limpar...) no mesmo pool e relê os jobs ao fim.
+
+        Com um só worker, a escrita e as leituras do journal saem em ordem. False se `key` ainda roda.
+        """
+
+        def done(result: Any) -> None:
+            if on_done is not None:
+                on_done(result)
+            self.request()
+
+        return self.actions.submit(key, fn, *args, on_done=done)
+
+    def _done(self, result: Any) -> None:
+        if result.ok:
+            self.table.sync(result.value)
+            self.table.flush()
+        if self._again:
+            self._again = False
+            self.request()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Any, Iterable, Optional
+
+from Downloadium.backend.utils import get_app_data_dir
+
+
+LOG_FILE = "downloadium.log"
+
+
+class LogBuffer:
+    """Últimas `max_lines` linhas do log (anel: a mais antiga sai quando uma nova entra).
+
+    Usado só pela thread da GUI, por isso sem lock. `total` conta tudo o que já entrou, inclusive
+    o que saiu do anel, e serve para a visão saber que algo mudou.
+    """
+
+    def __init__(self, max_lines: int = 5000):
+        self.max_lines = max(1, max_lines)
+        self._lines: deque[str] = deque(maxlen=self.max_lines)
+        self.total = 0
+
+    def append(self, line: str) -> None:
+        for part in line.rstrip().splitlines() or [""]:
+            self._lines.append(part)
+            self.total += 1
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def window(self, start: int, count: int) -> list[str]:
+        """Linhas [start, start + count) do anel (índice 0 = a mais antiga ainda guardada)."""
+        start = max(0, min(start, len(self._lines)))
+        stop = min(len(self._lines), start + max(0, count))
+        # Só uma tela de linhas: indexar o deque (a partir da ponta mais próxima) basta.
+        return [self._lines[i] for i in range(start, stop)]
+
+    def clear(self) -> None:
+        self._lines.clear()
+
+
+def open_log_file(
+    path: Optional[str] = None,
+    max_bytes: int = 2 * 1024 * 1024,
+    backups: int = 3,
+) -> logging.Logger:
+    """Logger "downloadium.gui" gravando o log completo em arquivo com rotação.
+
+    Sem `path`, usa <app data>/logs/downloadium.log. Chamadas repetidas reaproveitam o handler.
+    """
+    logger = logging.getLogger("downloadium.gui")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if path is None:
+        path = os.path.join(get_app_data_dir("logs"), LOG_FILE)
+    path = os.path.abspath(path)
+    for handler in logger.handlers:
+        if isinstance(handler, RotatingFileHandler) and handler.baseFilename == path:
+            return logger
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+class VirtualLogView:
+    """Mostra um LogBuffer num widget de texto desenhando só as linhas visíveis.
+
+    O widget (tk.Text ou CTkTextbox) nunca tem mais que uma tela de linhas, então inserir continua
+    barato com horas de log. A barra de rolagem (`scrollbar`, com `.set(first, last)`) e a roda do
+    mouse movem a janela; no fim do log a visão acompanha as linhas novas.
+    """
+
+    def __init__(self, text: Any, buffer: LogBuffer, scrollbar: Any = None, rows: int = 12):
+        self.text = text
+        self.buffer = buffer
+        self.scrollbar = scrollbar
+        self.rows = max(1, rows)
+        self.top = 0
+        self.follow = True
+
+        self._pending = False
+        self._seen = (0, 0)  # (buffer.total, len(buffer)) no último desenho
+        self._line_height = 16
+        try:
+            from tkinter import font as tkfont
+
+            font = text.cget("font")
+            self._line_height = max(1, (font if isinstance(font, tkfont.Font) else tkfont.Font(font=font)).metrics("linespace"))
+        except Exception:
+            pass
+
+        text.bind("<Configure>", self._on_resize, add="+")
+        # add="+": o CTkTextbox recusa binds que substituiriam os dele.
+        text.bind("<MouseWheel>", self._on_wheel, add="+")
+        text.bind("<Button-4>", lambda e: self._scroll_lines(-3), add="+")
+        text.bind("<Button-5>", lambda e: self._scroll_lines(3), add="+")
+        if scrollbar is not None:
+            scrollbar.configure(command=self.yview)
+
+    # -----------------
+    # Janela visível
+    # -----------------
+
+    def _max_top(self) -> int:
+        return max(0, len(self.buffer) - self.rows)
+
+    def _scroll_to(self, top: int) -> str:
+        self.top = max(0, min(top, self._max_top()))
+        self.follow = self.top >= self._max_top()
+        self.refresh()
+        return "break"
+
+    def _scroll_lines(self, delta: int) -> str:
+        return self._scroll_to(self.top + delta)
+
+    def _on_wheel(self, event: Any) -> str:
+        delta = getattr(event, "delta", 0)
+        step = -3 if delta > 0 else 3
+        return self._scroll_lines(step)
+
+    def _on_resize(self, event: Any) -> None:
+        rows = max(1, int(getattr(event, "height", 0) or 0) // self._line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.refresh()
+
+    def yview(self, *args: Any) -> None:
+        """Protocolo do `command` das barras de rolagem do Tk ("moveto"/"scroll")."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(round(float(args[1]) * len(self.buffer)))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self._scroll_lines(amount * self.rows if len(args) > 2 and args[2] == "pages" else amount)
+
+    # -----------------
+    # Desenho
+    # -----------------
+
+    def append(self, line: str) -> None:
+        self.buffer.append(line)
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Agenda um redesenho (vários appends no mesmo ciclo do Tk viram um só)."""
+        if self._pending:
+            return
+        self._pending = True
+        try:
+            self.text.after_idle(self.render)
+        except Exception:
+            self.render()
+
+    def render(self) -> None:
+        self._pending = False
+        if self.follow:
+            self.top = self._max_top()
+        else:
+            # Linhas que saíram do anel desde o último desenho: a janela acompanha o mesmo conteúdo.
+            added = self.buffer.total - self._seen[0]
+            evicted = max(0, added - (len(self.buffer) - self._seen[1]))
+            self.top = max(0, min(self.top - evicted, self._max_top()))
+        self._seen = (self.buffer.total, len(self.buffer))
+        lines = self.buffer.window(self.top, self.rows)
+        try:
+            self.text.delete("1.0", "end")
+            self.text.insert("1.0", "\n".join(lines))
+        except Exception:
+            return
+        if self.scrollbar is not None:
+            total = max(1, len(self.buffer))
+            try:
+                self.scrollbar.set(self.top / total, min(1.0, (self.top + len(lines)) / total))
+            except Exception:
+                pass
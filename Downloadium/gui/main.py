@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
-import threading
+import time
 
 # Permite rodar este arquivo diretamente (python Downloadium/gui/main.py)
 # sem exigir instalação do pacote no ambiente.
@@ -14,64 +14,140 @@ if __package__ is None or __package__ == "":
 
 from Downloadium.backend.downloader import download_thumbnail, download_subtitles
 from Downloadium.backend.download_manager import DownloadManager
+from Downloadium.backend.events import MESSAGE, ProgressCoalescer, ProgressEvent
+from Downloadium.backend.job_queue import JobQueue, QueueRunner
+from Downloadium.gui.actions import ActionResult, ActionRunner
+from Downloadium.gui.job_table import JobSync, JobTable
+
+# Eventos de progresso juntados entre a thread do download e o Tk (no máximo 20 redesenhos/s).
+progress_events = ProgressCoalescer(rate=20.0)
+
+# Todos os vídeos entram numa fila servida por WORKERS threads compartilhadas.
+WORKERS = 3
+queue_warning = ""
+try:
+    jobs = JobQueue()
+except Exception as e:
+    # Sem o journal em disco os downloads não sobrevivem ao fechamento: avisado ao abrir a janela.
+    queue_warning = f"Aviso: fila persistente indisponível ({e}); usando fila em memória."
+    jobs = JobQueue(path=":memory:")
+
+def on_job_finished(job):
+    result = "concluído" if job.state == "done" else f"com falhas ({job.error or 'veja o log'})"
+    progress_events.push(ProgressEvent(MESSAGE, job.id, detail=f"Job #{job.id} {result} ({job.finished}/{job.total})"))
+
+runner = QueueRunner(jobs, DownloadManager, workers=WORKERS, on_event=progress_events.push, on_finished=on_job_finished)
+last_sync = 0.0
+
+def show_progress(event: ProgressEvent):
+    status_var.set(event.status_line() if event.job_id is None else f"#{event.job_id} {event.status_line()}")
+    if event.percent is not None:
+        progress_var.set(event.percent)
+
+def sync_jobs():
+    # A leitura do journal roda no pool de ações; a tabela é atualizada na volta, na thread do Tk.
+    global last_sync
+    last_sync = time.monotonic()
+    job_sync.request()
+
+def poll_progress():
+    for event in progress_events.drain():
+        job_table.apply(event)
+        show_progress(event)
+    # Estados e prioridades vêm do journal uma vez por segundo; no resto, só as linhas com eventos.
+    if time.monotonic() - last_sync >= 1.0:
+        sync_jobs()
+    job_table.flush()
+    app.after(50, poll_progress)
 
 def start_video_download():
-    url = url_entry.get()
+    # Uma ou mais URLs (separadas por espaço): cada uma vira um job na fila.
+    urls = url_entry.get().split()
     quality = quality_var.get()
+    ignore_archive = force_var.get()
 
-    if not url:
+    if not urls:
         messagebox.showerror("Erro", "Por favor, insira a URL do vídeo.")
         return
 
-    progress_var.set(0)
-    status_var.set("Iniciando...")
-
-    def callback(status: str, percent: float | None = None):
-        def update_ui():
-            status_var.set(status)
-            if percent is not None:
-                progress_var.set(percent)
-
-        app.after(0, update_ui)
-
-    def task():
-        manager = DownloadManager(output_path="videos", quality=quality, video_format="mp4")
-
-        try:
-            total = manager.fetch_metadata(url)
-            app.after(0, lambda: status_var.set(f"Video 0 of {total} | Status: Downloading"))
-        except Exception:
-            pass
-
-        message = manager.download(url, callback)
-        app.after(0, lambda: messagebox.showinfo("Resultado", message))
+    for url in urls:
+        jobs.add(url, {"output_path": "videos", "quality": quality, "video_format": "mp4", "ignore_archive": ignore_archive})
+    url_entry.delete(0, "end")
+    status_var.set(f"{len(urls)} download(s) adicionado(s) à fila")
+    sync_jobs()
+
+def for_selected_jobs(action, verb):
+    # A escrita no journal roda no pool da JobSync (fora da thread do Tk), seguida de uma releitura.
+    selected = job_table.selected()
+    if not selected:
+        status_var.set("Selecione um ou mais jobs na tabela.")
+        return
 
-    threading.Thread(target=task, daemon=True).start()
+    def apply():
+        for job_id in selected:
+            action(job_id)
+
+    def done(result: ActionResult):
+        status_var.set(f"{verb}: {', '.join(f'#{job_id}' for job_id in selected)}" if result.ok else f"Erro: {result.error}")
+
+    if not job_sync.run(("jobs", verb), apply, on_done=done):
+        status_var.set(f"{verb}: ação anterior ainda em andamento")
+
+def bump_priority(delta):
+    # A prioridade atual vem da tabela, lida aqui na thread do Tk; o pool só escreve.
+    priorities = {}
+    for job_id in job_table.selected():
+        row = job_table.row(job_id)
+        if row is not None:
+            priorities[job_id] = row.priority + delta
+
+    def action(job_id):
+        if job_id in priorities:
+            jobs.set_priority(job_id, priorities[job_id])
+    for_selected_jobs(action, f"Prioridade {delta:+d}")
+
+def show_running_actions():
+    running = [key[0] for key in actions.pending()]
+    running_var.set(f"Em andamento: {', '.join(running)}" if running else "")
+
+def run_action(label, key, fn, *args):
+    """Roda `fn` no pool de ações (fora da thread do Tk); o resultado volta aqui via `after`."""
+    def on_done(result: ActionResult):
+        message = result.value if result.ok else f"Erro: {result.error}"
+        latency_var.set(f"Última ação: {label} em {result.latency:.1f}s")
+        show_running_actions()
+        messagebox.showinfo("Resultado", f"{message}\n\n({label}: {result.latency:.1f}s)")
+
+    # Clique repetido na mesma ação/URL enquanto ela roda não dispara outro download.
+    if not actions.submit(key, fn, *args, on_done=on_done):
+        latency_var.set(f"{label} já em andamento para esta URL")
+        return
+    show_running_actions()
 
 def start_thumbnail_download():
-    url = url_entry.get()
+    url = url_entry.get().strip()
 
     if not url:
         messagebox.showerror("Erro", "Por favor, insira a URL do vídeo.")
         return
 
-    message = download_thumbnail(url)
-    messagebox.showinfo("Resultado", message)
+    run_action("Thumbnail", ("Thumbnail", url), download_thumbnail, url)
 
 def start_subtitle_download():
-    url = url_entry.get()
+    url = url_entry.get().strip()
     language = language_var.get()
 
     if not url:
         messagebox.showerror("Erro", "Por favor, insira a URL do vídeo.")
         return
 
-    message = download_subtitles(url, language=language)
-    messagebox.showinfo("Resultado", message)
+    run_action("Legendas", ("Legendas", url, language), lambda: download_subtitles(url, language=language))
 
 # Configurar a interface gráfica
 app = tk.Tk()
 app.title("Downloadium")
+# Pool compartilhado para as ações pontuais (thumbnail, legendas); resultados conferidos via `after`.
+actions = ActionRunner(app.after, workers=2)
 
 # Entrada para a URL
 tk.Label(app, text="URL do vídeo:").pack(pady=5)
@@ -84,10 +160,34 @@ quality_var = tk.StringVar(value="best")
 quality_menu = tk.OptionMenu(app, quality_var, "best", "worst", "720p", "480p", "360p")
 quality_menu.pack(pady=5)
 
+# Baixar de novo o que já está no arquivo de downloads (ex.: arquivo apagado do disco)
+force_var = tk.BooleanVar(value=False)
+tk.Checkbutton(app, text="Baixar de novo (ignorar arquivo de downloads)", variable=force_var).pack()
+
 # Botão para baixar vídeo
 download_video_button = tk.Button(app, text="Baixar Vídeo", command=start_video_download)
 download_video_button.pack(pady=10)
 
+# Tabela de downloads (uma linha por job) e ações sobre as linhas selecionadas
+jobs_frame = tk.Frame(app)
+jobs_frame.pack(fill="both", expand=True, padx=10, pady=5)
+jobs_tree = ttk.Treeview(jobs_frame, height=8)
+jobs_tree.pack(side="left", fill="both", expand=True)
+jobs_scroll = ttk.Scrollbar(jobs_frame, orient="vertical", command=jobs_tree.yview)
+jobs_scroll.pack(side="right", fill="y")
+jobs_tree.configure(yscrollcommand=jobs_scroll.set)
+job_table = JobTable(jobs_tree)
+# Pool próprio (não o de `actions`): a leitura periódica não aparece como ação em andamento.
+job_sync = JobSync(job_table, jobs, ActionRunner(app.after, workers=1))
+
+job_actions = tk.Frame(app)
+job_actions.pack(pady=5)
+tk.Button(job_actions, text="Pausar", command=lambda: for_selected_jobs(jobs.pause, "Pausado(s)")).pack(side="left", padx=2)
+tk.Button(job_actions, text="Retomar", command=lambda: for_selected_jobs(jobs.resume, "Retomado(s)")).pack(side="left", padx=2)
+tk.Button(job_actions, text="Cancelar", command=lambda: for_selected_jobs(jobs.cancel, "Cancelado(s)")).pack(side="left", padx=2)
+tk.Button(job_actions, text="Prioridade +", command=lambda: bump_priority(1)).pack(side="left", padx=2)
+tk.Button(job_actions, text="Prioridade −", command=lambda: bump_priority(-1)).pack(side="left", padx=2)
+
 # Progresso e status
 status_var = tk.StringVar(value="Pronto")
 progress_var = tk.DoubleVar(value=0.0)
@@ -108,4 +208,14 @@ language_entry.pack(pady=5)
 download_subtitles_button = tk.Button(app, text="Baixar Legendas", command=start_subtitle_download)
 download_subtitles_button.pack(pady=10)
 
+# Ações em andamento e latência da última
+running_var = tk.StringVar(value="")
+latency_var = tk.StringVar(value="")
+tk.Label(app, textvariable=running_var).pack()
+tk.Label(app, textvariable=latency_var).pack(pady=(0, 10))
+
+if queue_warning:
+    app.after(0, lambda: messagebox.showwarning("Fila de downloads", queue_warning))
+runner.start()
+app.after(50, poll_progress)
 app.mainloop()
\ No newline at end of file
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Union
+
+from PIL import Image
+
+from Downloadium.backend.thumbnails import best_thumbnail, get_default_fetcher
+from Downloadium.backend.utils import get_app_data_dir, sanitize_filename
+
+
+# Miniatura maior que isso não é uma miniatura: aborta em vez de decodificar.
+_MAX_DOWNLOAD_BYTES = 8 * 1024 * 1024
+
+Thumbnails = Union[str, list, None]
+PreviewCallback = Callable[[Optional[Image.Image]], None]
+
+
+def pick_variant(thumbnails: Thumbnails, size: tuple[int, int]) -> Optional[str]:
+    """Menor variante que ainda cobre `size`; sem dimensões conhecidas, a melhor disponível."""
+    if isinstance(thumbnails, str) or not thumbnails:
+        return thumbnails or None
+    width, height = size
+    sized = [t for t in thumbnails if t.get("url") and t.get("width") and t.get("height")]
+    covering = [t for t in sized if t["width"] >= width and t["height"] >= height]
+    if covering:
+        return min(covering, key=lambda t: t["width"] * t["height"])["url"]
+    if sized:
+        return max(sized, key=lambda t: t["width"] * t["height"])["url"]
+    return best_thumbnail({"thumbnails": thumbnails})
+
+
+def _image_bytes(image: Image.Image) -> int:
+    return image.width * image.height * len(image.getbands())
+
+
+class ThumbnailPreviewService:
+    """Prévias de miniatura para a GUI: baixa a menor variante útil e reduz fora da thread do Tk.
+
+    Camadas: LRU em memória limitado por bytes (imagens já reduzidas) -> JPEG em disco por ID do
+    vídeo -> rede. `request()` chama o callback na hora quando a prévia está na memória e, caso
+    contrário, numa thread do pool; quem usa Tk deve repassar a imagem para a thread da GUI
+    (fila + `after`) e só lá criar o PhotoImage/CTkImage.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int] = (160, 90),
+        max_bytes: int = 32 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: int = 64 * 1024 * 1024,
+        workers: int = 2,
+        session: Any = None,
+        timeout: tuple[float, float] = (5.0, 15.0),
+    ):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.timeout = timeout
+        self._session = session
+        # None = só memória (a instância padrão usa <app data>/thumbnails).
+        self.cache_dir = cache_dir
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, Image.Image] = OrderedDict()
+        self._memory_bytes = 0
+        self._pending: dict[str, list[PreviewCallback]] = {}
+        self._writes = 0
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="thumb-preview")
+
+    # -----------------
+    # Camada em memória
+    # -----------------
+
+    def _key(self, video_id: str) -> str:
+        return f"{sanitize_filename(str(video_id))}_{self.size[0]}x{self.size[1]}"
+
+    def get(self, video_id: str) -> Optional[Image.Image]:
+        """Prévia já em memória (sem I/O), ou None."""
+        key = self._key(video_id)
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+            return image
+
+    def _remember(self, key: str, image: Image.Image) -> None:
+        size = _image_bytes(image)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= _image_bytes(previous)
+            self._memory[key] = image
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= _image_bytes(evicted)
+
+    @property
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return self._memory_bytes
+
+    # -----------------
+    # Camada em disco
+    # -----------------
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.jpg") if self.cache_dir else None
+
+    def _load_disk(self, key: str) -> Optional[Image.Image]:
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as image:
+                image.load()
+                os.utime(path)  # idade = último uso, para a poda
+                return image.copy()
+        except OSError:
+            return None
+
+    def _store_disk(self, key: str, image: Image.Image) -> None:
+        path = self._disk_path(key)
+        if not path:
+            return
+        tmp = f"{path}.tmp"
+        try:
+            image.save(tmp, "JPEG", quality=85)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % 50 == 0
+        if prune:
+            self.prune_disk()
+
+    def prune_disk(self) -> None:
+        """Remove as prévias em disco menos usadas até caber em `max_disk_bytes`."""
+        if not self.cache_dir:
+            return
+        try:
+            files = [e for e in os.scandir(self.cache_dir) if e.is_file() and e.name.endswith(".jpg")]
+            stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in files), reverse=True)
+        except OSError:
+            return
+        total = 0
+        for _, size, path in stats:
+            total += size
+            if total > self.max_disk_bytes:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # -----------------
+    # Rede + redução
+    # -----------------
+
+    def _download(self, url: str) -> bytes:
+        session = self._session or get_default_fetcher().session
+        with session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            buffer = io.BytesIO()
+            for chunk in response.iter_content(64 * 1024):
+                buffer.write(chunk)
+                if buffer.tell() > _MAX_DOWNLOAD_BYTES:
+                    raise ValueError(f"thumbnail too large: {url}")
+        return buffer.getvalue()
+
+    def _downscale(self, data: bytes) -> Image.Image:
+        with Image.open(io.BytesIO(data)) as image:
+            # JPEG: decodifica já reduzido (DCT scaling), bem mais barato que decodificar tudo.
+            image.draft("RGB", self.size)
+            preview = image.convert("RGB")
+        preview.thumbnail(self.size, Image.Resampling.LANCZOS)
+        return preview
+
+    def _resolve(self, key: str, thumbnails: Thumbnails) -> Optional[Image.Image]:
+        image = self._load_disk(key)
+        if image is None:
+            url = pick_variant(thumbnails, self.size)
+            if not url:
+                return None
+            image = self._downscale(self._download(url))
+            self._store_disk(key, image)
+        self._remember(key, image)
+        return image
+
+    def request(self, video_id: str, thumbnails: Thumbnails, callback: PreviewCallback) -> Optional[Future]:
+        """Pede a prévia de `video_id`; `thumbnails` é a lista do info dict (ou só a URL).
+
+        Pedidos repetidos do mesmo vídeo enquanto o primeiro está em andamento são agrupados.
+        O callback recebe None se não houver miniatura ou o download falhar.
+        """
+        cached = self.get(video_id)
+        if cached is not None:
+            callback(cached)
+            return None
+
+        key = self._key(video_id)
+        with self._lock:
+            waiting = self._pending.get(key)
+            if waiting is not None:
+                waiting.append(callback)
+                return None
+            self._pending[key] = [callback]
+
+        def work() -> None:
+            try:
+                image = self._resolve(key, thumbnails)
+            except Exception:
+                image = None
+            with self._lock:
+                callbacks = self._pending.pop(key, [])
+            for cb in callbacks:
+                try:
+                    cb(image)
+                except Exception:
+                    pass
+
+        return self._pool.submit(work)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_default_service: Optional[ThumbnailPreviewService] = None
+_default_lock = threading.Lock()
+
+
+def get_default_preview_service() -> ThumbnailPreviewService:
+    """Instância compartilhada, com as prévias em disco em <app data>/thumbnails."""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            try:
+                cache_dir: Optional[str] = get_app_data_dir("thumbnails")
+            except OSError:
+                cache_dir = None
+            _default_service = ThumbnailPreviewService(cache_dir=cache_dir)
+        return _default_service
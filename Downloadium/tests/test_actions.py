@@ -0,0 +1,78 @@
+import threading
+import unittest
+
+from Downloadium.gui.actions import ActionRunner
+
+
+class FakeScheduler:
+    """Substitui o `after` do Tk: guarda os callbacks para rodá-los "na thread da GUI" do teste."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ms, fn):
+        self.calls.append(fn)
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for fn in calls:
+            fn()
+
+
+class ActionRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self.schedule = FakeScheduler()
+        self.runner = ActionRunner(self.schedule, workers=2)
+
+    def tearDown(self):
+        self.runner.close()
+
+    def test_result_delivered_on_poll_and_duplicates_ignored(self):
+        release = threading.Event()
+        results = []
+        calls = []
+
+        def work(url):
+            calls.append(url)
+            release.wait(5)
+            return f"ok {url}"
+
+        self.assertTrue(self.runner.submit(("thumb", "u1"), work, "u1", on_done=results.append))
+        self.assertFalse(self.runner.submit(("thumb", "u1"), work, "u1", on_done=results.append))
+        self.assertTrue(self.runner.running(("thumb", "u1")))
+
+        # Ainda rodando: o poll só se reagenda, sem entregar nada.
+        self.schedule.run()
+        self.assertEqual(results, [])
+        self.assertEqual(len(self.schedule.calls), 1)
+
+        release.set()
+        while not results:
+            self.schedule.run()
+        self.assertEqual(calls, ["u1"])
+        self.assertEqual(results[0].value, "ok u1")
+        self.assertTrue(results[0].ok)
+        self.assertGreaterEqual(results[0].latency, 0.0)
+        self.assertEqual(self.schedule.calls, [])
+
+        # Terminada, a mesma ação pode ser disparada de novo.
+        self.assertTrue(self.runner.submit(("thumb", "u1"), work, "u1", on_done=results.append))
+        while len(results) < 2:
+            self.schedule.run()
+
+    def test_errors_become_results(self):
+        results = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        self.runner.submit("subs", fail, on_done=results.append)
+        while not results:
+            self.schedule.run()
+        self.assertFalse(results[0].ok)
+        self.assertIsInstance(results[0].error, RuntimeError)
+        self.assertIsNone(results[0].value)
+
+
+if __name__ == "__main__":
+    unittest.main()
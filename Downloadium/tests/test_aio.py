@@ -0,0 +1,167 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from yt_dlp.utils import DownloadCancelled
+
+from Downloadium.backend.aio import AsyncDownload, ProgressUpdate, download_async
+from Downloadium.backend.archive import DownloadArchive
+from Downloadium.backend.download_manager import DownloadManager
+from Downloadium.backend.events import DONE, DOWNLOADING, ProgressEvent
+from Downloadium.backend.metadata_cache import MetadataCache
+from Downloadium.backend.rate_limit import RateController
+from Downloadium.backend.throughput import ThroughputHistory
+
+
+class _FakeManager:
+    """Imita DownloadManager.download: bloqueante, com progresso e cancel_event."""
+
+    def __init__(self, steps=5, delay=0.01):
+        self.steps = steps
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+
+    def download(self, url, callback=None, session=None, cancel_event=None, on_event=None):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            for i in range(1, self.steps + 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise DownloadCancelled()
+                time.sleep(self.delay)
+                on_event(ProgressEvent(DOWNLOADING, index=1, count=1, percent=i * 100 / self.steps))
+            return f"done {url}"
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class TestAsyncDownload(unittest.TestCase):
+
+    def test_progress_iterator_and_result(self):
+        legacy = []
+        typed = []
+
+        async def main():
+            job = AsyncDownload(
+                _FakeManager(), "https://youtu.be/a",
+                callback=lambda status, percent: legacy.append((status, percent)), on_event=typed.append,
+            )
+            updates = [u async for u in job]
+            return updates, await job
+
+        updates, result = asyncio.run(main())
+        self.assertEqual(result, "done https://youtu.be/a")
+        self.assertIsInstance(updates[-1], ProgressEvent)
+        self.assertEqual((updates[-1].phase, updates[-1].percent), (DOWNLOADING, 100.0))
+        self.assertEqual(typed, updates)
+        self.assertEqual(legacy[-1], ("Video 1 of 1 | Status: Downloading | 100.0%", 100.0))
+        self.assertEqual(ProgressUpdate.from_event(updates[-1]), legacy[-1])
+
+    def test_semaphore_bounds_concurrency(self):
+        manager = _FakeManager(steps=3)
+
+        async def main():
+            semaphore = asyncio.Semaphore(2)
+            return await asyncio.gather(*(download_async(manager, f"u{i}", semaphore=semaphore) for i in range(8)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(results), 8)
+        self.assertLessEqual(manager.peak, 2)
+
+    def test_task_cancel_stops_worker(self):
+        manager = _FakeManager(steps=1000, delay=0.005)
+
+        async def main():
+            task = asyncio.ensure_future(download_async(manager, "u"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        self.assertEqual(manager.running, 0)
+
+    def test_slow_consumer_keeps_phase_changes(self):
+        class Burst(_FakeManager):
+            def download(self, url, callback=None, session=None, cancel_event=None, on_event=None):
+                for i in range(50):
+                    on_event(ProgressEvent(DOWNLOADING, index=1, count=1, percent=i))
+                on_event(ProgressEvent(DONE, percent=100.0))
+                return "ok"
+
+        async def main():
+            job = AsyncDownload(Burst(), "u", max_pending=4)
+            await job
+            return [e async for e in job]
+
+        events = asyncio.run(main())
+        self.assertEqual(sum(e.phase == DOWNLOADING for e in events), 4)
+        self.assertEqual(events[-1].phase, DONE)
+
+
+class TestSharedManager(unittest.TestCase):
+    """Vários download_async na MESMA instância de DownloadManager (sem estado por chamada na instância)."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.archive = DownloadArchive(path=":memory:")
+        self.cache = MetadataCache(path=":memory:")
+        self.manager = DownloadManager(
+            output_path=self.dir.name, archive=self.archive, metadata_cache=self.cache,
+            rate_controller=RateController(initial_delay=0.0), throughput_history=ThroughputHistory(),
+        )
+
+    def tearDown(self):
+        self.archive.close()
+        self.cache.close()
+        self.dir.cleanup()
+
+    @patch("Downloadium.backend.download_manager.ffmpeg_available", return_value=False)
+    @patch("Downloadium.backend.download_manager.DownloadiumYDL")
+    def test_concurrent_downloads_keep_their_own_progress_and_stats(self, mock_ydl, _ffmpeg):
+        both_running = threading.Barrier(2, timeout=5)
+
+        def make_ydl(opts):
+            ydl = MagicMock(params=opts, format_selector=None)
+            ydl.__enter__.return_value = ydl
+            return ydl
+
+        def session(video_id, tracks):
+            def process(ydl):
+                ydl.params["subtitle_stats"].record_subtitle_plan(tracks)
+                for step in range(3):
+                    if step == 1:
+                        both_running.wait()
+                    for hook in ydl.params["progress_hooks"]:
+                        hook({"status": "downloading", "downloaded_bytes": step, "info_dict": {"id": video_id}})
+
+            return MagicMock(is_playlist=False, entry_count=1, info={"id": video_id}, process=MagicMock(side_effect=process))
+
+        mock_ydl.side_effect = make_ydl
+        events = {"a": [], "b": []}
+
+        async def main():
+            await asyncio.gather(*(
+                self.manager.download_async(f"https://youtu.be/{v}", session=session(v, tracks), on_event=events[v].append)
+                for v, tracks in (("a", 1), ("b", 2))
+            ))
+
+        asyncio.run(main())
+        for v in ("a", "b"):
+            progress = [e for e in events[v] if e.phase == DOWNLOADING and e.downloaded_bytes is not None]
+            self.assertEqual({(e.index, e.count) for e in progress}, {(1, 1)})
+            self.assertEqual(events[v][-1].phase, DONE)
+        # Cada chamada junta os contadores no seu próprio JobStats.
+        tracks = sorted(call.args[0]["subtitle_stats"].subtitle_tracks for call in mock_ydl.call_args_list)
+        self.assertEqual(tracks, [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+from Downloadium.backend.archive import BloomFilter, DownloadArchive, archive_id
+from Downloadium.backend.download_manager import DownloadManager
+from Downloadium.backend.metadata_cache import MetadataCache
+from Downloadium.backend.rate_limit import RateController
+from Downloadium.backend.throughput import ThroughputHistory
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+class TestDownloadArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.archive = DownloadArchive(path=":memory:", capacity=8)
+
+    def tearDown(self):
+        self.archive.close()
+
+    def test_archive_id_from_flat_entry_and_url(self):
+        self.assertEqual(archive_id({"ie_key": "Youtube", "id": "dQw4w9WgXcQ"}), "youtube dQw4w9WgXcQ")
+        self.assertEqual(archive_id({"url": "https://youtu.be/dQw4w9WgXcQ"}), "youtube dQw4w9WgXcQ")
+        self.assertIsNone(archive_id({"title": "sem id"}))
+
+    def test_membership_and_growth(self):
+        self.assertFalse(self.archive)  # vazio: o yt-dlp nem consulta o arquivo
+        for i in range(20):
+            self.archive.add(f"youtube v{i}")
+        self.archive.add("youtube v0")
+
+        self.assertEqual(len(self.archive), 20)
+        self.assertGreaterEqual(self.archive._bloom.capacity, 20)
+        self.assertTrue(all(f"youtube v{i}" in self.archive for i in range(20)))
+        self.assertNotIn("youtube v20", self.archive)
+
+        self.archive.add("youtube dQw4w9WgXcQ")
+        self.assertTrue(self.archive.contains_entry({"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}))
+
+    def test_bloom_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        keys = [f"vimeo {i}" for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f"vimeo x{i}" in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_import_ytdlp_archive_file(self):
+        fd, path = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("youtube a\nyoutube b\n\nyoutube a\n")
+        try:
+            self.assertEqual(self.archive.import_file(path), 2)
+            self.assertIn("youtube b", self.archive)
+        finally:
+            os.remove(path)
+
+    def test_ignore_archive_downloads_again(self):
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        self.archive.add("youtube dQw4w9WgXcQ")
+        cache = MetadataCache(path=":memory:")
+        self.addCleanup(cache.close)
+        # Nada de singletons: o teste não escreve na pasta de dados do usuário.
+        manager = DownloadManager(
+            output_path=tempfile.gettempdir(), archive=self.archive, metadata_cache=cache,
+            rate_controller=RateController(), throughput_history=ThroughputHistory(),
+        )
+        self.assertIn("already downloaded", manager.download(url))
+
+        info = {"extractor_key": "Youtube", "id": "dQw4w9WgXcQ"}
+        with DownloadiumYDL({"download_archive": self.archive, "quiet": True}) as ydl:
+            self.assertTrue(ydl.in_download_archive(info))
+        with DownloadiumYDL({"download_archive": self.archive, "ignore_archive": True, "quiet": True}) as ydl:
+            self.assertFalse(ydl.in_download_archive(info))
+            # Continua registrando o que for baixado.
+            ydl.record_download_archive({"extractor_key": "Youtube", "id": "novo"})
+        self.assertIn("youtube novo", self.archive)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import io
+import unittest
+
+from yt_dlp.networking import Response
+from yt_dlp.networking.exceptions import HTTPError, TransportError
+from yt_dlp.utils import DownloadError, GeoRestrictedError
+
+from Downloadium.backend.errors import (
+    CAUSE_FORMAT,
+    CAUSE_GEO,
+    CAUSE_NETWORK,
+    CAUSE_OTHER,
+    CAUSE_RATE_LIMIT,
+    CAUSE_REMOVED,
+    RETRY_POLICIES,
+    classify_error,
+    summarize_causes,
+)
+
+
+class TestClassifyError(unittest.TestCase):
+
+    def test_messages(self):
+        self.assertEqual(classify_error(DownloadError("ERROR: [youtube] x: Requested format is not available")), CAUSE_FORMAT)
+        self.assertEqual(classify_error(DownloadError("ERROR: [youtube] x: Video unavailable. This video has been removed by the uploader")), CAUSE_REMOVED)
+        self.assertEqual(classify_error(DownloadError("ERROR: The uploader has not made this video available in your country")), CAUSE_GEO)
+        self.assertEqual(classify_error(DownloadError("ERROR: Unable to download webpage: The read operation timed out")), CAUSE_NETWORK)
+        self.assertEqual(classify_error(RuntimeError("boom")), CAUSE_OTHER)
+
+    def test_rate_limit_wins_over_unavailable(self):
+        msg = "ERROR: [youtube] x: Video unavailable. This content isn't available, try again later."
+        self.assertEqual(classify_error(DownloadError(msg)), CAUSE_RATE_LIMIT)
+
+    def test_wrapped_exception_types(self):
+        geo = DownloadError("ERROR: blocked", exc_info=(GeoRestrictedError, GeoRestrictedError("nope"), None))
+        self.assertEqual(classify_error(geo), CAUSE_GEO)
+        net = DownloadError("ERROR: failed", exc_info=(TransportError, TransportError("reset"), None))
+        self.assertEqual(classify_error(net), CAUSE_NETWORK)
+
+    def test_status_numbers_in_titles_are_not_http_statuses(self):
+        reset = DownloadError("ERROR: [youtube] x: Connection reset on 'Top 404 moments' (part 503)")
+        self.assertEqual(classify_error(reset), CAUSE_NETWORK)
+        self.assertEqual(classify_error(DownloadError("ERROR: [youtube] x: Top 410 goals")), CAUSE_OTHER)
+        self.assertEqual(classify_error(DownloadError("ERROR: Unable to download: HTTP Error 404: Not Found")), CAUSE_REMOVED)
+
+        def http(status):
+            return HTTPError(Response(io.BytesIO(b""), "https://example.com", {}, status=status))
+
+        gone = DownloadError("ERROR: failed", exc_info=(HTTPError, http(410), None))
+        self.assertEqual(classify_error(gone), CAUSE_REMOVED)
+        busy = DownloadError("ERROR: failed", exc_info=(HTTPError, http(503), None))
+        self.assertEqual(classify_error(busy), CAUSE_NETWORK)
+
+    def test_policies(self):
+        self.assertTrue(RETRY_POLICIES[CAUSE_FORMAT].fallback_format)
+        self.assertEqual(RETRY_POLICIES[CAUSE_REMOVED].retries, 0)
+        self.assertLessEqual(RETRY_POLICIES[CAUSE_NETWORK].delay(10), RETRY_POLICIES[CAUSE_NETWORK].max_delay)
+        self.assertEqual(summarize_causes(["geo", "removed", "removed"]), "2 removed, 1 geo")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from Downloadium.backend.events import (
+    DONE,
+    DOWNLOADING,
+    ENCODING,
+    ERROR,
+    MESSAGE,
+    QUEUED,
+    ProgressCoalescer,
+    ProgressEvent,
+    download_event,
+    event_sink,
+    legacy_adapter,
+)
+
+
+class TestProgressEvent(unittest.TestCase):
+
+    def test_slotted(self):
+        event = ProgressEvent(DONE)
+        with self.assertRaises(AttributeError):
+            event.extra = 1
+
+    def test_download_event_from_hook(self):
+        event = download_event(
+            {"status": "downloading", "downloaded_bytes": 421, "total_bytes_estimate": 1000, "speed": 2.5e6, "eta": 3},
+            job_id=7, index=3, count=40,
+        )
+        self.assertEqual((event.job_id, event.index, event.count), (7, 3, 40))
+        self.assertEqual((event.downloaded_bytes, event.total_bytes, event.speed, event.eta), (421, 1000, 2.5e6, 3))
+        self.assertAlmostEqual(event.percent, 42.1)
+        self.assertIsNone(download_event({"downloaded_bytes": 10}).percent)
+
+    def test_status_line_matches_legacy_format(self):
+        self.assertEqual(
+            download_event({"downloaded_bytes": 421, "total_bytes": 1000}, index=3, count=40).status_line(),
+            "Video 3 of 40 | Status: Downloading | 42.1%",
+        )
+        self.assertEqual(ProgressEvent(ERROR, detail="HTTP 403").status_line(), "Status: Error | HTTP 403")
+        self.assertEqual(ProgressEvent(MESSAGE, detail="Aviso: sem ffmpeg").status_line(), "Aviso: sem ffmpeg")
+
+    def test_sink_isolates_consumers(self):
+        lines, events = [], []
+
+        def broken(event):
+            raise RuntimeError("gui closed")
+
+        emit = event_sink(None, broken, events.append, legacy_adapter(lambda s, p: lines.append((s, p))))
+        emit(ProgressEvent(DOWNLOADING, percent=0.0))
+        emit(ProgressEvent(DONE, percent=100.0))
+        self.assertEqual([e.phase for e in events], [DOWNLOADING, DONE])
+        self.assertEqual(lines, [("Status: Downloading | 0.0%", 0.0), ("Status: Done", 100.0)])
+
+
+def _chunk(job_id, downloaded):
+    return download_event({"downloaded_bytes": downloaded, "total_bytes": 1000}, job_id=job_id)
+
+
+class TestProgressCoalescer(unittest.TestCase):
+
+    def test_keeps_latest_progress_per_job_at_the_flush_rate(self):
+        coalescer = ProgressCoalescer(rate=10)
+        for job_id in (1, 2):
+            coalescer.push(ProgressEvent(DOWNLOADING, job_id, percent=0.0))
+        self.assertEqual(len(coalescer.drain(now=100.0)), 2)
+
+        for downloaded in range(1, 500):
+            coalescer.push(_chunk(1, downloaded))
+        coalescer.push(_chunk(2, 7))
+
+        latest = coalescer.drain(now=100.5)
+        self.assertEqual([(e.job_id, e.downloaded_bytes) for e in latest], [(1, 499), (2, 7)])
+        coalescer.push(_chunk(1, 900))
+        self.assertEqual(coalescer.drain(now=100.55), [])  # antes de 1/rate
+        self.assertEqual(coalescer.drain(now=100.7)[0].downloaded_bytes, 900)
+
+    def test_transitions_and_errors_are_forwarded_immediately_in_order(self):
+        coalescer = ProgressCoalescer(rate=1)
+        coalescer.push(ProgressEvent(DOWNLOADING, 1))
+        coalescer.drain(now=10.0)
+        coalescer.push(_chunk(1, 100))
+        coalescer.push(ProgressEvent(ENCODING, 1, percent=100.0))
+        coalescer.push(ProgressEvent(ERROR, 2, detail="HTTP 403"))
+
+        events = coalescer.drain(now=10.1)
+        self.assertEqual([e.phase for e in events], [ENCODING, ERROR])  # o bloco antigo ficou obsoleto
+
+    def test_bounded_queue_drops_superseded_events_first(self):
+        coalescer = ProgressCoalescer(max_pending=3)
+        coalescer.push(ProgressEvent(ERROR, 1, detail="first try"))
+        coalescer.push(ProgressEvent(QUEUED, 2))
+        coalescer.push(ProgressEvent(ENCODING, 1))
+        coalescer.push(ProgressEvent(DONE, 2))
+
+        events = coalescer.drain()
+        self.assertEqual([(e.job_id, e.phase) for e in events], [(1, ERROR), (1, ENCODING), (2, DONE)])
+        self.assertEqual(coalescer.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
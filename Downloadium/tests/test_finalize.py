@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from yt_dlp.postprocessor.ffmpeg import FFmpegPostProcessorError
+
+from Downloadium.backend import finalize
+from Downloadium.backend.finalize import FinalizePP, probe_ffmpeg
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+class TestFinalizePP(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.video = self._touch("video.mp4", b"video")
+        self.ydl = DownloadiumYDL({"quiet": True})
+        self.pp = FinalizePP(self.ydl)
+
+    def tearDown(self):
+        self.ydl.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _touch(self, name, data=b""):
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def _info(self, **extra):
+        info = {
+            "id": "x", "title": "Title", "ext": "mp4", "filepath": self.video,
+            "requested_formats": [{"vcodec": "avc1", "acodec": "none"}, {"vcodec": "none", "acodec": "mp4a"}],
+        }
+        info.update(extra)
+        return info
+
+    def test_plan_muxes_everything_in_one_command(self):
+        sub = self._touch("video.en.vtt")
+        cover = self._touch("video.jpg")
+        info = self._info(
+            chapters=[{"start_time": 0, "end_time": 5, "title": "Intro"}],
+            requested_subtitles={"en": {"ext": "vtt", "filepath": sub}, "xx": {"ext": "json", "filepath": sub}},
+            thumbnails=[{"url": "a"}, {"url": "b", "filepath": cover}],
+        )
+        plan = self.pp.plan(info)
+
+        meta = os.path.join(self.dir, "video.meta")
+        self.assertEqual(plan.inputs, [self.video, meta, sub, cover])
+        self.assertEqual(plan.embedded, ["chapters", "metadata", "subtitles", "thumbnail"])
+        self.assertEqual(set(plan.files_to_delete), {meta, sub, cover})
+        opts = " ".join(plan.options)
+        self.assertIn("-map_metadata 1", opts)
+        self.assertIn("-map 2:0 -metadata:s:s:0 language=eng", opts)
+        # 2 streams do vídeo + 1 legenda: a capa é o stream 3.
+        self.assertIn("-map 3 -disposition:3 attached_pic", opts)
+        self.assertIn("-metadata title=Title", opts)
+
+    def test_only_automatic_captions_are_deduplicated(self):
+        manual = self._touch("video.en.ttml")
+        auto = self._touch("video.pt.json3")
+        info = self._info(
+            subtitles={"en": [{"ext": "ttml", "url": "http://s/en.ttml"}]},
+            automatic_captions={"pt": [{"ext": "json3", "url": "http://s/pt.json3"}]},
+            requested_subtitles={
+                "en": {"ext": "ttml", "url": "http://s/en.ttml", "filepath": manual},
+                "pt": {"ext": "json3", "url": "http://s/pt.json3", "filepath": auto},
+            },
+        )
+        with patch("Downloadium.backend.finalize.convert_subtitle") as convert:
+            self.pp._subtitle_inputs(info)
+        dedupe = {call.args[0]: call.kwargs["dedupe"] for call in convert.call_args_list}
+        self.assertEqual(dedupe, {manual: False, auto: True})
+
+    def test_run_replaces_file_atomically(self):
+        def fake_ffmpeg(inputs, out_path, opts):
+            self.assertEqual(os.path.dirname(out_path), self.dir)
+            with open(out_path, "wb") as f:
+                f.write(b"finalized")
+
+        with patch.object(FinalizePP, "run_ffmpeg_multiple_files", side_effect=fake_ffmpeg) as run:
+            self.pp.run(self._info())
+        run.assert_called_once()
+        with open(self.video, "rb") as f:
+            self.assertEqual(f.read(), b"finalized")
+        self.assertEqual(os.listdir(self.dir), ["video.mp4"])
+
+    def test_run_failure_keeps_original_and_removes_temp(self):
+        def failing_ffmpeg(inputs, out_path, opts):
+            with open(out_path, "wb") as f:
+                f.write(b"partial")
+            raise FFmpegPostProcessorError("boom")
+
+        with patch.object(FinalizePP, "run_ffmpeg_multiple_files", side_effect=failing_ffmpeg):
+            with self.assertRaises(FFmpegPostProcessorError):
+                self.pp.run(self._info())
+        with open(self.video, "rb") as f:
+            self.assertEqual(f.read(), b"video")
+        self.assertEqual(os.listdir(self.dir), ["video.mp4"])
+
+
+class TestProbeFFmpeg(unittest.TestCase):
+
+    def tearDown(self):
+        finalize._capabilities = None
+
+    def test_probe_is_cached_until_refresh(self):
+        with patch("Downloadium.backend.finalize.shutil.which", return_value=None) as which:
+            self.assertFalse(probe_ffmpeg(refresh=True).available)
+            probe_ffmpeg()
+            probe_ffmpeg()
+            self.assertEqual(which.call_count, 2)  # ffmpeg + ffprobe, uma única vez
+            probe_ffmpeg(refresh=True)
+            self.assertEqual(which.call_count, 4)
+
+    def test_finalize_param_registers_single_postprocessor(self):
+        ydl = DownloadiumYDL({"quiet": True, "finalize": True})
+        self.assertEqual([type(pp) for pp in ydl._pps["post_process"]], [FinalizePP])
+        ydl.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+from Downloadium.backend.formats import (
+    CostModel,
+    DeadlineBudget,
+    FormatIndex,
+    IndexedFormatSelector,
+    codec_family,
+    height_from_label,
+)
+from Downloadium.backend.throughput import FRAGMENTED, PROGRESSIVE, ThroughputHistory
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+FORMATS = [
+    {"format_id": "sb0", "ext": "mhtml", "vcodec": "none", "acodec": "none", "format_note": "storyboard"},
+    {"format_id": "18", "ext": "mp4", "vcodec": "avc1.42001E", "acodec": "mp4a.40.2", "height": 360, "tbr": 500, "format_note": "360p"},
+    {"format_id": "140", "ext": "m4a", "vcodec": "none", "acodec": "mp4a.40.2", "tbr": 129, "filesize": 3_000_000, "format_note": "medium"},
+    {"format_id": "251", "ext": "webm", "vcodec": "none", "acodec": "opus", "tbr": 135, "filesize": 3_200_000, "format_note": "medium"},
+    {"format_id": "136", "ext": "mp4", "vcodec": "avc1.4d401f", "acodec": "none", "height": 720, "tbr": 1500, "filesize": 40_000_000, "format_note": "720p"},
+    {"format_id": "247", "ext": "webm", "vcodec": "vp9", "acodec": "none", "height": 720, "tbr": 1600, "filesize": 35_000_000, "format_note": "720p"},
+    {"format_id": "299", "ext": "mp4", "vcodec": "avc1.64002a", "acodec": "none", "height": 1080, "fps": 60, "tbr": 4000, "format_note": "1080p60"},
+]
+
+
+class TestFormatIndex(unittest.TestCase):
+
+    def test_labels_heights_and_parsing(self):
+        index = FormatIndex(FORMATS, duration=100)
+        self.assertEqual(index.heights, [1080, 720, 360])
+        self.assertEqual(index.resolution_labels(), ["Melhor", "1080p60", "720p", "360p"])
+        self.assertEqual(height_from_label("1080p60"), 1080)
+        self.assertIsNone(height_from_label("Melhor"))
+        self.assertEqual(codec_family("vp09.00.40.08"), "vp9")
+
+    def test_choose_prefers_container_compatible_codecs(self):
+        index = FormatIndex(FORMATS, duration=100)
+        self.assertEqual(index.choose(720, "mp4").format_ids, ("136", "140"))
+        self.assertEqual(index.choose(720, "webm").format_ids, ("247", "251"))
+        # Sem 480p: desce para a maior altura abaixo do pedido.
+        self.assertEqual(index.choose(480, "mp4").format_ids, ("18",))
+        self.assertEqual(index.estimate_size(720, "mp4"), 43_000_000)
+        # Sem filesize: tbr (kbit/s) x duração.
+        self.assertEqual(index.estimate_size(None, "mp4"), 4000 * 125 * 100 + 3_000_000)
+
+    def test_selector_has_exact_ids_first_and_generic_fallback(self):
+        spec = FormatIndex(FORMATS).selector(720, "mp4")
+        self.assertTrue(spec.startswith("136+140/"))
+        self.assertIn("bestvideo[height<=720]", spec)
+        self.assertEqual(FormatIndex([]).selector(), "bestvideo+bestaudio/best")
+
+    def test_deadline_trades_resolution_for_completion_time(self):
+        index = FormatIndex(FORMATS, duration=100)
+        history = ThroughputHistory()
+        history.record("youtube.com", PROGRESSIVE, 10_000_000, 10)  # 1 MB/s
+        cost = CostModel(history, "youtube.com")
+
+        self.assertEqual(index.choose(None, "mp4", cost).height, 1080)
+        # 1080p (~53 MB) não termina em 45 s a 1 MB/s; 720p (~43 MB) sim.
+        self.assertEqual(index.choose(None, "mp4", cost, deadline=45).format_ids, ("136", "140"))
+        # Nada cabe: fica com a opção mais rápida.
+        self.assertEqual(index.choose(None, "mp4", cost, deadline=1).format_ids, ("18",))
+
+    def test_job_budget_is_split_across_remaining_entries(self):
+        now = [0.0]
+        budget = DeadlineBudget(600, entries=4, clock=lambda: now[0])
+        self.assertEqual(budget.next_deadline(), 150)
+        # O primeiro vídeo levou 300 s: os três restantes dividem os 300 s que sobraram.
+        now[0] = 300.0
+        self.assertEqual(budget.next_deadline(), 100)
+        now[0] = 350.0
+        self.assertEqual(budget.next_deadline(), 125)
+
+        parallel = DeadlineBudget(600, entries=4, parallel=2, clock=lambda: 0.0)
+        self.assertEqual(parallel.next_deadline(), 300)
+
+    def test_throughput_history_ewma_and_fallback_kind(self):
+        history = ThroughputHistory(alpha=0.5)
+        self.assertIsNone(history.record("youtube.com", PROGRESSIVE, 1000, 10))  # amostra pequena demais
+        history.record("youtube.com", PROGRESSIVE, 4_000_000, 2)
+        history.record("youtube.com", PROGRESSIVE, 2_000_000, 2)
+        self.assertEqual(history.rate("youtube.com"), 1_500_000)
+        self.assertEqual(history.rate("youtube.com", FRAGMENTED), 1_500_000)
+        history.progress_hook({
+            "status": "finished", "total_bytes": 3_000_000, "elapsed": 1.0,
+            "info_dict": {"webpage_url": "https://vimeo.com/1", "protocol": "m3u8_native"},
+        })
+        self.assertEqual(history.snapshot()["vimeo.com"], {FRAGMENTED: 3_000_000})
+
+    def test_callable_selector_picks_ids_per_video(self):
+        ydl = DownloadiumYDL({"quiet": True, "format": IndexedFormatSelector(720, "mp4"), "simulate": True})
+        info = {
+            "id": "abc", "title": "t", "extractor": "test", "extractor_key": "Test", "webpage_url": "http://x",
+            "formats": [dict(f, url=f"http://example.com/{f['format_id']}") for f in FORMATS],
+        }
+        result = ydl.process_ie_result(info, download=False)
+        self.assertEqual(result["format_id"], "136+140")
+        ydl.close()
+
+    def test_callable_selector_uses_duration_and_reuses_index(self):
+        ydl = DownloadiumYDL({"quiet": True, "format": IndexedFormatSelector(720, "mp4"), "simulate": True})
+        info = {
+            "id": "abc", "title": "t", "extractor": "test", "extractor_key": "Test", "webpage_url": "http://x",
+            "duration": 100, "formats": [dict(f, url=f"http://example.com/{f['format_id']}") for f in FORMATS],
+        }
+        ydl.process_ie_result(dict(info), download=False)
+        self.assertEqual(ydl.format_selector._indexes["abc"].duration, 100)
+
+        # Índice já montado (ex.: pela sessão) é usado no lugar de um novo.
+        ydl.format_selector.use_index("abc", FormatIndex(FORMATS[:3], duration=100))
+        result = ydl.process_ie_result(dict(info), download=False)
+        self.assertEqual(result["format_id"], "18")
+        ydl.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import random
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from Downloadium.backend.fragments import AdaptiveConcurrency, learned_concurrency
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+SEGMENTS = [bytes([i]) * (2048 + i) for i in range(24)]
+
+
+class _HlsHandler(BaseHTTPRequestHandler):
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        if self.path.endswith(".m3u8"):
+            lines = ["#EXTM3U", "#EXT-X-TARGETDURATION:1", "#EXT-X-MEDIA-SEQUENCE:0"]
+            for i in range(len(SEGMENTS)):
+                lines += ["#EXTINF:1.0,", f"seg{i}.ts"]
+            lines.append("#EXT-X-ENDLIST")
+            self._send(("\n".join(lines) + "\n").encode())
+            return
+
+        index = int(re.search(r"seg(\d+)", self.path).group(1))
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        time.sleep(random.uniform(0.001, 0.02))  # força conclusões fora de ordem
+        with cls.lock:
+            cls.active -= 1
+        self._send(SEGMENTS[index])
+
+    def _send(self, body):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+
+    def test_climbs_while_throughput_improves_and_halves_on_throttle(self):
+        controller = AdaptiveConcurrency(start=2, maximum=4)
+        clock = iter(range(0, 1000))
+        with patch("Downloadium.backend.fragments.time.monotonic", side_effect=lambda: next(clock)):
+            controller._reset_round()
+            for _ in range(2):
+                controller.record(1000)
+            self.assertEqual(controller.limit, 3)
+            for _ in range(3):
+                controller.record(5000)
+            self.assertEqual(controller.limit, 4)
+            for _ in range(4):
+                controller.record(10)  # vazão despencou
+            self.assertEqual(controller.limit, 3)
+        controller.record(0, throttled=True)
+        self.assertEqual(controller.limit, 1)
+
+
+class TestAdaptiveFragmentDownload(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _HlsHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/index.m3u8"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_hls_fragments_are_appended_in_order(self):
+        filename = os.path.join(self.dir, "video.mp4")
+        ydl = DownloadiumYDL({
+            "quiet": True,
+            "noprogress": True,
+            "proxy": "",
+            "adaptive_fragments": True,
+            "max_concurrent_fragments": 4,
+            "fragment_reorder_window": 6,
+        })
+        ok, _ = ydl.dl(filename, {"id": "x", "url": self.url, "ext": "mp4", "protocol": "m3u8_native"})
+
+        self.assertTrue(ok)
+        with open(filename, "rb") as f:
+            self.assertEqual(f.read(), b"".join(SEGMENTS))
+        self.assertLessEqual(_HlsHandler.peak, 4)
+        self.assertGreater(_HlsHandler.peak, 1)
+        self.assertGreaterEqual(learned_concurrency("127.0.0.1", default=0), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,252 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from yt_dlp.utils import DownloadError
+
+from Downloadium.backend.events import CANCELLED, PAUSED
+from Downloadium.backend.job_queue import (
+    ENTRY_DONE,
+    ENTRY_DOWNLOADING,
+    ENTRY_FAILED,
+    ENTRY_PENDING,
+    JOB_CANCELED,
+    JOB_DONE,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JobQueue,
+    QueueRunner,
+    flat_entry,
+)
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = JobQueue(path=":memory:")
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_claims_expansion_then_entries_by_priority(self):
+        low = self.queue.add("https://www.youtube.com/playlist?list=PLlow")
+        high = self.queue.add("https://www.youtube.com/playlist?list=PLhigh", priority=5)
+
+        job, entry = self.queue.claim_next()
+        self.assertEqual((job.id, entry), (high, None))
+        self.queue.set_entries(high, [{"_type": "url", "url": "https://youtu.be/a", "id": "a"}])
+
+        job, entry = self.queue.claim_next()
+        self.assertEqual((job.id, entry.index), (high, 1))
+        self.assertEqual(job.state, JOB_RUNNING)
+
+        job, entry = self.queue.claim_next()
+        self.assertEqual((job.id, entry), (low, None))
+
+    def test_job_done_when_all_entries_done(self):
+        job_id = self.queue.add("https://youtu.be/a")
+        self.queue.claim_next()
+        self.queue.set_entries(job_id, [{"_type": "url", "url": "https://youtu.be/a", "id": "a"}])
+        _job, entry = self.queue.claim_next()
+
+        self.queue.update_entry(job_id, entry.index, ENTRY_DONE, filename="a.mp4")
+
+        job = self.queue.get(job_id)
+        self.assertEqual(job.state, JOB_DONE)
+        self.assertEqual((job.finished, job.total), (1, 1))
+        self.assertIsNone(self.queue.claim_next())
+
+    def test_jobs_counts_come_from_one_grouped_query(self):
+        ids = [self.queue.add(f"https://www.youtube.com/playlist?list=PL{i}") for i in range(20)]
+        for job_id in ids[:10]:
+            self.queue.set_entries(job_id, [{"_type": "url", "url": f"https://youtu.be/{n}", "id": str(n)} for n in range(3)])
+        self.queue.update_entry(ids[0], 1, ENTRY_DONE)
+        self.queue.pause(ids[1])
+
+        statements = []
+        self.queue._conn.set_trace_callback(statements.append)
+        jobs = {job.id: job for job in self.queue.jobs()}
+        self.queue._conn.set_trace_callback(None)
+
+        self.assertEqual(len(statements), 2)
+        self.assertEqual((jobs[ids[0]].finished, jobs[ids[0]].total), (1, 3))
+        self.assertEqual(jobs[ids[15]].total, 0)
+        paused = self.queue.jobs(states=("paused",))
+        self.assertEqual([(job.id, job.total) for job in paused], [(ids[1], 3)])
+
+    def test_pause_interrupts_and_resume_requeues(self):
+        job_id = self.queue.add("https://youtu.be/a")
+        self.queue.pause(job_id)
+        self.assertTrue(self.queue.is_interrupted(job_id))
+        self.assertIsNone(self.queue.claim_next())
+
+        self.queue.resume(job_id)
+        self.assertFalse(self.queue.is_interrupted(job_id))
+        self.assertEqual(self.queue.get(job_id).state, JOB_QUEUED)
+
+    def test_entry_finished_while_paused_completes_job_on_resume(self):
+        job_id = self.queue.add("https://youtu.be/a")
+        self.queue.claim_next()
+        self.queue.set_entries(job_id, [{"_type": "url", "url": "https://youtu.be/a", "id": "a"}])
+        _job, entry = self.queue.claim_next()
+        self.queue.pause(job_id)
+        self.queue.update_entry(job_id, entry.index, ENTRY_DONE)
+
+        self.queue.resume(job_id)
+        self.assertEqual(self.queue.get(job_id).state, JOB_DONE)
+        self.assertIsNone(self.queue.claim_next())
+
+        # Pausar um job já terminado não o marca como interrompido.
+        self.queue.pause(job_id)
+        self.assertFalse(self.queue.is_interrupted(job_id))
+
+    def test_job_deadline_budget_is_shared_and_anchored_to_start(self):
+        job_id = self.queue.add("https://www.youtube.com/playlist?list=PLabc")
+        self.queue.claim_next()
+        started = self.queue.get(job_id).started_at
+        self.assertIsNotNone(started)
+        self.queue.set_entries(job_id, [{"_type": "url", "url": f"https://youtu.be/{n}", "id": str(n)} for n in range(3)])
+
+        manager = MagicMock()
+        runner = QueueRunner(self.queue, lambda **opts: manager, workers=2)
+        first, _entry = self.queue.claim_next()
+        second, _entry = self.queue.claim_next()
+        self.assertIs(runner._job_budget(first, manager), runner._job_budget(second, manager))
+        manager.deadline_budget.assert_called_once_with(3, started_at=started, parallel=2)
+
+        # Pausar e retomar não reinicia o prazo do job.
+        self.queue.pause(job_id)
+        self.queue.resume(job_id)
+        self.queue.claim_next()
+        self.assertEqual(self.queue.get(job_id).started_at, started)
+
+    @patch("Downloadium.backend.job_queue.ffmpeg_available", return_value=False)
+    @patch("Downloadium.backend.job_queue.DownloadiumYDL")
+    def test_cancel_is_not_requeued_like_pause(self, mock_ydl, _ffmpeg):
+        events = []
+        manager = MagicMock(rate_controller=None)
+        manager.build_ydl_opts.side_effect = lambda hooks, pp_hooks, embed, host=None, budget=None: {"progress_hooks": hooks}
+        runner = QueueRunner(self.queue, lambda **opts: manager, on_event=events.append)
+
+        def start(interrupt):
+            job_id = self.queue.add("https://youtu.be/a")
+            self.queue.claim_next()
+            self.queue.set_entries(job_id, [{"_type": "url", "url": "https://youtu.be/a", "id": "a"}])
+            job, entry = self.queue.claim_next()
+
+            def process(*args, **kwargs):
+                interrupt(job_id)
+                for hook in mock_ydl.call_args[0][0]["progress_hooks"]:
+                    hook({"status": "downloading", "downloaded_bytes": 1})
+
+            mock_ydl.return_value.process_ie_result.side_effect = process
+            runner._download(job, entry)
+            return job_id
+
+        paused = start(self.queue.pause)
+        self.assertEqual(self.queue.entries(paused)[0].state, ENTRY_PENDING)
+        self.assertEqual(events[-1].phase, PAUSED)
+
+        cancelled = start(self.queue.cancel)
+        self.assertEqual(self.queue.entries(cancelled)[0].state, ENTRY_FAILED)
+        self.assertEqual(self.queue.get(cancelled).state, JOB_CANCELED)
+        self.assertEqual(events[-1].phase, CANCELLED)
+        self.queue.resume(paused)
+        job, entry = self.queue.claim_next()
+        self.assertEqual((job.id, entry.index), (paused, 1))
+        self.assertIsNone(self.queue.claim_next())
+
+    def _single_entry(self):
+        job_id = self.queue.add("https://youtu.be/a")
+        self.queue.claim_next()
+        self.queue.set_entries(job_id, [{"_type": "url", "url": "https://youtu.be/a", "id": "a"}])
+        return self.queue.claim_next()
+
+    def _runner(self):
+        manager = MagicMock(rate_controller=None, postprocess_workers=1)
+        manager.build_ydl_opts.side_effect = lambda hooks, pp_hooks, embed, host=None, budget=None: {
+            "format": "best[height<=720]", "progress_hooks": hooks,
+        }
+        return QueueRunner(self.queue, lambda **opts: manager)
+
+    @patch("Downloadium.backend.job_queue.ffmpeg_available", return_value=False)
+    @patch("Downloadium.backend.job_queue.DownloadiumYDL")
+    def test_entry_retries_with_fallback_format(self, mock_ydl, _ffmpeg):
+        formats = []
+
+        def make_ydl(opts):
+            ydl = MagicMock()
+            ydl.take_postprocess_jobs.return_value = []
+
+            def process(*args, **kwargs):
+                formats.append(opts["format"])
+                if opts["format"] == "best[height<=720]":
+                    raise DownloadError("ERROR: [youtube] a: Requested format is not available")
+
+            ydl.process_ie_result.side_effect = process
+            return ydl
+
+        mock_ydl.side_effect = make_ydl
+        job, entry = self._single_entry()
+        self._runner()._download(job, entry)
+
+        self.assertEqual(formats, ["best[height<=720]", "bestvideo+bestaudio/best"])
+        self.assertEqual(self.queue.entries(job.id)[0].state, ENTRY_DONE)
+
+    @patch("Downloadium.backend.job_queue.ffmpeg_available", return_value=True)
+    @patch("Downloadium.backend.job_queue.DownloadiumYDL")
+    def test_postprocessing_error_fails_entry_when_pipeline_finishes(self, mock_ydl, _ffmpeg):
+        merge = Future()
+        ydl = mock_ydl.return_value
+        ydl.take_postprocess_jobs.return_value = [merge]
+        runner = self._runner()
+        job, entry = self._single_entry()
+
+        runner._download(job, entry)
+        self.assertIsNotNone(mock_ydl.call_args[0][0]["postprocess_pipeline"])
+        self.assertEqual(self.queue.entries(job.id)[0].state, ENTRY_DOWNLOADING)
+        ydl.close.assert_not_called()
+
+        merge.set_exception(DownloadError("Postprocessing: Conversion failed!"))
+        failed = self.queue.entries(job.id)[0]
+        self.assertEqual(failed.state, ENTRY_FAILED)
+        self.assertIn("Conversion failed", failed.error)
+        ydl.close.assert_called_once()
+        runner.stop()
+
+    def test_recover_after_crash(self):
+        fd, path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        try:
+            queue = JobQueue(path=path)
+            job_id = queue.add("https://youtu.be/a")
+            queue.claim_next()
+            queue.set_entries(job_id, [{"_type": "url", "url": "https://youtu.be/a", "id": "a"}])
+            _job, entry = queue.claim_next()
+            queue.update_entry(job_id, entry.index, partial_path="a.mp4.part")
+            self.assertEqual(queue.entries(job_id)[0].state, ENTRY_DOWNLOADING)
+            queue.close()  # simula o app sendo encerrado no meio do download
+
+            reopened = JobQueue(path=path)
+            self.assertEqual(reopened.get(job_id).state, JOB_QUEUED)
+            recovered = reopened.entries(job_id)[0]
+            self.assertEqual(recovered.state, ENTRY_PENDING)
+            self.assertEqual(recovered.partial_path, "a.mp4.part")
+            reopened.close()
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    def test_flat_entry_keeps_only_url_fields(self):
+        entry = {"id": "a", "webpage_url": "https://youtu.be/a", "extractor_key": "Youtube", "formats": [{}]}
+        self.assertEqual(
+            flat_entry(entry),
+            {"_type": "url", "url": "https://youtu.be/a", "id": "a", "ie_key": "Youtube"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
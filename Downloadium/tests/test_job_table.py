@@ -0,0 +1,161 @@
+import threading
+import unittest
+
+from Downloadium.backend.events import DONE, DOWNLOADING, ProgressEvent
+from Downloadium.backend.job_queue import JobQueue
+from Downloadium.gui.actions import ActionRunner
+from Downloadium.gui.job_table import JobSync, JobTable
+
+
+class FakeTree:
+    """Só o necessário de ttk.Treeview para a JobTable, contando as chamadas que tocam o widget."""
+
+    def __init__(self):
+        self.items = {}
+        self.order = []
+        self.calls = 0
+        self.selection_ids = ()
+
+    def configure(self, **kwargs):
+        pass
+
+    def heading(self, *args, **kwargs):
+        pass
+
+    def column(self, *args, **kwargs):
+        pass
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def insert(self, parent, index, iid, values):
+        self.calls += 1
+        self.items[iid] = values
+        self.order.append(iid)
+
+    def item(self, iid, values):
+        self.calls += 1
+        self.items[iid] = values
+
+    def delete(self, iid):
+        self.calls += 1
+        del self.items[iid]
+        self.order.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def selection(self):
+        return self.selection_ids
+
+
+class JobTableTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = JobQueue(path=":memory:")
+        self.tree = FakeTree()
+        self.table = JobTable(self.tree)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_flush_touches_only_changed_rows(self):
+        ids = [self.queue.add(f"https://example.com/{i}") for i in range(200)]
+        self.table.sync(self.queue.jobs())
+        self.assertEqual(self.table.flush(), 200)
+        self.tree.calls = 0
+
+        # Muitos eventos do mesmo job entre dois ciclos viram uma única atualização do widget.
+        for pct in range(50):
+            self.table.apply(ProgressEvent(DOWNLOADING, ids[7], 1, 1, percent=float(pct), speed=2048.0, eta=10))
+        self.table.apply(ProgressEvent(DONE, ids[9], 1, 1, percent=100.0))
+        self.assertEqual(self.table.flush(), 2)
+        self.assertEqual(self.tree.calls, 2)
+        self.assertEqual(self.tree.items[str(ids[7])][4], "49.0%")
+        self.assertEqual(self.tree.items[str(ids[9])][2], "Done")
+
+        self.table.sync(self.queue.jobs())
+        self.assertEqual(self.table.flush(), 0)
+
+    def test_sync_follows_priority_state_and_removal(self):
+        first, second, third = (self.queue.add(f"https://example.com/{i}") for i in range(3))
+        self.table.sync(self.queue.jobs())
+        self.table.flush()
+        self.assertEqual(self.tree.order, [str(first), str(second), str(third)])
+
+        self.queue.set_priority(third, 5)
+        self.queue.pause(second)
+        self.queue.remove(first)
+        self.table.sync(self.queue.jobs())
+        self.table.flush()
+        self.assertEqual(self.tree.order, [str(third), str(second)])
+        self.assertEqual(self.tree.items[str(second)][2], "Paused")
+        self.assertEqual(self.tree.items[str(third)][7], "5")
+
+        # Fase de um evento tardio não esconde o estado final do journal.
+        self.table.apply(ProgressEvent(DOWNLOADING, second, 1, 1, percent=10.0, speed=1000.0))
+        self.table.flush()
+        self.assertEqual(self.tree.items[str(second)][2], "Paused")
+        self.assertEqual(self.tree.items[str(second)][5], "")
+
+        self.tree.selection_ids = (str(second),)
+        self.assertEqual(self.table.selected(), [second])
+
+    def test_sync_reads_journal_off_the_gui_thread(self):
+        calls = []
+        schedule = lambda ms, fn: calls.append(fn)  # noqa: E731
+        runner = ActionRunner(schedule, workers=1)
+        first = self.queue.add("https://example.com/a")
+        gui_thread = threading.current_thread()
+        readers = []
+        jobs = self.queue.jobs
+
+        def read_jobs():
+            readers.append(threading.current_thread())
+            return jobs()
+
+        self.queue.jobs = read_jobs
+        sync = JobSync(self.table, self.queue, runner)
+        sync.request()
+        second = self.queue.add("https://example.com/b")
+        sync.request()  # ainda rodando: vira uma releitura ao fim da primeira
+
+        while calls or runner.pending():
+            pending, calls[:] = list(calls), []
+            for fn in pending:
+                fn()
+        runner.close()
+
+        self.assertTrue(readers and all(t is not gui_thread for t in readers))
+        self.assertEqual(self.tree.order, [str(first), str(second)])
+
+    def test_run_writes_off_the_gui_thread_then_resyncs(self):
+        calls = []
+        runner = ActionRunner(lambda ms, fn: calls.append(fn), workers=1)
+        job_id = self.queue.add("https://example.com/a")
+        gui_thread = threading.current_thread()
+        writers, results = [], []
+        pause = self.queue.pause
+
+        def pause_off_gui(i):
+            writers.append(threading.current_thread())
+            pause(i)
+
+        sync = JobSync(self.table, self.queue, runner)
+        self.assertTrue(sync.run("pause", pause_off_gui, job_id, on_done=results.append))
+        self.assertFalse(sync.run("pause", pause_off_gui, job_id))  # clique duplo
+
+        while calls or runner.pending():
+            pending, calls[:] = list(calls), []
+            for fn in pending:
+                fn()
+        runner.close()
+
+        self.assertEqual(len(writers), 1)
+        self.assertIsNot(writers[0], gui_thread)
+        self.assertTrue(results[0].ok)
+        self.assertEqual(self.tree.items[str(job_id)][2], "Paused")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from Downloadium.gui.log_view import LogBuffer, VirtualLogView, open_log_file
+
+
+class FakeText:
+    """Só o necessário de tk.Text para o VirtualLogView (sem display)."""
+
+    def __init__(self):
+        self.content = ""
+        self.inserts = 0
+        self.idle = []
+
+    def cget(self, key):
+        raise KeyError(key)
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def after_idle(self, fn):
+        self.idle.append(fn)
+
+    def run_idle(self):
+        idle, self.idle = self.idle, []
+        for fn in idle:
+            fn()
+
+    def delete(self, start, end):
+        self.content = ""
+
+    def insert(self, index, text):
+        self.content = text
+        self.inserts += 1
+
+
+class FakeScrollbar:
+
+    def configure(self, **kwargs):
+        self.command = kwargs.get("command")
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+class TestLogBuffer(unittest.TestCase):
+
+    def test_ring_keeps_the_newest_lines(self):
+        buffer = LogBuffer(max_lines=3)
+        buffer.extend(f"line {i}" for i in range(10))
+        buffer.append("a\nb")
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.total, 12)
+        self.assertEqual(buffer.window(0, 10), ["line 9", "a", "b"])
+        self.assertEqual(buffer.window(1, 1), ["a"])
+
+
+class TestVirtualLogView(unittest.TestCase):
+
+    def test_renders_only_visible_lines_and_follows_tail(self):
+        text, scrollbar = FakeText(), FakeScrollbar()
+        view = VirtualLogView(text, LogBuffer(1000), scrollbar, rows=4)
+        for i in range(500):
+            view.append(f"event {i}")
+        text.run_idle()
+
+        self.assertEqual(text.inserts, 1)  # 500 appends, um redesenho
+        self.assertEqual(text.content.splitlines(), [f"event {i}" for i in range(496, 500)])
+        self.assertEqual(scrollbar.position, (496 / 500, 1.0))
+
+        scrollbar.command("moveto", "0.0")
+        text.run_idle()
+        self.assertEqual(text.content.splitlines()[0], "event 0")
+        self.assertFalse(view.follow)
+
+        view.append("event 500")  # rolado para cima: a janela não salta para o fim
+        text.run_idle()
+        self.assertEqual(text.content.splitlines()[0], "event 0")
+
+    def test_scrolled_window_tracks_lines_leaving_the_ring(self):
+        text = FakeText()
+        view = VirtualLogView(text, LogBuffer(10), rows=2)
+        for i in range(10):
+            view.append(str(i))
+        view.yview("moveto", "0.5")
+        text.run_idle()
+        self.assertEqual(text.content, "5\n6")
+
+        for i in range(10, 13):
+            view.append(str(i))
+        text.run_idle()
+        self.assertEqual(text.content, "5\n6")
+
+
+class TestLogFile(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        logger = logging.getLogger("downloadium.gui")
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_rotates(self):
+        path = os.path.join(self.dir, "gui.log")
+        logger = open_log_file(path, max_bytes=200, backups=2)
+        self.assertIs(open_log_file(path), logger)
+        self.assertEqual(len(logger.handlers), 1)
+        for i in range(50):
+            logger.info(f"[#1] Video {i} of 50 | Status: Done")
+        self.assertTrue(os.path.exists(path + ".1"))
+        self.assertFalse(os.path.exists(path + ".3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+
+from Downloadium.backend.metadata_cache import MetadataCache, canonical_key, slim_formats
+
+
+class TestMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = MetadataCache(path=":memory:")
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_canonical_key(self):
+        self.assertEqual(
+            canonical_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ"),
+            canonical_key("https://youtu.be/dQw4w9WgXcQ"),
+        )
+        self.assertEqual(
+            canonical_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLx", single_video=True),
+            "youtube:dQw4w9WgXcQ",
+        )
+
+    def test_hit_and_miss_counters(self):
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        self.assertIsNone(self.cache.get("count", url))
+        self.cache.set("count", url, 1)
+        self.assertEqual(self.cache.get("count", "https://youtu.be/dQw4w9WgXcQ"), 1)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_ttl_expiry(self):
+        url = "https://www.youtube.com/playlist?list=PLabc"
+        with patch("Downloadium.backend.metadata_cache.time.time", return_value=1000.0):
+            self.cache.set("count", url, 40, ttl=10)
+        with patch("Downloadium.backend.metadata_cache.time.time", return_value=1005.0):
+            self.assertEqual(self.cache.get("count", url), 40)
+        with patch("Downloadium.backend.metadata_cache.time.time", return_value=1011.0):
+            self.assertIsNone(self.cache.get("count", url))
+
+    def test_lru_eviction(self):
+        cache = MetadataCache(path=":memory:", ttls={"count": 1e10}, max_entries=2)
+        with patch("Downloadium.backend.metadata_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.set("count", "https://vimeo.com/1", 1)
+            cache.set("count", "https://vimeo.com/2", 2)
+            cache.get("count", "https://vimeo.com/1")  # 1 passa a ser o mais recente
+            cache.set("count", "https://vimeo.com/3", 3)
+        self.assertEqual(cache.get("count", "https://vimeo.com/1"), 1)
+        self.assertIsNone(cache.get("count", "https://vimeo.com/2"))
+        cache.close()
+
+    def test_slim_formats(self):
+        formats = [{"format_id": "137", "height": 1080, "url": "https://x", "http_headers": {}, "vcodec": "avc1"}]
+        self.assertEqual(slim_formats(formats), [{"format_id": "137", "height": 1080, "vcodec": "avc1"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadError
+
+from Downloadium.backend.archive import DownloadArchive
+from Downloadium.backend.pipeline import PostProcessPipeline
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+INFO = {"id": "dQw4w9WgXcQ", "extractor_key": "Youtube", "__postprocessors": [object()]}
+
+
+class TestPostProcessPipeline(unittest.TestCase):
+
+    def test_submit_blocks_when_queue_is_full(self):
+        pipeline = PostProcessPipeline(workers=1, max_pending=1)
+        release = threading.Event()
+        pipeline.submit(release.wait)
+        pipeline.submit(release.wait)
+
+        third = threading.Thread(target=pipeline.submit, args=(lambda: None,))
+        third.start()
+        third.join(0.2)
+        self.assertTrue(third.is_alive())  # backpressure: só entra quando o ffmpeg alcançar
+
+        release.set()
+        third.join(2)
+        self.assertFalse(third.is_alive())
+        pipeline.join()
+        self.assertEqual(pipeline.pending, 0)
+        pipeline.close()
+
+    def test_join_returns_errors_once(self):
+        pipeline = PostProcessPipeline()
+
+        def fail():
+            raise ValueError("ffmpeg exited with code 1")
+
+        future = pipeline.submit(fail)
+        ok = pipeline.submit(lambda: "ok")
+        errors = pipeline.join()
+        self.assertEqual([str(e) for e in errors], ["ffmpeg exited with code 1"])
+        self.assertIsInstance(future.exception(), ValueError)
+        self.assertEqual(ok.result(), "ok")
+        self.assertEqual(pipeline.join(), [])  # erro já entregue
+        pipeline.close()
+
+
+class TestDeferredPostProcess(unittest.TestCase):
+
+    def setUp(self):
+        self.archive = DownloadArchive(path=":memory:")
+        self.pipeline = PostProcessPipeline()
+        self.ydl = DownloadiumYDL({
+            "quiet": True,
+            "download_archive": self.archive,
+            "postprocess_pipeline": self.pipeline,
+        })
+
+    def tearDown(self):
+        self.pipeline.close()
+        self.archive.close()
+
+    def test_returns_before_postprocessing_and_archives_after(self):
+        release = threading.Event()
+
+        def slow_post_process(ydl, filename, info, files_to_move=None):
+            release.wait(2)
+            return info
+
+        with patch.object(YoutubeDL, "post_process", slow_post_process):
+            started = time.monotonic()
+            info = self.ydl.post_process("video.mp4", dict(INFO))
+            self.assertLess(time.monotonic() - started, 1)
+            self.assertEqual(info["filepath"], "video.mp4")
+
+            self.ydl.record_download_archive(info)
+            self.assertFalse(self.archive.contains_entry(INFO))
+
+            release.set()
+            self.ydl.close()
+        self.pipeline.join()
+        self.assertTrue(self.archive.contains_entry(INFO))
+
+    def test_failed_postprocessing_is_not_archived(self):
+        def broken_post_process(ydl, filename, info, files_to_move=None):
+            raise DownloadError("Postprocessing: Conversion failed!")
+
+        with patch.object(YoutubeDL, "post_process", broken_post_process):
+            info = self.ydl.post_process("video.mp4", dict(INFO))
+            self.ydl.record_download_archive(info)
+            self.ydl.close()
+
+        errors = self.pipeline.join()
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], DownloadError)
+        self.assertFalse(self.archive.contains_entry(INFO))
+
+    def test_runs_inline_without_ffmpeg_work(self):
+        with patch.object(YoutubeDL, "post_process", return_value={"filepath": "a.mp4"}) as inline:
+            self.ydl.post_process("a.mp4", {"id": "x"})
+        inline.assert_called_once()
+        self.assertEqual(self.pipeline.pending, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
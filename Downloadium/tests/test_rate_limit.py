@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from yt_dlp.networking.common import Response
+from yt_dlp.networking.exceptions import HTTPError
+from yt_dlp.utils import DownloadError
+
+from Downloadium.backend.rate_limit import RateController, is_rate_limited
+
+
+class TestRateController(unittest.TestCase):
+
+    def test_detects_rate_limit_messages(self):
+        self.assertTrue(is_rate_limited("HTTP Error 429: Too Many Requests"))
+        self.assertTrue(is_rate_limited("Your account has been rate-limited by YouTube"))
+        self.assertFalse(is_rate_limited("Requested format is not available"))
+
+    def test_only_http_429_counts(self):
+        self.assertFalse(is_rate_limited("[youtube] abc429xyz: Video unavailable"))
+        self.assertFalse(is_rate_limited("Got error: 429 bytes read, 1000 more expected"))
+        self.assertFalse(is_rate_limited("ERROR: [youtube] dQw4w9Wg: Sign in (code 429)"))
+
+        response = Response(fp=None, url="https://example.com", headers={}, status=429)
+        wrapped = DownloadError("ERROR: unable to download video data", exc_info=(HTTPError, HTTPError(response), None))
+        self.assertTrue(is_rate_limited(wrapped))
+
+    def test_additive_decrease_and_multiplicative_backoff(self):
+        rc = RateController(initial_delay=2.0, decrease=0.5, factor=2.0)
+        params = {"sleep_interval": 2.0}
+
+        rc.record_success("youtube.com")
+        rc.record_success("youtube.com")
+        rc.apply(params, "youtube.com")
+        self.assertEqual(params["sleep_interval"], 1.0)
+        self.assertEqual(params["max_sleep_interval"], 2.5)
+        self.assertEqual(params["sleep_interval_requests"], 0.5)
+
+        with patch("Downloadium.backend.rate_limit.random.uniform", side_effect=lambda a, b: b):
+            first = rc.record_rate_limit("youtube.com")
+            second = rc.record_rate_limit("youtube.com")
+        self.assertEqual(rc.delay("youtube.com"), 4.0)
+        self.assertEqual((first, second), (4.0, 16.0))
+        self.assertEqual(rc.strikes("youtube.com"), 2)
+
+        rc.record_success("youtube.com")
+        self.assertEqual(rc.strikes("youtube.com"), 0)
+
+    def test_new_host_starts_from_configured_sleep(self):
+        rc = RateController(initial_delay=2.0)
+        params = rc.apply({"sleep_interval": 3.0}, "vimeo.com")
+        self.assertEqual(params["sleep_interval"], 3.0)
+
+    def test_learned_pacing_persists_across_runs(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(path)
+        try:
+            rc = RateController(path=path)
+            rc.record_rate_limit("youtube.com", retry_after=1)
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("youtube.com", json.load(f))
+
+            self.assertEqual(RateController(path=path).delay("youtube.com"), rc.delay("youtube.com"))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from yt_dlp import YoutubeDL
+
+from Downloadium.backend.remux import JobStats, plan_merge
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+H264 = {"format_id": "136", "vcodec": "avc1.4d401f", "acodec": "none"}
+AAC = {"format_id": "140", "vcodec": "none", "acodec": "mp4a.40.2"}
+VP9 = {"format_id": "247", "vcodec": "vp9", "acodec": "none"}
+OPUS = {"format_id": "251", "vcodec": "none", "acodec": "opus"}
+
+
+class TestMergePlan(unittest.TestCase):
+
+    def test_remux_when_codecs_fit_the_container(self):
+        plan = plan_merge([H264, AAC], "mp4")
+        self.assertFalse(plan.transcode)
+        self.assertEqual(plan.merge_ext, "mp4")
+        self.assertFalse(plan_merge([VP9, OPUS], "mkv").transcode)
+
+    def test_incompatible_codecs_fall_back_to_mkv_without_transcoding(self):
+        plan = plan_merge([VP9, OPUS], "mp4")
+        self.assertTrue(plan.fallback)
+        self.assertFalse(plan.transcode)
+        self.assertEqual(plan.merge_ext, "mkv")
+        self.assertEqual(plan.reason, "vp9/opus cannot be stream-copied into mp4, merged into mkv")
+
+    def test_job_stats_counts(self):
+        stats = JobStats()
+        stats.record(plan_merge([H264, AAC], "mp4"))
+        stats.record(plan_merge([H264, OPUS], "mp4"))
+        self.assertEqual((stats.remuxed, stats.transcoded, stats.container_fallbacks), (2, 0, 1))
+        self.assertTrue(stats.last_plan.fallback)
+
+
+class TestYdlMergePlanning(unittest.TestCase):
+
+    def test_fallback_plan_merges_into_mkv_without_convert_step(self):
+        stats, hook = JobStats(), MagicMock()
+        ydl = DownloadiumYDL({"quiet": True, "merge_output_format": "mp4", "merge_stats": stats, "merge_plan_hook": hook})
+        merger = object()
+        info = {"id": "x", "ext": "mp4", "requested_formats": [VP9, OPUS], "__postprocessors": [merger]}
+
+        ydl._plan_merge(info)
+        self.assertEqual(info["ext"], "mkv")
+        self.assertEqual((stats.transcoded, stats.container_fallbacks), (0, 1))
+        hook.assert_called_once()
+
+        with patch.object(YoutubeDL, "post_process", return_value=info) as base:
+            ydl.post_process("x.mkv", info)
+        self.assertEqual(base.call_args.args[1]["__postprocessors"], [merger])
+        ydl.close()
+
+    def test_remux_plan_leaves_info_untouched(self):
+        ydl = DownloadiumYDL({"quiet": True, "merge_output_format": "mp4"})
+        info = {"id": "x", "ext": "mp4", "requested_formats": [H264, AAC]}
+        ydl._plan_merge(info)
+        self.assertEqual(info["ext"], "mp4")
+        ydl.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
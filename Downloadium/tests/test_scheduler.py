@@ -0,0 +1,173 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from yt_dlp.utils import DownloadError
+
+from Downloadium.backend.archive import DownloadArchive
+from Downloadium.backend.events import legacy_adapter
+from Downloadium.backend.scheduler import PlaylistScheduler, ProgressAggregator, entry_host
+
+
+class TestPlaylistScheduler(unittest.TestCase):
+
+    def _session(self, n):
+        session = MagicMock()
+        session.info = {"_type": "playlist", "id": "PLabc", "title": "Minha Playlist", "extractor": "youtube:tab", "extractor_key": "YoutubeTab"}
+        session.entries = [
+            {"_type": "url", "id": f"v{i}", "url": f"https://www.youtube.com/watch?v=v{i}", "ie_key": "Youtube"}
+            for i in range(n)
+        ]
+        return session
+
+    @patch("Downloadium.backend.scheduler.DownloadiumYDL")
+    def test_runs_every_entry_with_playlist_fields_and_host_cap(self, mock_ydl):
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+        seen = []
+
+        def process(entry, download=True, extra_info=None):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+                seen.append((entry["id"], extra_info["playlist"], extra_info["playlist_index"]))
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+
+        mock_ydl.return_value.process_ie_result.side_effect = process
+        mock_ydl._playlist_infodict.side_effect = lambda info, **kw: {"playlist": info["title"], **kw}
+
+        events = []
+        scheduler = PlaylistScheduler({}, events.append, workers=4, max_per_host=2)
+        results = scheduler.run(self._session(6))
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(sorted(i for _, _, i in seen), [1, 2, 3, 4, 5, 6])
+        self.assertTrue(all(p == "Minha Playlist" for _, p, _ in seen))
+        self.assertLessEqual(active["max"], 2)
+        self.assertEqual(events[-1].percent, 100.0)
+
+    @patch("Downloadium.backend.scheduler.DownloadiumYDL")
+    def test_failed_entry_is_isolated_and_classified(self, mock_ydl):
+        def process(entry, download=True, extra_info=None):
+            if entry["id"] == "v0":
+                raise DownloadError("ERROR: [youtube] v0: Private video. Sign in if you've been granted access")
+
+        mock_ydl.return_value.process_ie_result.side_effect = process
+        mock_ydl._playlist_infodict.side_effect = lambda info, **kw: dict(kw)
+
+        scheduler = PlaylistScheduler({}, lambda event: None, workers=1)
+        results = scheduler.run(self._session(3))
+
+        self.assertEqual([r.ok for r in results], [False, True, True])
+        self.assertEqual((results[0].cause, results[0].attempts), ("removed", 1))
+        self.assertEqual(mock_ydl.return_value.process_ie_result.call_count, 3)
+
+    @patch("Downloadium.backend.scheduler.DownloadiumYDL")
+    def test_only_failed_entry_gets_fallback_format(self, mock_ydl):
+        calls = []
+
+        def make_ydl(opts):
+            ydl = MagicMock()
+
+            def process(entry, download=True, extra_info=None):
+                calls.append((entry["id"], opts.get("format")))
+                if entry["id"] == "v1" and opts.get("format") == "best[height<=720]":
+                    raise DownloadError("ERROR: [youtube] v1: Requested format is not available")
+
+            ydl.process_ie_result.side_effect = process
+            return ydl
+
+        mock_ydl.side_effect = make_ydl
+        mock_ydl._playlist_infodict.side_effect = lambda info, **kw: dict(kw)
+
+        scheduler = PlaylistScheduler({"format": "best[height<=720]"}, lambda event: None, workers=1)
+        results = scheduler.run(self._session(3))
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(results[1].attempts, 2)
+        self.assertEqual(calls, [
+            ("v0", "best[height<=720]"),
+            ("v1", "best[height<=720]"),
+            ("v1", "bestvideo+bestaudio/best"),
+            ("v2", "best[height<=720]"),
+        ])
+
+    @patch("Downloadium.backend.scheduler.DownloadiumYDL")
+    def test_postprocessing_error_fails_only_its_entry(self, mock_ydl):
+        jobs = []
+
+        def process(entry, download=True, extra_info=None):
+            job = Future()
+            if entry["id"] == "v1":
+                job.set_exception(DownloadError("Postprocessing: Conversion failed!"))
+            else:
+                job.set_result({})
+            jobs.append(job)
+
+        def take():
+            taken = list(jobs)
+            jobs.clear()
+            return taken
+
+        mock_ydl.return_value.process_ie_result.side_effect = process
+        mock_ydl.return_value.take_postprocess_jobs.side_effect = take
+        mock_ydl._playlist_infodict.side_effect = lambda info, **kw: dict(kw)
+
+        scheduler = PlaylistScheduler({}, lambda event: None, workers=1)
+        results = scheduler.run(self._session(3))
+
+        self.assertEqual([r.ok for r in results], [True, False, True])
+        self.assertIn("Conversion failed", results[1].error)
+        self.assertEqual(results[1].cause, "other")
+
+    @patch("Downloadium.backend.scheduler.DownloadiumYDL")
+    def test_archived_entries_are_skipped_before_extraction(self, mock_ydl):
+        mock_ydl._playlist_infodict.side_effect = lambda info, **kw: dict(kw)
+        archive = DownloadArchive(path=":memory:")
+        archive.add("youtube v1")
+
+        scheduler = PlaylistScheduler({}, lambda event: None, workers=2, archive=archive)
+        results = scheduler.run(self._session(3))
+
+        self.assertEqual([r.index for r in results], [1, 3])
+        processed = [c[0][0]["id"] for c in mock_ydl.return_value.process_ie_result.call_args_list]
+        self.assertNotIn("v1", processed)
+        archive.close()
+
+    @patch("Downloadium.backend.scheduler.DownloadiumYDL")
+    def test_fragment_progress_from_worker_thread(self, mock_ydl):
+        mock_ydl._playlist_infodict.side_effect = lambda info, **kw: dict(kw)
+
+        def process(entry, download=True, extra_info=None):
+            # HLS/DASH: o hook é chamado de uma thread de fragmento, não da thread da entrada.
+            hook = mock_ydl.call_args[0][0]["progress_hooks"][0]
+            fragment = threading.Thread(target=hook, args=({"status": "downloading", "downloaded_bytes": 500, "total_bytes": 1000},))
+            fragment.start()
+            fragment.join()
+
+        mock_ydl.return_value.process_ie_result.side_effect = process
+        events = []
+        scheduler = PlaylistScheduler({}, events.append, workers=1)
+        scheduler.run(self._session(1))
+
+        fragment_events = [e for e in events if e.downloaded_bytes == 500]
+        self.assertEqual(len(fragment_events), 1)
+        self.assertEqual(fragment_events[0].percent, 50.0)
+
+    def test_aggregator_and_host(self):
+        events = []
+        agg = ProgressAggregator(4, legacy_adapter(lambda s, p: events.append((s, p))))
+        agg.update(1, 50, 100)
+        agg.update(2, 50, 100)
+        self.assertEqual(events[-1], ("Video 1 of 4 | Status: Downloading | 25.0%", 25.0))
+        agg.finish(1)
+        self.assertEqual(events[-1][1], 37.5)
+        self.assertEqual(entry_host({"url": "https://youtu.be/x"}), "youtube.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
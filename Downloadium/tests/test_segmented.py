@@ -0,0 +1,126 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from Downloadium.backend.segmented import SegmentedHttpFD
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 123)
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    ranges: list = []
+    accept_ranges = True
+
+    def do_GET(self):
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if not match or not self.accept_ranges:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.write(PAYLOAD)
+            return
+
+        start = int(match.group(1))
+        end = int(match.group(2) or len(PAYLOAD) - 1)
+        type(self).ranges.append((start, end))
+        body = PAYLOAD[start:end + 1]
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSegmentedHttpFD(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/video.mp4"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.dir, "video.mp4")
+        _RangeHandler.ranges = []
+        _RangeHandler.accept_ranges = True
+        self.events = []
+        self.params = {
+            "quiet": True,
+            "noprogress": True,
+            "proxy": "",
+            "segmented_connections": 4,
+            "segmented_min_size": 1024,
+            "segmented_segment_size": 512 * 1024,
+            "progress_hooks": [self.events.append],
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _download(self):
+        ydl = DownloadiumYDL(self.params)
+        info = {"id": "x", "url": self.url, "ext": "mp4", "protocol": "http", "http_headers": {}}
+        return ydl.dl(self.filename, info)
+
+    def test_downloads_in_parallel_ranges(self):
+        ok, _ = self._download()
+
+        self.assertTrue(ok)
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(), PAYLOAD)
+        self.assertGreater(len(_RangeHandler.ranges), 4)
+        self.assertFalse(os.path.exists(self.filename + ".part.segments"))
+        self.assertEqual(self.events[-1]["status"], "finished")
+        self.assertEqual(self.events[-1]["total_bytes"], len(PAYLOAD))
+        self.assertTrue(any(e["status"] == "downloading" for e in self.events))
+
+    def test_resumes_only_missing_segments(self):
+        tmp = self.filename + ".part"
+        half = len(PAYLOAD) // 2
+        with open(tmp, "wb") as f:
+            f.write(PAYLOAD[:half])
+            f.truncate(len(PAYLOAD))
+        with open(tmp + ".segments", "w", encoding="utf-8") as f:
+            json.dump({"size": len(PAYLOAD), "segments": [[0, half - 1, half], [half, len(PAYLOAD) - 1, 0]]}, f)
+
+        ok, _ = self._download()
+
+        self.assertTrue(ok)
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(), PAYLOAD)
+        downloaded = [r for r in _RangeHandler.ranges if r != (0, 0)]
+        self.assertTrue(all(start >= half for start, _ in downloaded))
+
+    def test_falls_back_without_range_support(self):
+        _RangeHandler.accept_ranges = False
+        ok, _ = self._download()
+
+        self.assertTrue(ok)
+        with open(self.filename, "rb") as f:
+            self.assertEqual(f.read(), PAYLOAD)
+
+    def test_suitable_only_for_progressive_http(self):
+        self.assertTrue(SegmentedHttpFD.suitable({"url": self.url, "protocol": "https"}, self.params))
+        self.assertFalse(SegmentedHttpFD.suitable({"url": self.url, "protocol": "m3u8_native"}, self.params))
+        self.assertFalse(SegmentedHttpFD.suitable({"url": self.url, "protocol": "https"}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
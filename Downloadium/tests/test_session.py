@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from Downloadium.backend.metadata_cache import MetadataCache
+from Downloadium.backend.session import ExtractionSession
+
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PLabc"
+
+
+def _fake_ydl(info):
+    ydl = MagicMock()
+    ydl.__enter__.return_value = ydl
+    ydl.extract_info.return_value = info
+    return ydl
+
+
+class TestExtractionSession(unittest.TestCase):
+
+    @patch("Downloadium.backend.session.YoutubeDL")
+    def test_resolves_once_and_materializes_entries(self, mock_ydl):
+        entries = ({"_type": "url", "id": str(i), "url": f"https://youtu.be/{i}"} for i in range(3))
+        mock_ydl.return_value = _fake_ydl({"_type": "playlist", "id": "PLabc", "entries": entries})
+
+        cache = MetadataCache(path=":memory:")
+        session = ExtractionSession(PLAYLIST_URL, metadata_cache=cache)
+
+        self.assertTrue(session.is_playlist)
+        self.assertEqual(session.entry_count, 3)
+        self.assertEqual(len(session.entries), 3)
+        self.assertEqual(mock_ydl.call_count, 1)
+        self.assertEqual(cache.get("count", PLAYLIST_URL), 3)
+        cache.close()
+
+    @patch("Downloadium.backend.session.YoutubeDL")
+    def test_process_hands_a_copy_to_download_ydl(self, mock_ydl):
+        info = {"id": "dQw4w9WgXcQ", "formats": [{"format_id": "18", "height": 360}]}
+        mock_ydl.return_value = _fake_ydl(info)
+        session = ExtractionSession("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+        download_ydl = MagicMock()
+        session.process(download_ydl)
+        session.process(download_ydl)
+
+        self.assertEqual(mock_ydl.call_count, 1)
+        passed = download_ydl.process_ie_result.call_args[0][0]
+        self.assertEqual(passed, info)
+        self.assertIsNot(passed, session.info)
+
+    def test_matches_canonical_url(self):
+        session = ExtractionSession("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        self.assertTrue(session.matches("https://youtu.be/dQw4w9WgXcQ"))
+        self.assertFalse(session.matches("https://youtu.be/dQw4w9WgXcQ", noplaylist=True))
+        self.assertFalse(session.matches("https://youtu.be/aaaaaaaaaaa"))
+
+
+if __name__ == "__main__":
+    unittest.main()
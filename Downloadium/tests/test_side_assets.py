@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from yt_dlp import YoutubeDL
+
+from Downloadium.backend.remux import JobStats
+from Downloadium.backend.side_assets import SUBTITLES, THUMBNAIL, SideAssetPool, in_side_asset
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+class TestSideAssetPool(unittest.TestCase):
+
+    def test_results_never_raise(self):
+        pool = SideAssetPool(workers=2)
+
+        def fail():
+            raise OSError("boom")
+
+        ok = pool.submit(SUBTITLES, lambda: [("a.part.vtt", "a.vtt")]).result()
+        failed = pool.submit(THUMBNAIL, fail).result()
+        error = pool.submit(THUMBNAIL, lambda: None).result()
+        inside = pool.submit(THUMBNAIL, in_side_asset).result()
+        pool.close()
+
+        self.assertEqual((ok.ok, ok.files), (True, [("a.part.vtt", "a.vtt")]))
+        self.assertEqual((failed.ok, failed.error), (False, "boom"))
+        self.assertFalse(error.ok)
+        self.assertTrue(inside.ok)
+        self.assertFalse(in_side_asset())
+
+
+class TestParallelSideAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.pool = SideAssetPool(workers=2)
+
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_side_assets_run_during_main_download_and_failures_are_isolated(self):
+        stats = JobStats()
+        seen = []
+        subtitle_started = threading.Event()
+        ydl = DownloadiumYDL({
+            "quiet": True, "no_warnings": True, "writesubtitles": True, "writethumbnail": True,
+            "outtmpl": os.path.join(self.dir, "%(id)s.%(ext)s"), "side_asset_pool": self.pool,
+            "side_asset_stats": stats, "side_asset_hook": lambda result, info: seen.append(result.kind),
+        })
+
+        def write_subtitles(self_, info, filename):
+            subtitle_started.set()
+            path = os.path.join(self.dir, "v.en.vtt")
+            with open(path, "w") as f:
+                f.write("WEBVTT\n")
+            info["requested_subtitles"]["en"]["filepath"] = path
+            return [(path, path)]
+
+        def write_thumbnails(self_, label, info, filename, base=None):
+            raise OSError("thumbnail host unreachable")
+
+        def main_download(self_, name, info, subtitle=False, test=False):
+            # O vídeo só "termina" depois que a legenda começou em outra thread.
+            self.assertTrue(subtitle_started.wait(2))
+            with open(name, "wb") as f:
+                f.write(b"video")
+            return True, True
+
+        info = {
+            "id": "v", "title": "v", "ext": "mp4", "url": "http://example.invalid/v.mp4", "protocol": "https",
+            "extractor": "generic", "extractor_key": "Generic", "webpage_url": "http://example.invalid/v",
+            "requested_subtitles": {"en": {"ext": "vtt", "url": "http://example.invalid/v.vtt"}},
+            "thumbnails": [{"url": "http://example.invalid/v.jpg", "id": "0"}],
+        }
+        with patch.object(YoutubeDL, "_write_subtitles", write_subtitles), \
+                patch.object(YoutubeDL, "_write_thumbnails", write_thumbnails), \
+                patch.object(YoutubeDL, "dl", main_download):
+            ydl.process_info(info)
+        ydl.close()
+
+        self.assertTrue(os.path.exists(os.path.join(self.dir, "v.mp4")))
+        self.assertEqual(info["requested_subtitles"]["en"]["filepath"], os.path.join(self.dir, "v.en.vtt"))
+        self.assertEqual(sorted(seen), [SUBTITLES, THUMBNAIL])
+        self.assertEqual((stats.side_assets, stats.side_assets_failed), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from Downloadium.backend.subtitle_convert import (
+    Cue,
+    convert,
+    convert_tree,
+    dedupe_rolling,
+    merge_cues,
+    parse_clock,
+    parse_json3,
+    parse_ttml,
+    parse_vtt,
+)
+
+
+# Legenda automática do YouTube: cada cue repete a linha anterior e há cues de 10 ms só com repetição.
+ROLLING_VTT = """WEBVTT
+Kind: captions
+Language: en
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+hello<00:00:00.500><c> world</c>
+
+00:00:02.000 --> 00:00:02.010 align:start position:0%
+hello world
+
+00:00:02.010 --> 00:00:04.000 align:start position:0%
+hello world
+how<00:00:02.500><c> are</c><00:00:03.000><c> you</c>
+
+00:00:04.000 --> 00:00:04.010
+how are you
+"""
+
+TTML = b"""<?xml version="1.0" encoding="utf-8"?>
+<tt xmlns="http://www.w3.org/ns/ttml" xmlns:ttp="http://www.w3.org/ns/ttml#parameter" ttp:tickRate="1000">
+<body><div>
+<p begin="0t" end="1500t">first<br/>line &amp; more</p>
+<p begin="00:00:02.000" dur="1s"><span>second</span></p>
+</div></body></tt>
+"""
+
+
+class TestSubtitleConvert(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb" if isinstance(data, bytes) else "w", **({} if isinstance(data, bytes) else {"encoding": "utf-8"})) as f:
+            f.write(data)
+        return path
+
+    def test_parse_clock_variants(self):
+        self.assertEqual(parse_clock("01:02:03.456"), 3723.456)
+        self.assertEqual(parse_clock("02:03,5"), 123.5)
+        self.assertEqual(parse_clock("1.5s"), 1.5)
+        self.assertEqual(parse_clock("250ms"), 0.25)
+        self.assertEqual(parse_clock("2000t", tick_rate=1000), 2.0)
+
+    def test_rolling_auto_captions_are_deduplicated_and_merged(self):
+        cues = list(merge_cues(dedupe_rolling(parse_vtt(io.StringIO(ROLLING_VTT)))))
+        self.assertEqual(cues, [Cue(0.0, 2.01, "hello world"), Cue(2.01, 4.01, "how are you")])
+
+    def test_ttml_and_json3(self):
+        self.assertEqual(list(parse_ttml(io.BytesIO(TTML))), [
+            Cue(0.0, 1.5, "first\nline & more"), Cue(2.0, 3.0, "second"),
+        ])
+        data = {"events": [
+            {"tStartMs": 0, "dDurationMs": 1000, "segs": [{"utf8": "hi"}, {"utf8": " there"}]},
+            {"tStartMs": 900, "aAppend": 1, "segs": [{"utf8": "\n"}]},
+            {"tStartMs": 1000, "dDurationMs": 500},
+        ]}
+        self.assertEqual(list(parse_json3(io.StringIO(json.dumps(data)))), [Cue(0.0, 1.0, "hi there")])
+
+    def test_convert_writes_srt(self):
+        src = self._write("a.en.vtt", ROLLING_VTT)
+        dst = os.path.join(self.dir, "a.en.srt")
+        self.assertEqual(convert(src, dst, dedupe=True), 2)
+        with open(dst, encoding="utf-8") as f:
+            self.assertEqual(f.read(), (
+                "1\n00:00:00,000 --> 00:00:02,010\nhello world\n\n"
+                "2\n00:00:02,010 --> 00:00:04,010\nhow are you\n\n"
+            ))
+
+    def test_manual_subtitles_keep_repeated_lines_by_default(self):
+        src = self._write("m.en.vtt", (
+            "WEBVTT\n\n"
+            "00:00:00.000 --> 00:00:01.000\nNo!\n\n"
+            "00:00:01.000 --> 00:00:02.000\nNo!\n\n"
+            "00:00:02.000 --> 00:00:03.000\nNo!\nPlease.\n"
+        ))
+        self.assertEqual(convert(src, os.path.join(self.dir, "m.en.srt")), 3)
+
+    def test_convert_tree_mirrors_directories(self):
+        self._write("one/a.en.vtt", ROLLING_VTT)
+        self._write("two/b.en.ttml", TTML)
+        self._write("two/c.en.srt", "1\n00:00:00,000 --> 00:00:01,000\nkept\n")
+        self._write("two/broken.en.vtt", "WEBVTT\n\nxx --> yy\ntext\n")
+        out = os.path.join(self.dir, "out")
+
+        results = convert_tree(self.dir, "srt", out_root=out, workers=2)
+
+        by_name = {os.path.basename(r.src): r for r in results}
+        self.assertEqual(sorted(by_name), ["a.en.vtt", "b.en.ttml", "broken.en.vtt"])
+        self.assertEqual(by_name["b.en.ttml"].cues, 2)
+        self.assertIsNotNone(by_name["broken.en.vtt"].error)
+        self.assertTrue(os.path.exists(os.path.join(out, "one", "a.en.srt")))
+        self.assertTrue(os.path.exists(os.path.join(out, "two", "b.en.srt")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from yt_dlp import YoutubeDL
+
+from Downloadium.backend.remux import JobStats
+from Downloadium.backend.subtitles import SubtitlePlanner
+from Downloadium.backend.ydl import DownloadiumYDL
+
+
+def _formats(lang):
+    return [{"ext": ext, "url": f"http://s/{lang}.{ext}"} for ext in ("json3", "srv1", "vtt", "ttml")]
+
+
+# Forma das automáticas do YouTube: a trilha original, "-orig" e dezenas de traduções.
+AUTO = {key: _formats(key) for key in ("en", "en-orig", "de", "fr", "pt-BR", "en-GB")}
+
+
+class TestSubtitlePlanner(unittest.TestCase):
+
+    def test_one_track_per_language_preferring_manual(self):
+        manual = {"en-US": _formats("en-US"), "live_chat": _formats("live_chat")}
+        subs = SubtitlePlanner(["en"]).select(manual, AUTO)
+        self.assertEqual(list(subs), ["en-US"])
+        self.assertEqual(subs["en-US"]["ext"], "vtt")
+
+    def test_falls_back_to_automatic_and_dedupes(self):
+        subs = SubtitlePlanner(["en", "en-US", "pt-BR", "xx"]).select({}, AUTO)
+        self.assertEqual(list(subs), ["en", "pt-BR"])
+        self.assertEqual(SubtitlePlanner(["pt-PT"]).select(None, {"pt": _formats("pt")})["pt"]["ext"], "vtt")
+        self.assertEqual(SubtitlePlanner(["en"], automatic=False).select({}, AUTO), {})
+
+
+class TestYdlSubtitles(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_planner_and_counters(self):
+        stats = JobStats()
+        ydl = DownloadiumYDL({
+            "quiet": True, "writesubtitles": True, "writeautomaticsub": True,
+            "subtitleslangs": ["en.*"], "subtitle_planner": SubtitlePlanner(["en"]), "subtitle_stats": stats,
+        })
+        subs = ydl.process_subtitles("x", {}, AUTO)
+        self.assertEqual(list(subs), ["en"])
+
+        path = os.path.join(self.dir, "x.en.vtt")
+
+        def fake_dl(self_, name, info, subtitle=False, test=False):
+            with open(name, "w") as f:
+                f.write("WEBVTT\n")
+            return True
+
+        with patch.object(YoutubeDL, "dl", fake_dl):
+            ydl.dl(path, subs["en"], subtitle=True)
+        self.assertEqual(
+            (stats.subtitle_tracks, stats.subtitle_requests, stats.subtitle_bytes), (1, 1, len("WEBVTT\n"))
+        )
+        ydl.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
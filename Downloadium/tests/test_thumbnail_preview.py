@@ -0,0 +1,111 @@
+import io
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from PIL import Image
+
+from Downloadium.gui.thumbnail_preview import ThumbnailPreviewService, pick_variant
+
+
+def _jpeg(size=(1280, 720)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _session(data, gate=None):
+    session = MagicMock()
+
+    def get(url, **kwargs):
+        if gate is not None:
+            gate.wait(2)
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_content.return_value = [data]
+        return response
+
+    session.get.side_effect = get
+    return session
+
+
+class TestThumbnailPreview(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _request(self, service, video_id, thumbnails="http://i/x.jpg"):
+        done = threading.Event()
+        out = []
+
+        def callback(image):
+            out.append(image)
+            done.set()
+
+        service.request(video_id, thumbnails, callback)
+        self.assertTrue(done.wait(5))
+        return out[0]
+
+    def test_pick_smallest_variant_that_covers_the_preview(self):
+        thumbs = [
+            {"url": "s", "width": 120, "height": 90},
+            {"url": "m", "width": 320, "height": 180},
+            {"url": "l", "width": 1280, "height": 720},
+        ]
+        self.assertEqual(pick_variant(thumbs, (160, 90)), "m")
+        self.assertEqual(pick_variant(thumbs, (1920, 1080)), "l")
+        self.assertEqual(pick_variant("http://only", (160, 90)), "http://only")
+        self.assertIsNone(pick_variant([], (160, 90)))
+
+    def test_downscales_and_reuses_disk_tier(self):
+        session = _session(_jpeg())
+        service = ThumbnailPreviewService(cache_dir=self.dir, session=session)
+        image = self._request(service, "youtube:abc")
+        self.assertEqual(image.size, (160, 90))
+        self.assertIs(service.get("youtube:abc"), image)
+        service.close()
+
+        # Outra instância (novo processo): vem do disco, sem rede.
+        other = ThumbnailPreviewService(cache_dir=self.dir, session=_session(b""))
+        self.assertEqual(self._request(other, "youtube:abc").size, (160, 90))
+        other._session.get.assert_not_called()
+        other.close()
+
+    def test_memory_lru_is_bounded_by_bytes(self):
+        one = 160 * 90 * 3
+        service = ThumbnailPreviewService(cache_dir=None, max_bytes=2 * one, session=_session(_jpeg()))
+        for video_id in ("a", "b", "c"):
+            self._request(service, video_id)
+        self.assertEqual(service.memory_bytes, 2 * one)
+        self.assertIsNone(service.get("a"))
+        self.assertIsNotNone(service.get("c"))
+        service.close()
+
+    def test_concurrent_requests_share_one_download(self):
+        gate = threading.Event()
+        session = _session(_jpeg(), gate)
+        service = ThumbnailPreviewService(cache_dir=None, session=session)
+        results = []
+        done = threading.Event()
+
+        def callback(image):
+            results.append(image)
+            if len(results) == 2:
+                done.set()
+
+        service.request("v", "http://i/x.jpg", callback)
+        service.request("v", "http://i/x.jpg", callback)
+        gate.set()
+        self.assertTrue(done.wait(5))
+        self.assertIs(results[0], results[1])
+        self.assertEqual(session.get.call_count, 1)
+        service.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
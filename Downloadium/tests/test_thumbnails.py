@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+from Downloadium.backend import downloader
+from Downloadium.backend.metadata_cache import MetadataCache
+from Downloadium.backend.thumbnails import (
+    DOWNLOADED,
+    FAILED,
+    NOT_MODIFIED,
+    ThumbnailFetcher,
+    best_thumbnail,
+    thumbnail_jobs,
+)
+
+
+IMAGE = os.urandom(200 * 1024)
+ETAG = '"v1"'
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    requests: list = []
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        type(self).requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path.startswith("/missing"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(IMAGE)))
+        self.end_headers()
+        self.wfile.write(IMAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestThumbnailFetcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        _ImageHandler.requests = []
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_conditional_get_skips_unchanged_thumbnails(self):
+        path = os.path.join(self.dir, "a_thumbnail.jpg")
+        with ThumbnailFetcher() as fetcher:
+            self.assertEqual(fetcher.fetch(f"{self.base}/a.jpg", path).status, DOWNLOADED)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), IMAGE)
+
+        # Nova instância: os validadores vêm do JSON salvo na pasta.
+        with ThumbnailFetcher() as fetcher:
+            self.assertEqual(fetcher.fetch(f"{self.base}/a.jpg", path).status, NOT_MODIFIED)
+        self.assertEqual(_ImageHandler.requests[-1], ("/a.jpg", ETAG))
+
+        os.remove(path)  # arquivo apagado: baixa de novo sem condicional
+        with ThumbnailFetcher() as fetcher:
+            self.assertEqual(fetcher.fetch(f"{self.base}/a.jpg", path).status, DOWNLOADED)
+        self.assertIsNone(_ImageHandler.requests[-1][1])
+
+    def test_fetch_many_reports_each_result_in_order(self):
+        jobs = [(f"{self.base}/{name}.jpg", os.path.join(self.dir, f"{name}.jpg")) for name in ("a", "missing", "b")]
+        seen = []
+        with ThumbnailFetcher(max_workers=2) as fetcher:
+            results = fetcher.fetch_many(jobs, seen.append)
+        self.assertEqual([r.status for r in results], [DOWNLOADED, FAILED, DOWNLOADED])
+        self.assertEqual(len(seen), 3)
+        self.assertFalse(any(name.endswith(".part") for name in os.listdir(self.dir)))
+
+
+class TestThumbnailJobs(unittest.TestCase):
+
+    def test_flat_playlist_entries(self):
+        info = {
+            "_type": "playlist",
+            "entries": [
+                {"id": "a", "title": "First", "thumbnails": [
+                    {"url": "http://i/a/default.jpg", "width": 120, "height": 90},
+                    {"url": "http://i/a/hq.webp", "width": 480, "height": 360},
+                ]},
+                {"id": "b", "title": "No thumb"},
+                {"id": "c", "thumbnail": "http://i/c/hq"},
+            ],
+        }
+        self.assertEqual(thumbnail_jobs(info, "out"), [
+            ("http://i/a/hq.webp", os.path.join("out", "First [a]_thumbnail.webp")),
+            ("http://i/c/hq", os.path.join("out", "c_thumbnail.jpg")),
+        ])
+        self.assertEqual(best_thumbnail({"thumbnails": [{"url": "x", "preference": 1}, {"url": "y", "width": 9, "height": 9}]}), "x")
+
+    def test_repeated_titles_get_distinct_files(self):
+        info = {
+            "_type": "playlist",
+            "entries": [
+                {"id": "x1", "title": "#shorts", "thumbnail": "http://i/x1/hq.jpg"},
+                {"id": "x2", "title": "#shorts", "thumbnail": "http://i/x2/hq.jpg"},
+            ],
+        }
+        paths = [path for _url, path in thumbnail_jobs(info, "out")]
+        self.assertEqual(len(set(paths)), 2)
+
+
+class TestDownloadThumbnail(unittest.TestCase):
+
+    def test_reuses_the_session_cache_entry(self):
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLx"
+        cache = MetadataCache(path=":memory:")
+        cache.set("thumbnail", url, {"id": "dQw4w9WgXcQ", "title": "Live", "thumbnail": "http://i/vi/hq.webp"}, single_video=True)
+        fetcher = MagicMock()
+        fetcher.fetch.return_value.ok = True
+        out = tempfile.mkdtemp()
+        try:
+            with patch.object(downloader, "get_default_cache", return_value=cache), \
+                    patch.object(downloader, "get_default_fetcher", return_value=fetcher), \
+                    patch.object(downloader, "ExtractionSession") as session:
+                downloader.download_thumbnail(url, out)
+            session.assert_not_called()
+            fetcher.fetch.assert_called_once_with("http://i/vi/hq.webp", os.path.join(out, "Live [dQw4w9WgXcQ]_thumbnail.webp"))
+        finally:
+            cache.close()
+            shutil.rmtree(out, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,31 @@ from __future__ import annotations
 
 import os
 import re
-import shutil
+import sys
+from pathlib import Path
 from typing import Any, Callable, Optional, cast
 from urllib.parse import urlparse
 
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError, ExtractorError
 
+# Reaproveita a infraestrutura do pacote Downloadium (cache de metadados etc.)
+# quando executado a partir de single_file_project/.
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from Downloadium.backend.download_manager import DownloadManager as BaseDownloadManager  # noqa: E402
+from Downloadium.backend.formats import (  # noqa: E402
+    CostModel,
+    DeadlineBudget,
+    FormatIndex,
+    IndexedFormatSelector,
+    height_from_label,
+)
+from Downloadium.backend.metadata_cache import get_default_cache, slim_formats  # noqa: E402
+from Downloadium.backend.session import ExtractionSession  # noqa: E402
+
 
 _ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
 
@@ -56,9 +74,52 @@ def sanitize_filename(filename: str) -> str:
     return re.sub(r"[<>:\"/\\|?*]", "_", filename or "")
 
 
+def _resolutions_from_formats(formats: list[dict]) -> list[str]:
+    return FormatIndex(formats).resolution_labels()
+
+
+def estimate_size(
+    session: ExtractionSession, resolution: str, video_format: str = "mp4"
+) -> Optional[int]:
+    """Tamanho aproximado (bytes) para a resolução escolhida no menu (None em playlists/desconhecido).
+
+    Com a sessão ainda não resolvida, usa os formatos do cache (os mesmos do menu) em vez de extrair.
+    """
+    height = None if (resolution or "").strip().lower() == "melhor" else height_from_label(resolution)
+    if not session.resolved:
+        cache = get_default_cache()
+        formats = cache.get("formats", session.url, single_video=True)
+        if formats is not None:
+            meta = cache.get("thumbnail", session.url, single_video=True) or {}
+            return FormatIndex(formats, duration=meta.get("duration")).estimate_size(height, video_format)
+    if session.is_playlist:
+        return None
+    return session.format_index.estimate_size(height, video_format)
+
+
+def preview_thumbnails(url: str, session: ExtractionSession | None = None) -> list | str | None:
+    """Variantes da miniatura (a prévia escolhe a menor que serve), da sessão ou do cache."""
+    if session is not None and session.resolved and not session.is_playlist:
+        return session.info.get("thumbnails") or session.thumbnail
+    cached = get_default_cache().get("thumbnail", url, single_video=True) or {}
+    return cached.get("thumbnails") or cached.get("thumbnail")
+
+
+def open_session(url: str, cookies_file: str | None = None) -> ExtractionSession:
+    """Sessão de extração única, compartilhada por get_resolutions e DownloadManager.download."""
+    return ExtractionSession(
+        url,
+        cookies_file=cookies_file,
+        metadata_cache=get_default_cache(),
+        # Sobrescreve qualquer --format global para não falhar ao apenas extrair.
+        extra_opts={"format": "bestvideo+bestaudio/best"},
+    )
+
+
 def get_resolutions(
     url: str,
     cookies_file: str | None = None,
+    session: ExtractionSession | None = None,
 ) -> tuple[list[str], str | None, str | None]:
     if not validate_url(url):
         return [], None, "URL inválida ou não suportada."
@@ -82,41 +143,44 @@ def get_resolutions(
     if cookies_file and os.path.exists(cookies_file):
         options["cookiefile"] = cookies_file
 
+    cache = get_default_cache()
+    formats = cache.get("formats", url, single_video=True)
+    thumb = cache.get("thumbnail", url, single_video=True)
+    if formats is not None and thumb is not None:
+        if not formats:
+            return [], None, "Nenhum formato disponível para este vídeo."
+        return _resolutions_from_formats(formats), thumb.get("thumbnail"), None
+
     try:
+        # A sessão guarda a extração para o download; playlists listam os formatos do vídeo (noplaylist).
+        if session is not None and session.matches(url) and not session.is_playlist:
+            formats = slim_formats(session.formats)
+            if not formats:
+                return [], None, "Nenhum formato disponível para este vídeo."
+            return _resolutions_from_formats(formats), session.thumbnail, None
+
         with YoutubeDL(cast(Any, options)) as ydl:
             info = ydl.extract_info(url, download=False)
             if info is None:
                 return [], None, "Não foi possível extrair informações do vídeo."
 
-            formats = info.get("formats", [])
+            formats = slim_formats(info.get("formats"))
+            cache.set("formats", url, formats, single_video=True)
+            cache.set(
+                "thumbnail",
+                url,
+                {
+                    "title": info.get("title"),
+                    "duration": info.get("duration"),
+                    "thumbnail": info.get("thumbnail"),
+                    "thumbnails": info.get("thumbnails") or [],
+                },
+                single_video=True,
+            )
             if not formats:
                 return [], None, "Nenhum formato disponível para este vídeo."
 
-            resolutions_with_quality: list[tuple[int, str]] = []
-            seen_resolutions: set[str] = set()
-
-            for fmt in formats:
-                format_note = fmt.get("format_note")
-                vcodec = fmt.get("vcodec", "none")
-                height = fmt.get("height")
-
-                if vcodec != "none" and format_note and format_note not in seen_resolutions:
-                    seen_resolutions.add(format_note)
-                    try:
-                        if height:
-                            resolutions_with_quality.append((int(height), format_note))
-                        else:
-                            height_from_note = int("".join(filter(str.isdigit, format_note)))
-                            resolutions_with_quality.append((height_from_note, format_note))
-                    except Exception:
-                        resolutions_with_quality.append((0, format_note))
-
-            resolutions_with_quality.sort(key=lambda x: x[0], reverse=True)
-            unique_resolutions = [r[1] for r in resolutions_with_quality]
-            final_resolutions = ["Melhor"] + unique_resolutions if unique_resolutions else ["Melhor"]
-
-            thumbnail = info.get("thumbnail")
-            return final_resolutions, thumbnail, None
+            return _resolutions_from_formats(formats), info.get("thumbnail"), None
 
     except ExtractorError as e:
         return [], None, f"Erro ao extrair informações do vídeo: {_strip_ansi(str(e))}"
@@ -158,8 +222,25 @@ def fetch_video_formats(url: str) -> list[dict[str, str]]:
     return out
 
 
-class DownloadManager:
-    """Gerencia downloads via yt-dlp com suporte a canais/playlists, legendas embutidas e progresso avançado."""
+class DownloadManager(BaseDownloadManager):
+    """DownloadManager do pacote com a resolução do menu da GUI ("Melhor", "720p") e mensagens em português."""
+
+    MESSAGES = {
+        **BaseDownloadManager.MESSAGES,
+        "no_output": "Erro: Caminho de saída não fornecido.",
+        "archived": "Vídeo já baixado anteriormente (registrado no arquivo de downloads) em {output_path}",
+        "success": "Download finalizado com sucesso!",
+        "partial": "Download finalizado: {ok} de {total} vídeos; {failed} com falha ({causes}).",
+        "format_fallback": "Aviso: formato solicitado indisponível. Usando 'Melhor'...",
+        "rate_limited": (
+            "YouTube aplicou rate-limit nesta sessão (pode durar até ~1h). "
+            "Tente novamente mais tarde; para reduzir recorrência, mantenha delays entre vídeos e, se possível, use cookies/login. "
+            "Detalhe: {error}"
+        ),
+        "ydl_error": "Erro no download (yt-dlp): {error}",
+        "error": "Erro inesperado no download: {error}",
+        "cancelled": "Download cancelado.",
+    }
 
     def __init__(
         self,
@@ -167,256 +248,41 @@ class DownloadManager:
         resolution: str = "Melhor",
         video_format: str = "mp4",
         cookies_file: Optional[str] = None,
-        sleep_interval: float = 2.0,
-        max_sleep_interval: float = 5.0,
-        sleep_interval_requests: float = 1.0,
+        **kwargs: Any,
     ):
-        self.output_path = output_path
+        super().__init__(output_path=output_path, video_format=video_format, cookies_file=cookies_file, **kwargs)
         self.resolution = resolution
-        self.video_format = video_format
-        self.cookies_file = cookies_file
 
-        self.sleep_interval = sleep_interval
-        self.max_sleep_interval = max_sleep_interval
-        self.sleep_interval_requests = sleep_interval_requests
+    def _message(self, key: str, **values: Any) -> str:
+        if "error" in values:
+            values["error"] = _strip_ansi(str(values["error"]))
+        return super()._message(key, **values)
 
-        self._total_videos: int = 0
-        self._current_index: int = 0
-        self._current_video_id: Optional[str] = None
+    def _format_selector(self, host: Optional[str] = None, budget: Optional[DeadlineBudget] = None) -> IndexedFormatSelector:
+        """IDs exatos escolhidos pela tabela de cada vídeo ("Melhor" = maior altura disponível).
 
-    def _build_format_string(self) -> str:
+        Entre as opções, decide o modelo de custo (vazão do host, protocolo, remux) e o prazo do job, se houver.
+        """
         res = (self.resolution or "").strip().lower()
-        if res == "melhor":
-            return "bestvideo+bestaudio/best"
+        height = None if res == "melhor" else height_from_label(res)
+        cost = CostModel(self.throughput_history, host)
+        return IndexedFormatSelector(height, self.video_format, cost, budget)
 
-        digits = "".join(ch for ch in res if ch.isdigit())
-        if digits.isdigit():
-            height = int(digits)
-            return f"bestvideo[height<={height}]+bestaudio/best"
-
-        return "bestvideo+bestaudio/best"
-
-    def fetch_metadata(self, url: str) -> int:
-        """Conta quantos vídeos serão processados antes do download (UI: Video X/Y)."""
-        if not url:
-            raise ValueError("URL não fornecida")
-
-        ydl_opts: dict[str, Any] = {
-            "ignoreconfig": True,
-            "quiet": True,
-            "skip_download": True,
-            "extract_flat": True,
-            "noplaylist": False,
-            "nocolor": True,
-            "cachedir": False,
-            "retries": 5,
-            "socket_timeout": 30,
-            "no_warnings": True,
-            # Neutraliza configs globais com --format estrito.
-            "format": "best",
-        }
-        if self.cookies_file and os.path.exists(self.cookies_file):
-            ydl_opts["cookiefile"] = self.cookies_file
-
-        with YoutubeDL(cast(Any, ydl_opts)) as ydl:
-            info = ydl.extract_info(url, download=False)
+    def open_session(self, url: str) -> ExtractionSession:
+        """Retorna a sessão de extração da URL, reaproveitando a última se for da mesma URL."""
+        session = self._session
+        if session is None or not session.matches(url):
+            session = self._session = open_session(url, cookies_file=self.cookies_file)
+        return session
+
+    def build_ydl_opts(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
+        # Configs globais do usuário (yt-dlp.conf) não valem para a GUI.
+        return {"ignoreconfig": True, **super().build_ydl_opts(*args, **kwargs)}
 
-        if not info:
-            self._total_videos = 0
-            return 0
-
-        playlist_count = info.get("playlist_count")
-        if isinstance(playlist_count, int) and playlist_count > 0:
-            self._total_videos = playlist_count
-            return playlist_count
-
-        entries = info.get("entries")
-        if entries is None:
-            self._total_videos = 1
-            return 1
-
-        count = 0
-        try:
-            for _ in entries:
-                count += 1
-        except TypeError:
-            count = 0
-
-        self._total_videos = count if count > 0 else 1
-        return self._total_videos
-
-    def download(self, url: str, callback: Callable[[str, Optional[float]], None]) -> str:
-        if not url:
-            return "Erro: URL do vídeo não fornecida."
-        if not self.output_path:
-            return "Erro: Caminho de saída não fornecido."
-
-        ensure_directory_exists(self.output_path)
-
-        embed_enabled = shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
-        if not embed_enabled:
-            try:
-                callback(
-                    "Aviso: ffmpeg/ffprobe não encontrado no PATH. Baixando sem embutir legendas.",
-                    0.0,
-                )
-            except Exception:
-                pass
-
-        try:
-            total = self.fetch_metadata(url)
-        except Exception:
-            total = 0
-
-        self._current_index = 0
-        self._current_video_id = None
-
-        def emit(status: str, percent: Optional[float] = None) -> None:
-            try:
-                callback(status, percent)
-            except Exception:
-                pass
-
-        if total > 0:
-            emit(f"Video 0 of {total} | Status: Downloading", 0.0)
-        else:
-            emit("Status: Downloading", 0.0)
-
-        def progress_hook(d: dict) -> None:
-            status = d.get("status")
-            info_dict = d.get("info_dict") or {}
-            video_id = info_dict.get("id")
-
-            if status == "downloading":
-                if video_id and video_id != self._current_video_id:
-                    self._current_video_id = video_id
-                    self._current_index += 1
-
-                total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate")
-                downloaded_bytes = d.get("downloaded_bytes", 0)
-                percent = None
-                if isinstance(total_bytes, (int, float)) and total_bytes:
-                    percent = max(0.0, min(100.0, (downloaded_bytes / total_bytes) * 100))
-
-                if total > 0:
-                    msg = f"Video {max(self._current_index, 1)} of {total} | Status: Downloading"
-                else:
-                    msg = "Status: Downloading"
-
-                if percent is not None:
-                    msg += f" | {percent:.1f}%"
-                emit(msg, percent)
-
-            elif status == "finished":
-                if total > 0:
-                    msg = f"Video {max(self._current_index, 1)} of {total} | Status: Encoding | 100.0%"
-                else:
-                    msg = "Status: Encoding | 100.0%"
-                emit(msg, 100.0)
-
-            elif status == "error":
-                err = d.get("error")
-                if total > 0:
-                    msg = f"Video {max(self._current_index, 1)} of {total} | Status: Error"
-                else:
-                    msg = "Status: Error"
-                if err:
-                    msg += f" | {err}"
-                emit(msg, 0.0)
-
-        def postprocessor_hook(d: dict) -> None:
-            pp = str(d.get("postprocessor") or "")
-            pp_status = d.get("status")
-
-            if total > 0:
-                prefix = f"Video {max(self._current_index, 1)} of {total}"
-            else:
-                prefix = ""
-
-            if "EmbedSubtitle" in pp:
-                state = "Embedding Subtitles"
-            else:
-                state = "Encoding"
-
-            if pp_status in {"started", "finished"}:
-                msg = f"{prefix + ' | ' if prefix else ''}Status: {state}"
-                emit(msg, None)
-
-        outtmpl = os.path.join(
-            self.output_path,
-            "%(channel)s",
-            "%(playlist)s",
-            "%(title)s.%(ext)s",
-        )
-
-        ydl_opts: dict[str, Any] = {
-            "ignoreconfig": True,
-            "outtmpl": outtmpl,
-            "outtmpl_na_placeholder": "Videos",
-            "format": self._build_format_string(),
-            "merge_output_format": self.video_format,
-            "progress_hooks": [progress_hook],
-            "postprocessor_hooks": [postprocessor_hook],
-            "noplaylist": False,
-            "nocolor": True,
-            "windowsfilenames": True,
-            "cachedir": False,
-            "retries": 5,
-            "fragment_retries": 5,
-            "skip_unavailable_fragments": True,
-            "keep_fragments": False,
-            "no_warnings": True,
-            "sleep_interval": self.sleep_interval,
-            "max_sleep_interval": self.max_sleep_interval,
-            "sleep_interval_requests": self.sleep_interval_requests,
-            "writesubtitles": True,
-            "writeautomaticsub": True,
-            "subtitleslangs": ["en.*", "en"],
-            "subtitlesformat": "best",
-        }
-
-        if embed_enabled:
-            ydl_opts["embedsubtitles"] = True
-            ydl_opts["postprocessors"] = [
-                {"key": "FFmpegEmbedSubtitle"},
-            ]
-
-        if self.cookies_file and os.path.exists(self.cookies_file):
-            ydl_opts["cookiefile"] = self.cookies_file
-
-        def run_once(opts: dict[str, Any]) -> None:
-            with YoutubeDL(cast(Any, opts)) as ydl:
-                ydl.download([url])
-
-        try:
-            run_once(ydl_opts)
-            emit("Status: Done", 100.0)
-            return "Download finalizado com sucesso!"
-        except DownloadError as e:
-            msg = str(e)
-            lower = msg.lower()
-
-            if "requested format is not available" in lower:
-                try:
-                    emit("Aviso: formato solicitado indisponível. Usando 'Melhor'...", None)
-                    ydl_opts_retry = dict(ydl_opts)
-                    ydl_opts_retry["format"] = "bestvideo+bestaudio/best"
-                    run_once(ydl_opts_retry)
-                    emit("Status: Done", 100.0)
-                    return "Download finalizado com sucesso!"
-                except Exception as e2:
-                    return f"Erro no download (yt-dlp): {str(e2)}"
-
-            if "rate-limited" in lower or "this content isn't available" in lower:
-                return (
-                    "YouTube aplicou rate-limit nesta sessão (pode durar até ~1h). "
-                    "Tente novamente mais tarde; para reduzir recorrência, mantenha delays entre vídeos e, se possível, use cookies/login. "
-                    f"Detalhe: {msg}"
-                )
-
-            return f"Erro no download (yt-dlp): {_strip_ansi(msg)}"
-        except Exception as e:
-            return f"Erro inesperado no download: {_strip_ansi(str(e))}"
+    def download(self, url: str, *args: Any, **kwargs: Any) -> str:
+        if url and not self.output_path:
+            return self._message("no_output")
+        return super().download(url, *args, **kwargs)
 
 
 def download_video(
@@ -426,6 +292,7 @@ def download_video(
     progress_hook: Optional[Callable[[str, Optional[float]], None]] = None,
     cookies_file: str | None = None,
     video_format: str = "mp4",
+    session: Optional[ExtractionSession] = None,
 ) -> str:
     manager = DownloadManager(
         output_path=output_path,
@@ -438,4 +305,4 @@ def download_video(
         return
 
     callback = progress_hook or _noop
-    return manager.download(url, callback)
+    return manager.download(url, callback, session=session)
@@ -3,7 +3,7 @@
 
 a = Analysis(
     ['downloadium.py'],
-    pathex=[],
+    pathex=['..'],
     binaries=[],
     datas=[],
     hiddenimports=[],
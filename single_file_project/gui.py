@@ -1,45 +1,65 @@
 from __future__ import annotations
 
+import logging
 import os
 import queue
-import re
 import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
-
-from backend import DownloadManager, get_resolutions, validate_url
-
+from typing import Any, Callable, Optional
+
+from yt_dlp.utils import format_bytes
+
+from backend import (
+    DownloadManager,
+    ExtractionSession,
+    estimate_size,
+    get_resolutions,
+    open_session,
+    preview_thumbnails,
+    validate_url,
+)
+from Downloadium.backend.events import DOWNLOADING, ERROR, MESSAGE, ProgressCoalescer, ProgressEvent
+from Downloadium.backend.job_queue import JOB_CANCELED, JOB_DONE, JOB_FAILED, Job, JobQueue, QueueRunner
+from Downloadium.backend.metadata_cache import canonical_key
+from Downloadium.gui.actions import ActionRunner
+from Downloadium.gui.job_table import JobSync, JobTable
+from Downloadium.gui.log_view import LogBuffer, VirtualLogView, open_log_file
+from Downloadium.gui.thumbnail_preview import get_default_preview_service
+
+
+# A barra de progresso é redesenhada no máximo PROGRESS_HZ vezes por segundo; a fila da UI é
+# lida a cada POLL_MS (mudanças de fase e erros aparecem na leitura seguinte).
+PROGRESS_HZ = 20.0
+POLL_MS = 50
+# Linhas mantidas no painel de eventos; o log completo vai para o arquivo com rotação.
+LOG_LINES = 5000
+# Downloads simultâneos (threads do QueueRunner, compartilhadas por todos os jobs da tabela).
+WORKERS = 3
+# Estados/prioridades da tabela são relidos do journal (fora da thread do Tk) a cada JOBS_SYNC_MS e após cada ação.
+JOBS_SYNC_MS = 1000
 
 @dataclass
 class ProgressState:
+    """O que a barra de progresso mostra; um único objeto, atualizado no lugar por cada evento."""
+
     current: Optional[int] = None
     total: Optional[int] = None
     status: str = "Pronto"
     percent: Optional[float] = None
 
-
-_PROGRESS_RE = re.compile(
-    r"(?:Video\s+(?P<cur>\d+)\s+of\s+(?P<tot>\d+)\s+\|\s+)?Status:\s+(?P<status>[^|]+?)(?:\s+\|\s+(?P<pct>\d+(?:\.\d+)?)%)?$"
-)
-
-
-def _parse_progress_line(line: str) -> ProgressState:
-    line = (line or "").strip()
-    m = _PROGRESS_RE.search(line)
-    if not m:
-        return ProgressState(status=line or "")
-
-    cur = m.group("cur")
-    tot = m.group("tot")
-    status = (m.group("status") or "").strip()
-    pct = m.group("pct")
-
-    return ProgressState(
-        current=int(cur) if cur else None,
-        total=int(tot) if tot else None,
-        status=status or (line or ""),
-        percent=float(pct) if pct else None,
-    )
+    def apply(self, event: ProgressEvent) -> None:
+        # Campos ausentes no evento mantêm o valor anterior.
+        if event.index is not None:
+            self.current = event.index
+        if event.count is not None:
+            self.total = event.count
+        if event.percent is not None:
+            self.percent = event.percent
+        if event.phase == MESSAGE:
+            self.status = event.detail or self.status
+        else:
+            self.status = f"{event.phase} | {event.detail}" if event.detail else event.phase
 
 
 class DownloadiumApp:
@@ -48,7 +68,8 @@ class DownloadiumApp:
     Preferencialmente usa customtkinter; se não estiver disponível, cai para ttk.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, workers: int = WORKERS) -> None:
+        self._workers = max(1, workers)
         try:
             import customtkinter as ctk  # type: ignore
 
@@ -58,6 +79,12 @@ class DownloadiumApp:
             self._ctk = None
             self._use_ctk = False
 
+        self._log_buffer = LogBuffer(LOG_LINES)
+        try:
+            self._log_file: Optional[logging.Logger] = open_log_file()
+        except OSError:
+            self._log_file = None
+
         if self._use_ctk:
             self._init_ctk()
         else:
@@ -76,16 +103,20 @@ class DownloadiumApp:
 
         self.root = ctk.CTk()
         self.root.title("Downloadium")
-        self.root.minsize(860, 520)
+        self.root.minsize(960, 680)
 
         self._queue: queue.Queue[tuple[str, object]] = queue.Queue()
-        self._worker: Optional[threading.Thread] = None
+        self._session: Optional[ExtractionSession] = None
+        self._preview = get_default_preview_service()
+        self._thumb_key: Optional[str] = None
+        self._thumb_photo: object = None
 
         self.url_var = ctk.StringVar(value="")
         self.output_var = ctk.StringVar(value=os.path.join(os.getcwd(), "videos"))
         self.cookies_var = ctk.StringVar(value="")
         self.resolution_var = ctk.StringVar(value="Melhor")
         self.format_var = ctk.StringVar(value="mp4")
+        self.force_var = ctk.BooleanVar(value=False)
 
         self._progress_state = ProgressState()
 
@@ -176,6 +207,10 @@ class DownloadiumApp:
         )
         self.format_menu.grid(row=1, column=1, sticky="ew", pady=(6, 0))
 
+        ctk.CTkCheckBox(row6, text="Baixar de novo (ignorar arquivo de downloads)", variable=self.force_var).grid(
+            row=2, column=0, columnspan=2, sticky="w", pady=(10, 0)
+        )
+
         actions = ctk.CTkFrame(inputs)
         actions.grid(row=7, column=0, sticky="ew", padx=12, pady=(14, 12))
         actions.grid_columnconfigure(0, weight=1)
@@ -184,10 +219,29 @@ class DownloadiumApp:
         ctk.CTkButton(actions, text="Carregar Resoluções", command=self._load_resolutions).grid(
             row=0, column=0, sticky="ew", padx=(0, 8), pady=10
         )
-        ctk.CTkButton(actions, text="Iniciar Download", fg_color="#2563EB", command=self._start_download).grid(
+        ctk.CTkButton(actions, text="Adicionar à Fila", fg_color="#2563EB", command=self._start_download).grid(
             row=0, column=1, sticky="ew", padx=(8, 0), pady=10
         )
 
+        self.thumb_label = ctk.CTkLabel(inputs, text="")
+        self.thumb_label.grid(row=8, column=0, sticky="w", padx=12, pady=(0, 12))
+
+        # Left (abaixo): tabela de jobs
+        jobs = ctk.CTkFrame(body)
+        jobs.grid(row=1, column=0, rowspan=2, sticky="nsew", padx=(12, 8), pady=(0, 12))
+        jobs.grid_columnconfigure(0, weight=1)
+        jobs.grid_rowconfigure(1, weight=1)
+        ctk.CTkLabel(jobs, text="Fila", font=ctk.CTkFont(weight="bold")).grid(
+            row=0, column=0, sticky="w", padx=12, pady=(12, 6)
+        )
+        table_frame = ctk.CTkFrame(jobs, fg_color="transparent")
+        table_frame.grid(row=1, column=0, sticky="nsew", padx=12)
+        self._build_job_table(table_frame, dark=True)
+        job_actions = ctk.CTkFrame(jobs, fg_color="transparent")
+        job_actions.grid(row=2, column=0, sticky="ew", padx=12, pady=(8, 12))
+        for text, command in self._job_actions():
+            ctk.CTkButton(job_actions, text=text, width=96, command=command).pack(side="left", padx=(0, 6))
+
         # Right: progress + log
         panel = ctk.CTkFrame(body)
         panel.grid(row=0, column=1, rowspan=3, sticky="nsew", padx=(8, 12), pady=12)
@@ -210,10 +264,19 @@ class DownloadiumApp:
         ctk.CTkLabel(panel, text="Eventos", font=ctk.CTkFont(weight="bold")).grid(
             row=3, column=0, sticky="w", padx=12, pady=(12, 6)
         )
-        self.log = ctk.CTkTextbox(panel, height=200)
-        self.log.grid(row=4, column=0, sticky="nsew", padx=12, pady=(0, 12))
-
-        self.root.after(100, self._poll_queue)
+        log_frame = ctk.CTkFrame(panel, fg_color="transparent")
+        log_frame.grid(row=4, column=0, sticky="nsew", padx=12, pady=(0, 12))
+        log_frame.grid_columnconfigure(0, weight=1)
+        log_frame.grid_rowconfigure(0, weight=1)
+        # O textbox só recebe as linhas visíveis; a rolagem é do VirtualLogView.
+        self.log = ctk.CTkTextbox(log_frame, height=200, wrap="none", activate_scrollbars=False)
+        self.log.grid(row=0, column=0, sticky="nsew")
+        log_scroll = ctk.CTkScrollbar(log_frame)
+        log_scroll.grid(row=0, column=1, sticky="ns")
+        self._log_view = VirtualLogView(self.log, self._log_buffer, log_scroll)
+
+        self._init_jobs()
+        self.root.after(POLL_MS, self._poll_queue)
 
     def _browse_output(self) -> None:
         import tkinter.filedialog as fd
@@ -230,11 +293,10 @@ class DownloadiumApp:
             self.cookies_var.set(path)
 
     def _append_log(self, line: str) -> None:
-        try:
-            self.log.insert("end", line.rstrip() + "\n")
-            self.log.see("end")
-        except Exception:
-            pass
+        line = line.rstrip()
+        if self._log_file is not None:
+            self._log_file.info(line)
+        self._log_view.append(line)
 
     def _set_progress_ui(self, state: ProgressState) -> None:
         # Video label
@@ -256,6 +318,20 @@ class DownloadiumApp:
         else:
             self._progress_var.set(float(state.percent))
 
+    def _show_thumbnail(self, image: object) -> None:
+        if image is None:
+            self._thumb_photo = None
+            self.thumb_label.configure(image=None if self._use_ctk else "")
+            return
+        if self._use_ctk:
+            photo = self._ctk.CTkImage(light_image=image, dark_image=image, size=image.size)  # type: ignore[union-attr, attr-defined]
+        else:
+            from PIL import ImageTk
+
+            photo = ImageTk.PhotoImage(image)  # type: ignore[arg-type]
+        self._thumb_photo = photo  # o Tk não guarda referência: sem isso a imagem some
+        self.thumb_label.configure(image=photo)
+
     def _load_resolutions(self) -> None:
         url = self.url_var.get().strip()
         cookies = self.cookies_var.get().strip() or None
@@ -266,23 +342,183 @@ class DownloadiumApp:
 
         self._append_log("Carregando resoluções...")
 
+        session = open_session(url, cookies_file=cookies)
+        self._session = session
+        resolution = self.resolution_var.get().strip() or "Melhor"
+        video_format = self.format_var.get().strip() or "mp4"
+        thumb_key = self._thumb_key = canonical_key(url, single_video=True)
+
         def work() -> None:
-            resolutions, _thumb, err = get_resolutions(url, cookies_file=cookies)
+            resolutions, thumb, err = get_resolutions(url, cookies_file=cookies, session=session)
             if err:
                 self._queue.put(("log", f"Erro: {err}"))
                 return
             self._queue.put(("resolutions", resolutions))
+            # Prévia reduzida fora da thread do Tk; o PhotoImage é criado em _poll_queue. Com a lista
+            # de variantes (sessão ou cache), baixa a menor que cobre a prévia, não a miniatura cheia.
+            self._preview.request(
+                thumb_key,
+                preview_thumbnails(url, session) or thumb,
+                lambda image: self._queue.put(("thumbnail", (thumb_key, image))),
+            )
             self._queue.put(("log", f"Resoluções: {', '.join(resolutions[:6])}{'...' if len(resolutions) > 6 else ''}"))
+            try:
+                size = estimate_size(session, resolution, video_format)
+            except Exception:
+                size = None
+            if size:
+                self._queue.put(("log", f"Tamanho estimado ({resolution}): {format_bytes(size)}"))
 
         threading.Thread(target=work, daemon=True).start()
 
-    def _start_download(self) -> None:
-        if self._worker and self._worker.is_alive():
-            self._append_log("Download já em andamento.")
+    def _init_jobs(self) -> None:
+        """Fila persistente: downloads interrompidos (queda/fechamento) continuam ao reabrir o app."""
+        try:
+            self._jobs = JobQueue()
+        except Exception as e:
+            self._append_log(f"Aviso: fila persistente indisponível ({e}); usando fila em memória.")
+            self._jobs = JobQueue(path=":memory:")
+
+        self._progress = ProgressCoalescer(rate=PROGRESS_HZ)
+        self._focus_job: Optional[int] = None
+        self._last_sync = 0.0
+        # A leitura do journal (SQLite) roda fora da thread do Tk; a tabela é atualizada na volta.
+        self._job_sync = JobSync(self._table, self._jobs, ActionRunner(self.root.after, workers=1))
+        # Um único pool de `workers` threads serve todos os jobs, na ordem de prioridade da fila.
+        self._runner = QueueRunner(
+            self._jobs,
+            DownloadManager,
+            workers=self._workers,
+            on_event=self._progress.push,
+            on_finished=self._on_job_finished,
+        )
+        pending = self._jobs.jobs(states=("queued",))
+        if pending:
+            self._append_log(f"Retomando {len(pending)} download(s) pendente(s)...")
+        self._runner.start()
+        self._sync_jobs()
+
+    # -----------------
+    # Tabela de jobs
+    # -----------------
+
+    def _build_job_table(self, parent: Any, dark: bool = False) -> None:
+        """ttk.Treeview nos dois temas (o customtkinter não tem tabela própria)."""
+        from tkinter import ttk
+
+        if dark:
+            style = ttk.Style(self.root)
+            try:
+                style.theme_use("clam")
+            except Exception:
+                pass
+            style.configure(
+                "Treeview", background="#1F2937", fieldbackground="#1F2937", foreground="#E5E7EB", rowheight=22
+            )
+            style.configure("Treeview.Heading", background="#111827", foreground="#AAB4C3")
+
+        parent.grid_columnconfigure(0, weight=1)
+        parent.grid_rowconfigure(0, weight=1)
+        tree = ttk.Treeview(parent, height=8)
+        tree.grid(row=0, column=0, sticky="nsew")
+        scroll = ttk.Scrollbar(parent, orient="vertical", command=tree.yview)
+        scroll.grid(row=0, column=1, sticky="ns")
+        tree.configure(yscrollcommand=scroll.set)
+        tree.bind("<<TreeviewSelect>>", self._on_job_select, add="+")
+        self._table = JobTable(tree)
+
+    def _job_actions(self) -> list[tuple[str, Callable[[], None]]]:
+        return [
+            ("Pausar", lambda: self._for_selected(self._jobs.pause, "Pausado(s)")),
+            ("Retomar", lambda: self._for_selected(self._jobs.resume, "Retomado(s)")),
+            ("Cancelar", lambda: self._for_selected(self._jobs.cancel, "Cancelado(s)")),
+            ("Prioridade +", lambda: self._bump_priority(1)),
+            ("Prioridade −", lambda: self._bump_priority(-1)),
+            ("Limpar", self._clear_finished),
+        ]
+
+    def _for_selected(self, action: Callable[[int], None], verb: str) -> None:
+        """Aplica `action` aos jobs selecionados no pool da JobSync: o journal não é escrito na thread do Tk."""
+        selected = self._table.selected()
+        if not selected:
+            self._append_log("Selecione um ou mais jobs na tabela.")
             return
 
-        url = self.url_var.get().strip()
-        if not validate_url(url):
+        def apply() -> None:
+            for job_id in selected:
+                action(job_id)
+
+        def done(result: Any) -> None:
+            if result.ok:
+                self._append_log(f"{verb}: {', '.join(f'#{job_id}' for job_id in selected)}")
+            else:
+                self._append_log(f"Erro ({verb}): {result.error}")
+
+        if not self._job_sync.run(("jobs", verb), apply, on_done=done):
+            self._append_log(f"{verb}: ação anterior ainda em andamento.")
+
+    def _bump_priority(self, delta: int) -> None:
+        # A prioridade atual vem da tabela (thread do Tk); só a escrita vai para o pool.
+        priorities = {}
+        for job_id in self._table.selected():
+            row = self._table.row(job_id)
+            if row is not None:
+                priorities[job_id] = row.priority + delta
+
+        def set_priority(job_id: int) -> None:
+            if job_id in priorities:
+                self._jobs.set_priority(job_id, priorities[job_id])
+
+        self._for_selected(set_priority, f"Prioridade {delta:+d}")
+
+    def _clear_finished(self) -> None:
+        """Tira da fila (e da tabela) os jobs concluídos, com falha ou cancelados."""
+
+        def clear() -> int:
+            finished = self._jobs.jobs(states=(JOB_DONE, JOB_FAILED, JOB_CANCELED))
+            for job in finished:
+                self._jobs.remove(job.id)
+            return len(finished)
+
+        def done(result: Any) -> None:
+            if not result.ok:
+                self._append_log(f"Erro ao limpar a fila: {result.error}")
+            elif result.value:
+                self._append_log(f"{result.value} job(s) removido(s) da fila.")
+
+        self._job_sync.run("clear-jobs", clear, on_done=done)
+
+    def _sync_jobs(self) -> None:
+        self._last_sync = time.monotonic()
+        self._job_sync.request()
+
+    def _on_job_select(self, event: Any = None) -> None:
+        """A barra de progresso do painel passa a acompanhar o job selecionado."""
+        selected = self._table.selected()
+        if not selected:
+            return
+        self._focus_job = selected[0]
+        row = self._table.row(self._focus_job)
+        if row is not None:
+            self._progress_state = ProgressState(
+                current=row.finished, total=row.total or None, status=row.status, percent=row.percent or 0.0
+            )
+            self._set_progress_ui(self._progress_state)
+
+    def _on_job_finished(self, job: Job) -> None:
+        if job.state != "done":
+            self._queue.put(("log", f"[#{job.id}] Download concluído com falhas ({job.finished}/{job.total}): {job.error or 'veja o log'}"))
+            self._progress.push(ProgressEvent(ERROR, job.id))
+            return
+        result = f"[#{job.id}] Download finalizado com sucesso! ({job.finished}/{job.total})"
+        self._queue.put(("log", result))
+        # força status final na UI
+        self._queue.put(("done", job.id))
+
+    def _start_download(self) -> None:
+        # Várias URLs de uma vez (separadas por espaço ou quebra de linha) viram um job cada.
+        urls = self.url_var.get().split()
+        if not urls:
             self._append_log("URL inválida ou não suportada.")
             return
 
@@ -294,55 +530,64 @@ class DownloadiumApp:
         resolution = self.resolution_var.get().strip() or "Melhor"
         video_format = self.format_var.get().strip() or "mp4"
         cookies = self.cookies_var.get().strip() or None
+        # Vídeo apagado do disco continua no arquivo de downloads: sem isto ele seria sempre pulado.
+        ignore_archive = bool(self.force_var.get())
+
+        job_id = None
+        for url in urls:
+            if not validate_url(url):
+                self._append_log(f"URL inválida ou não suportada: {url}")
+                continue
+            job_id = self._jobs.add(
+                url,
+                {
+                    "output_path": output_path,
+                    "resolution": resolution,
+                    "video_format": video_format,
+                    "cookies_file": cookies,
+                    "ignore_archive": ignore_archive,
+                },
+            )
 
-        self._append_log("Iniciando download...")
-        self._progress_state = ProgressState(status="Starting", percent=0.0)
-        self._set_progress_ui(self._progress_state)
-
-        def on_progress(line: str, percent: Optional[float]) -> None:
-            # Normaliza percent vindo separado
-            state = _parse_progress_line(line)
-            if percent is not None:
-                state.percent = percent
-            self._queue.put(("progress", state))
-            self._queue.put(("log", line))
+            # Reaproveita a extração feita em "Carregar Resoluções" (mesma URL e cookies).
+            session = self._session
+            if session is not None and session.cookies_file == cookies and session.matches(url):
+                self._runner.prime_session(job_id, session)
 
-        def work() -> None:
-            manager = DownloadManager(
-                output_path=output_path,
-                resolution=resolution,
-                video_format=video_format,
-                cookies_file=cookies,
-            )
-            result = manager.download(url, on_progress)
-            self._queue.put(("log", result))
-            # força status final na UI
-            self._queue.put(("done", result))
+            self._append_log(f"Download adicionado à fila (job #{job_id}).")
+        if job_id is None:
+            return
 
-        self._worker = threading.Thread(target=work, daemon=True)
-        self._worker.start()
+        self.url_var.set("")
+        self._focus_job = job_id
+        self._progress_state = ProgressState(status="Starting", percent=0.0)
+        self._set_progress_ui(self._progress_state)
+        self._sync_jobs()
+
+    def _apply_progress(self) -> None:
+        events = self._progress.drain()
+        focused = False
+        for event in events:
+            self._table.apply(event)
+            if self._focus_job is None or event.job_id == self._focus_job:
+                self._progress_state.apply(event)
+                focused = True
+            # Log só nas mudanças de fase, nunca a cada bloco baixado.
+            if event.phase != DOWNLOADING:
+                self._append_log(f"[#{event.job_id}] {event.status_line()}")
+        if focused:
+            self._set_progress_ui(self._progress_state)
+        if time.monotonic() - self._last_sync >= JOBS_SYNC_MS / 1000:
+            self._sync_jobs()
+        # Um único lote por ciclo: só as linhas que receberam eventos são redesenhadas.
+        self._table.flush()
 
     def _poll_queue(self) -> None:
+        self._apply_progress()
         try:
             while True:
                 kind, payload = self._queue.get_nowait()
-                if kind == "progress":
-                    state = payload  # type: ignore[assignment]
-                    if isinstance(state, ProgressState):
-                        # preserva valores anteriores quando vierem como None
-                        if state.current is None:
-                            state.current = self._progress_state.current
-                        if state.total is None:
-                            state.total = self._progress_state.total
-                        if state.percent is None:
-                            state.percent = self._progress_state.percent
-                        if not state.status:
-                            state.status = self._progress_state.status
-
-                        self._progress_state = state
-                        self._set_progress_ui(state)
-
-                elif kind == "resolutions":
+                if kind == "resolutions":
                     resolutions = payload  # type: ignore[assignment]
                     if isinstance(resolutions, list) and resolutions:
                         if self._use_ctk:
@@ -353,19 +598,26 @@ class DownloadiumApp:
                         if self.resolution_var.get() not in resolutions:
                             self.resolution_var.set(resolutions[0])
 
+                elif kind == "thumbnail":
+                    key, image = payload  # type: ignore[misc]
+                    if key == self._thumb_key:  # ignora prévias de uma URL anterior
+                        self._show_thumbnail(image)
+
                 elif kind == "log":
                     self._append_log(str(payload))
 
                 elif kind == "done":
                     # Só melhora o texto, sem popup intrusivo
-                    self._progress_state.status = "Done"
-                    self._progress_state.percent = 100.0
-                    self._set_progress_ui(self._progress_state)
+                    if payload == self._focus_job:
+                        self._progress_state.status = "Done"
+                        self._progress_state.percent = 100.0
+                        self._set_progress_ui(self._progress_state)
+                    self._sync_jobs()
 
         except queue.Empty:
             pass
         finally:
-            self.root.after(120, self._poll_queue)
+            self.root.after(POLL_MS, self._poll_queue)
 
     def mainloop(self) -> None:
         self.root.mainloop()
@@ -380,7 +632,7 @@ class DownloadiumApp:
 
         self.root = tk.Tk()
         self.root.title("Downloadium")
-        self.root.minsize(860, 520)
+        self.root.minsize(860, 640)
 
         style = ttk.Style(self.root)
         try:
@@ -389,17 +641,22 @@ class DownloadiumApp:
             pass
 
         self._queue: queue.Queue[tuple[str, object]] = queue.Queue()
-        self._worker: Optional[threading.Thread] = None
+        self._session: Optional[ExtractionSession] = None
+        self._preview = get_default_preview_service()
+        self._thumb_key: Optional[str] = None
+        self._thumb_photo: object = None
 
         self.url_var = tk.StringVar(value="")
         self.output_var = tk.StringVar(value=os.path.join(os.getcwd(), "videos"))
         self.cookies_var = tk.StringVar(value="")
         self.resolution_var = tk.StringVar(value="Melhor")
         self.format_var = tk.StringVar(value="mp4")
+        self.force_var = tk.BooleanVar(value=False)
 
         root = self.root
         root.grid_columnconfigure(0, weight=1)
         root.grid_rowconfigure(1, weight=1)
+        root.grid_rowconfigure(2, weight=1)
 
         frm = ttk.Frame(root, padding=12)
         frm.grid(row=0, column=0, sticky="nsew")
@@ -431,10 +688,28 @@ class DownloadiumApp:
         btns = ttk.Frame(frm)
         btns.grid(row=5, column=0, columnspan=3, sticky="ew", pady=(12, 0))
         ttk.Button(btns, text="Carregar Resoluções", command=self._load_resolutions).pack(side="left")
-        ttk.Button(btns, text="Iniciar Download", command=self._start_download).pack(side="left", padx=(8, 0))
+        ttk.Button(btns, text="Adicionar à Fila", command=self._start_download).pack(side="left", padx=(8, 0))
+        ttk.Checkbutton(btns, text="Baixar de novo (ignorar arquivo de downloads)", variable=self.force_var).pack(
+            side="left", padx=(12, 0)
+        )
+
+        self.thumb_label = ttk.Label(frm)
+        self.thumb_label.grid(row=6, column=0, columnspan=3, sticky="w", pady=(12, 0))
+
+        jobs = ttk.Frame(root, padding=(12, 0))
+        jobs.grid(row=1, column=0, sticky="nsew")
+        jobs.grid_columnconfigure(0, weight=1)
+        jobs.grid_rowconfigure(0, weight=1)
+        table_frame = ttk.Frame(jobs)
+        table_frame.grid(row=0, column=0, sticky="nsew")
+        self._build_job_table(table_frame)
+        job_actions = ttk.Frame(jobs)
+        job_actions.grid(row=1, column=0, sticky="ew", pady=(8, 0))
+        for text, command in self._job_actions():
+            ttk.Button(job_actions, text=text, command=command).pack(side="left", padx=(0, 6))
 
         prog = ttk.Frame(root, padding=12)
-        prog.grid(row=1, column=0, sticky="nsew")
+        prog.grid(row=2, column=0, sticky="nsew")
         prog.grid_columnconfigure(0, weight=1)
 
         self.video_label = ttk.Label(prog, text="Video —")
@@ -445,9 +720,13 @@ class DownloadiumApp:
         self._progress_var = tk.DoubleVar(value=0.0)
         ttk.Progressbar(prog, variable=self._progress_var, maximum=100).grid(row=2, column=0, sticky="ew", pady=(8, 0))
 
-        self.log = tk.Text(prog, height=10)
+        self.log = tk.Text(prog, height=10, wrap="none")
         self.log.grid(row=3, column=0, sticky="nsew", pady=(12, 0))
+        log_scroll = ttk.Scrollbar(prog, orient="vertical")
+        log_scroll.grid(row=3, column=1, sticky="ns", pady=(12, 0))
+        self._log_view = VirtualLogView(self.log, self._log_buffer, log_scroll, rows=10)
         prog.grid_rowconfigure(3, weight=1)
 
         self._progress_state = ProgressState()
-        self.root.after(120, self._poll_queue)
+        self._init_jobs()
+        self.root.after(POLL_MS, self._poll_queue)
@@ -1,13 +1,25 @@
 import os
+import queue
+import sys
 import requests
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from tkinter import ttk
 from yt_dlp import YoutubeDL
 import re
+from pathlib import Path
 from PIL import Image, ImageTk
 from io import BytesIO
 
+# Prévias de thumbnail do pacote Downloadium (cache em memória/disco, redução fora da thread do Tk).
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+try:
+    from Downloadium.gui.thumbnail_preview import get_default_preview_service
+except ImportError:
+    get_default_preview_service = None
+
 class DownloadiumApp:
     def __init__(self, root):
         self.root = root
@@ -18,8 +30,11 @@ class DownloadiumApp:
         self.quality_var = tk.StringVar(value="best")
         self.language_var = tk.StringVar(value="en")
         self.resolution_var = tk.StringVar()
+        # Prévias prontas chegam das threads do pool; só a thread do Tk (poll via after) as exibe.
+        self._thumbnail_queue = queue.Queue()
 
         self.create_widgets()
+        self.root.after(50, self.poll_thumbnails)
 
     def create_widgets(self):
         url_frame = ttk.LabelFrame(self.root, text="URL do Vídeo")
@@ -96,7 +111,14 @@ class DownloadiumApp:
 
                 # Load thumbnail
                 thumbnail_url = info.get('thumbnail')
-                if thumbnail_url:
+                if thumbnail_url and get_default_preview_service is not None:
+                    self._thumbnail_key = info.get('id') or url
+                    get_default_preview_service().request(
+                        self._thumbnail_key,
+                        info.get('thumbnails') or thumbnail_url,
+                        lambda image, key=self._thumbnail_key: self._thumbnail_queue.put((key, image)),
+                    )
+                elif thumbnail_url:
                     response = requests.get(thumbnail_url)
                     image_data = response.content
                     image = Image.open(BytesIO(image_data))
@@ -106,6 +128,20 @@ class DownloadiumApp:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao carregar resoluções: {str(e)}")
 
+    def poll_thumbnails(self):
+        try:
+            while True:
+                self.show_thumbnail(*self._thumbnail_queue.get_nowait())
+        except queue.Empty:
+            pass
+        self.root.after(50, self.poll_thumbnails)
+
+    def show_thumbnail(self, key, image):
+        if image is None or key != getattr(self, '_thumbnail_key', None):
+            return
+        self.thumbnail_image = ImageTk.PhotoImage(image)
+        self.thumbnail_label.config(image=self.thumbnail_image)
+
     def start_video_download(self):
         url = self.url_entry.get()
         resolution = self.resolution_var.get().split('(')[-1].split(')')[0]